@@ -1,19 +1,69 @@
 """
 Prompt templates and utilities for the AI news digest agent.
 """
+import io
 import os
+import functools
+import types
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Sequence, Tuple
 
 # Get the agent directory path
 AGENT_DIR = Path(__file__).parent
 
+# Prefer the libyaml-backed loader when available; fall back to pure Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
+
+# Fixed scaffolding of the generated prompts, built once at import time so
+# each call only splices in the per-article text
+_SUMMARY_PROMPT_PREFIX = (
+    "Summarize the following article in 2-3 concise sentences. "
+    "Focus on the key points, what's new, and why it matters.\n\n"
+    "Title: "
+)
+_SUMMARY_PROMPT_CONTENT = "\n\nContent:\n"
+_SUMMARY_PROMPT_SUFFIX = "\n\nSummary:"
+
+_BATCH_SUMMARY_PROMPT_HEADER = (
+    "Summarize each of the following {count} articles in 2-3 concise sentences. "
+    "Focus on the key points, what's new, and why it matters.\n\n"
+    "Return a JSON array of {count} objects of the form "
+    '{{"id": <article number>, "summary": "<summary>"}}, one per article, '
+    "and nothing else.\n"
+)
+
+_DIGEST_PROMPT_HEADER = """Create a daily digest email from the following articles. For each article, write a concise 2-3 sentence summary that captures the key points and why it matters.
+
+Format the output as follows:
+- Group articles by source
+- For each article, provide: a brief summary and the original URL
+- Use clear, engaging language
+- Maintain a professional tone
+
+"""
+_DIGEST_PROMPT_FOOTER = """
+
+Generate the digest:"""
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=1)
 def load_system_prompt() -> str:
     """
     Load the system prompt from file.
     
+    The file is read once per process; later calls return the cached text.
+    
     Returns:
         System prompt text
     """
@@ -22,16 +72,31 @@ def load_system_prompt() -> str:
         return f.read().strip()
 
 
-def load_agent_config() -> Dict[str, Any]:
+@functools.lru_cache(maxsize=1)
+def load_agent_config() -> Mapping[str, Any]:
     """
     Load the agent configuration from YAML file.
     
+    The parsed config is cached and shared between callers, so it is returned
+    as a read-only mapping (nested dicts/lists are frozen as well).
+    
     Returns:
-        Configuration dictionary
+        Configuration mapping
     """
     config_file = AGENT_DIR / "config.yaml"
     with open(config_file, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return _freeze(yaml.load(f, Loader=_YAML_LOADER) or {})
+
+
+def clear_prompt_caches() -> None:
+    """
+    Drop the cached system prompt and agent config.
+    
+    The next load_system_prompt()/load_agent_config() call re-reads the
+    files; used by tests and after editing the prompt files at runtime.
+    """
+    load_system_prompt.cache_clear()
+    load_agent_config.cache_clear()
 
 
 def get_article_summary_prompt(article_title: str, article_content: str) -> str:
@@ -40,19 +105,41 @@ def get_article_summary_prompt(article_title: str, article_content: str) -> str:
     
     Args:
         article_title: Article title
-        article_content: Article content
+        article_content: Article content; pass Article.content_preview, which
+            is already bounded, so the 2000-character cap is normally a no-op
     
     Returns:
         Formatted prompt
     """
-    return f"""Summarize the following article in 2-3 concise sentences. Focus on the key points, what's new, and why it matters.
+    return "".join((
+        _SUMMARY_PROMPT_PREFIX,
+        article_title,
+        _SUMMARY_PROMPT_CONTENT,
+        article_content[:2000],
+        _SUMMARY_PROMPT_SUFFIX,
+    ))
 
-Title: {article_title}
 
-Content:
-{article_content[:2000]}  # Limit content length
-
-Summary:"""
+def get_batch_summary_prompt(articles: Sequence[Tuple[str, str]]) -> str:
+    """
+    Generate one prompt that asks for a summary of every article at once.
+    
+    Articles are numbered from 1; the model is asked to answer with a JSON
+    array of {"id", "summary"} objects using those numbers.
+    
+    Args:
+        articles: (title, content) pairs; content is capped at 2000
+            characters like get_article_summary_prompt()
+    
+    Returns:
+        Formatted prompt
+    """
+    buf = io.StringIO()
+    write = buf.write
+    write(_BATCH_SUMMARY_PROMPT_HEADER.format(count=len(articles)))
+    for i, (title, content) in enumerate(articles, 1):
+        write(f"\n[{i}] Title: {title}\nContent: {content[:2000]}\n")
+    return buf.getvalue()
 
 
 def get_digest_generation_prompt(articles_by_source: Dict[str, list]) -> str:
@@ -60,37 +147,32 @@ def get_digest_generation_prompt(articles_by_source: Dict[str, list]) -> str:
     Generate a prompt for creating the full daily digest.
     
     Args:
-        articles_by_source: Dictionary mapping source names to lists of articles
+        articles_by_source: Dictionary mapping source names to lists of
+            articles (ArticleDTOs, or any objects with title/url/content)
     
     Returns:
         Formatted prompt
     """
-    # Build article list
-    articles_text = []
+    # Build article list in a single buffer rather than joining a list of parts
+    buf = io.StringIO()
+    write = buf.write
     for source_name, articles in articles_by_source.items():
-        articles_text.append(f"\n## {source_name}\n")
+        write(f"\n\n## {source_name}\n")
         for i, article in enumerate(articles, 1):
-            articles_text.append(
-                f"{i}. **{article['title']}**\n"
-                f"   URL: {article['url']}\n"
-                f"   Content preview: {article['content'][:300]}...\n"
+            preview = article.content[:300]
+            write(
+                f"\n{i}. **{article.title}**\n"
+                f"   URL: {article.url}\n"
+                f"   Content preview: {preview}...\n"
             )
     
-    articles_section = "\n".join(articles_text)
+    # Each part is written with a leading newline separator; drop the first one
+    articles_section = buf.getvalue()[1:]
     
-    return f"""Create a daily digest email from the following articles. For each article, write a concise 2-3 sentence summary that captures the key points and why it matters.
-
-Format the output as follows:
-- Group articles by source
-- For each article, provide: a brief summary and the original URL
-- Use clear, engaging language
-- Maintain a professional tone
-
-{articles_section}
-
-Generate the digest:"""
+    return _DIGEST_PROMPT_HEADER + articles_section + _DIGEST_PROMPT_FOOTER
 
 
+@functools.lru_cache(maxsize=1)
 def get_snippet_format_template() -> str:
     """
     Get the template for formatting individual snippets.
@@ -0,0 +1,42 @@
+"""store article embeddings as halfvec
+
+Revision ID: 3e6b9d2f7a15
+Revises: 9a4c7e2b5f18
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3e6b9d2f7a15"
+down_revision: Union[str, None] = "9a4c7e2b5f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # halfvec needs pgvector >= 0.7; the ivfflat index is rebuilt with halfvec ops
+    op.execute("DROP INDEX IF EXISTS idx_embedding_vector")
+    op.execute(
+        "ALTER TABLE article_embeddings ALTER COLUMN embedding TYPE halfvec(384) "
+        "USING embedding::halfvec(384)"
+    )
+    op.execute(
+        "CREATE INDEX idx_embedding_vector "
+        "ON article_embeddings USING ivfflat (embedding halfvec_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_embedding_vector")
+    op.execute(
+        "ALTER TABLE article_embeddings ALTER COLUMN embedding TYPE vector(384) "
+        "USING embedding::vector(384)"
+    )
+    op.execute(
+        "CREATE INDEX idx_embedding_vector "
+        "ON article_embeddings USING ivfflat (embedding vector_cosine_ops)"
+    )
@@ -0,0 +1,43 @@
+"""add article digest indexes
+
+Revision ID: 4f2a9c1d7b3e
+Revises: e35de033c420
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a9c1d7b3e"
+down_revision: Union[str, None] = "e35de033c420"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_articles_source_published",
+        "articles",
+        ["source_id", sa.text("published_at DESC")],
+    )
+    op.create_index("ix_articles_scraped_desc", "articles", [sa.text("scraped_at DESC")])
+
+    # Rebuild the URL index as a covering index (uniqueness is still
+    # enforced by the existing UNIQUE constraint on url)
+    op.drop_index("ix_articles_url", table_name="articles")
+    op.create_index(
+        "ix_articles_url",
+        "articles",
+        ["url"],
+        postgresql_include=["title", "published_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_url", table_name="articles")
+    op.create_index("ix_articles_url", "articles", ["url"])
+    op.drop_index("ix_articles_scraped_desc", table_name="articles")
+    op.drop_index("ix_articles_source_published", table_name="articles")
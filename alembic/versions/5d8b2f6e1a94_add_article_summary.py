@@ -0,0 +1,41 @@
+"""add articles.summary and articles.summary_generated_at
+
+Revision ID: 5d8b2f6e1a94
+Revises: f4a9c2e7b3d6
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8b2f6e1a94"
+down_revision: Union[str, None] = "f4a9c2e7b3d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("articles", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column("articles", sa.Column("summary_generated_at", sa.DateTime(timezone=True), nullable=True))
+    # One-shot backfill from the newest article_summaries row; new summaries
+    # are written to both places by the generate_summary worker
+    op.execute(
+        """
+        UPDATE articles a
+        SET summary = s.summary, summary_generated_at = s.created_at AT TIME ZONE 'UTC'
+        FROM (
+            SELECT DISTINCT ON (article_id) article_id, summary, created_at
+            FROM article_summaries
+            ORDER BY article_id, created_at DESC
+        ) s
+        WHERE s.article_id = a.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("articles", "summary_generated_at")
+    op.drop_column("articles", "summary")
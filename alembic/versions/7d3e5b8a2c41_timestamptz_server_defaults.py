@@ -0,0 +1,51 @@
+"""use timestamptz with server-side now() defaults
+
+Revision ID: 7d3e5b8a2c41
+Revises: 4f2a9c1d7b3e
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3e5b8a2c41"
+down_revision: Union[str, None] = "4f2a9c1d7b3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs whose insert timestamp is now filled in by Postgres
+_COLUMNS = [
+    ("sources", "created_at"),
+    ("articles", "scraped_at"),
+    ("openai_articles", "created_at"),
+    ("anthropic_articles", "created_at"),
+    ("youtube_videos", "created_at"),
+]
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        # Existing values were written by datetime.utcnow(), i.e. naive UTC
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_nullable=False,
+            server_default=sa.func.now(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(),
+            existing_nullable=False,
+            server_default=sa.func.now(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
@@ -0,0 +1,29 @@
+"""add article scraped_at window indexes
+
+Revision ID: 9a4c7e2b5f18
+Revises: 5d8b2f6e1a94
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c7e2b5f18"
+down_revision: Union[str, None] = "5d8b2f6e1a94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # LLM digest: scraped_at window joined to sources on source_id
+    op.create_index("ix_articles_scraped_source", "articles", ["scraped_at", "source_id"])
+    # Pipeline backlog: processing_status IN (...) within a scraped_at window
+    op.create_index("ix_articles_status_scraped", "articles", ["processing_status", "scraped_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_status_scraped", table_name="articles")
+    op.drop_index("ix_articles_scraped_source", table_name="articles")
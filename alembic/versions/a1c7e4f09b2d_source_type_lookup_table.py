@@ -0,0 +1,56 @@
+"""source_type lookup table with smallint foreign key
+
+Revision ID: a1c7e4f09b2d
+Revises: 7d3e5b8a2c41
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c7e4f09b2d"
+down_revision: Union[str, None] = "7d3e5b8a2c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay in sync with app.database.models.SourceType
+_SOURCE_TYPES = [(1, "youtube"), (2, "openai"), (3, "anthropic"), (4, "blog")]
+
+
+def upgrade() -> None:
+    source_types = op.create_table(
+        "source_types",
+        sa.Column("id", sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column("name", sa.String(32), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(source_types, [{"id": i, "name": n} for i, n in _SOURCE_TYPES])
+
+    # Enum labels may be stored upper- or lower-case depending on how the
+    # column was originally created, so compare case-insensitively.
+    cases = " ".join(f"WHEN '{n}' THEN {i}" for i, n in _SOURCE_TYPES)
+    op.execute(
+        "ALTER TABLE sources ALTER COLUMN source_type TYPE smallint "
+        f"USING (CASE lower(source_type::text) {cases} END)"
+    )
+    op.create_foreign_key(
+        "fk_sources_source_type", "sources", "source_types", ["source_type"], ["id"]
+    )
+    op.create_index("ix_sources_source_type", "sources", ["source_type"])
+    op.execute("DROP TYPE IF EXISTS sourcetype")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sources_source_type", table_name="sources")
+    op.drop_constraint("fk_sources_source_type", "sources", type_="foreignkey")
+    op.execute("CREATE TYPE sourcetype AS ENUM ('youtube', 'openai', 'anthropic', 'blog')")
+    cases = " ".join(f"WHEN {i} THEN '{n}'" for i, n in _SOURCE_TYPES)
+    op.execute(
+        "ALTER TABLE sources ALTER COLUMN source_type TYPE sourcetype "
+        f"USING (CASE source_type {cases} END)::sourcetype"
+    )
+    op.drop_table("source_types")
@@ -0,0 +1,33 @@
+"""make processing_queue.article_id unique
+
+Revision ID: b7d4e1a8c962
+Revises: 3e6b9d2f7a15
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d4e1a8c962"
+down_revision: Union[str, None] = "3e6b9d2f7a15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the newest entry per article before enforcing uniqueness
+    op.execute(
+        "DELETE FROM processing_queue WHERE id NOT IN "
+        "(SELECT MAX(id) FROM processing_queue GROUP BY article_id)"
+    )
+    # Status updates upsert with ON CONFLICT (article_id)
+    op.drop_index("ix_processing_queue_article_id", table_name="processing_queue")
+    op.create_index("ix_processing_queue_article_id", "processing_queue", ["article_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_processing_queue_article_id", table_name="processing_queue")
+    op.create_index("ix_processing_queue_article_id", "processing_queue", ["article_id"])
@@ -0,0 +1,29 @@
+"""add articles.content_preview
+
+Revision ID: c3b8d1e6f5a0
+Revises: a1c7e4f09b2d
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3b8d1e6f5a0"
+down_revision: Union[str, None] = "a1c7e4f09b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("articles", sa.Column("content_preview", sa.String(2048), nullable=True))
+    # One-shot backfill; new rows are filled in by the Article model on write
+    op.execute(
+        "UPDATE articles SET content_preview = left(content, 2000) WHERE content IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("articles", "content_preview")
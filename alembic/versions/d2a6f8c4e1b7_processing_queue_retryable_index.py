@@ -0,0 +1,32 @@
+"""add partial index for the processing_queue retry scanner
+
+Revision ID: d2a6f8c4e1b7
+Revises: b7d4e1a8c962
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a6f8c4e1b7"
+down_revision: Union[str, None] = "b7d4e1a8c962"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Oldest-first pickup of retryable entries (see ArticlePipeline.retry_failed_articles)
+    op.create_index(
+        "ix_processing_queue_retryable",
+        "processing_queue",
+        ["updated_at"],
+        postgresql_include=["article_id", "retry_count"],
+        postgresql_where=sa.text("status IN ('failed', 'pending')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_processing_queue_retryable", table_name="processing_queue")
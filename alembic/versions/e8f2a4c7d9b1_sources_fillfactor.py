@@ -0,0 +1,25 @@
+"""set fillfactor=90 on sources
+
+Revision ID: e8f2a4c7d9b1
+Revises: c3b8d1e6f5a0
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8f2a4c7d9b1"
+down_revision: Union[str, None] = "c3b8d1e6f5a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Applies to newly written pages; existing pages keep their layout until rewritten
+    op.execute("ALTER TABLE sources SET (fillfactor = 90)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE sources RESET (fillfactor)")
@@ -0,0 +1,32 @@
+"""add partial covering index on active sources
+
+Revision ID: f4a9c2e7b3d6
+Revises: e8f2a4c7d9b1
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a9c2e7b3d6"
+down_revision: Union[str, None] = "e8f2a4c7d9b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index-only scans for "active sources" lookups (see SourceRepository.get_active_source_rows)
+    op.create_index(
+        "ix_sources_active_true",
+        "sources",
+        ["source_type"],
+        postgresql_include=["id", "name", "url"],
+        postgresql_where=sa.text("active IS true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sources_active_true", table_name="sources")
@@ -1,4 +1,9 @@
 """Cache package for AI News Aggregator."""
-from app.cache.redis_client import RedisClient, get_redis_client
+from app.cache.redis_client import RedisClient, get_redis_client, flush_redis_client
+from app.cache.dto import ArticleDTO, encode_articles, decode_articles
+from app.cache.bloom import BloomFilter
 
-__all__ = ["RedisClient", "get_redis_client"]
+__all__ = [
+    "RedisClient", "get_redis_client", "flush_redis_client", "ArticleDTO", "encode_articles", "decode_articles",
+    "BloomFilter",
+]
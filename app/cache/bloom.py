@@ -0,0 +1,51 @@
+"""
+Process-local Bloom filter for cheap "definitely not seen" checks.
+
+A negative answer is certain; a positive answer may be a false positive
+(at roughly `error_rate`) and must be confirmed against the database.
+"""
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, backed by a bytearray."""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: Expected number of keys; past this the false-positive
+                      rate climbs above `error_rate`
+            error_rate: Target false-positive rate at `capacity`
+        """
+        capacity = max(1, capacity)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: str):
+        """Bit positions for a key, via double hashing of one 128-bit digest."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Add many keys to the filter."""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        """Number of add() calls (duplicates included)."""
+        return self._count
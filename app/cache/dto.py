@@ -0,0 +1,49 @@
+"""
+Lightweight article payloads passed between the Redis cache and prompt layers.
+
+Articles are encoded positionally (``[title, url, content]``) rather than as
+JSON objects, which keeps cached payloads small and avoids per-key dict
+lookups on decode. msgspec is used when installed; otherwise a NamedTuple
+with the same wire format is used so either side can read the other's data.
+"""
+import json
+from typing import List, NamedTuple, Sequence, Union
+
+try:
+    import msgspec
+except ImportError:
+    # Fallback to a NamedTuple + stdlib json if msgspec is not installed
+    msgspec = None
+
+
+if msgspec is not None:
+    class ArticleDTO(msgspec.Struct, array_like=True):
+        """Article fields needed to cache and prompt on an article."""
+        title: str
+        url: str
+        content: str = ""
+
+    _encoder = msgspec.json.Encoder()
+    _decoder = msgspec.json.Decoder(List[ArticleDTO])
+
+    def encode_articles(articles: Sequence[ArticleDTO]) -> bytes:
+        """Encode articles as a JSON array of positional arrays."""
+        return _encoder.encode(articles)
+
+    def decode_articles(raw: Union[str, bytes]) -> List[ArticleDTO]:
+        """Decode a payload produced by encode_articles()."""
+        return _decoder.decode(raw)
+else:
+    class ArticleDTO(NamedTuple):
+        """Article fields needed to cache and prompt on an article."""
+        title: str
+        url: str
+        content: str = ""
+
+    def encode_articles(articles: Sequence[ArticleDTO]) -> bytes:
+        """Encode articles as a JSON array of positional arrays."""
+        return json.dumps(articles, separators=(",", ":")).encode()
+
+    def decode_articles(raw: Union[str, bytes]) -> List[ArticleDTO]:
+        """Decode a payload produced by encode_articles()."""
+        return [ArticleDTO(*row) for row in json.loads(raw)]
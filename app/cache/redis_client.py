@@ -5,16 +5,107 @@ Provides caching layer for API responses and frequently accessed data.
 import redis
 import json
 import os
-from typing import Optional, Any, List
+import time
+import atexit
+import threading
+import collections
+import weakref
+import zlib
+from typing import Optional, Any, List, Dict, Union
 from datetime import timedelta
 import logging
 
+from app.cache.dto import ArticleDTO, encode_articles, decode_articles
+
+try:
+    import orjson
+except ImportError:
+    # Fallback to the stdlib json module if orjson is not installed
+    orjson = None
+
+try:
+    import google_crc32c
+except ImportError:
+    # Fallback to zlib's CRC32 if the hardware-accelerated CRC32C is missing
+    google_crc32c = None
+
 logger = logging.getLogger(__name__)
 
+# Background writer tuning for set_async(): max commands per pipeline and
+# how long (seconds) the writer waits for a batch to fill before sending it
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL = 0.05
+
+# Seconds get_stats() reuses the last INFO result before querying again
+STATS_CACHE_TTL = 5.0
+
+# Bitmap of URL fingerprints used by seen_url(). The two checksums produce
+# different fingerprints, so each gets its own key. Fingerprints are folded
+# into SEEN_URLS_BITS bits (16 MiB) rather than the full 32-bit range (512 MiB).
+SEEN_URLS_KEY = "seen_urls:crc32c" if google_crc32c is not None else "seen_urls:crc32"
+SEEN_URLS_BITS = 1 << 27
+
+
+if orjson is not None:
+    def _json_dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+else:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+def url_fingerprint(url: str) -> int:
+    """32-bit checksum of a URL (CRC32C when available, else CRC32)."""
+    if google_crc32c is not None:
+        return google_crc32c.value(url.encode())
+    return zlib.crc32(url.encode())
+
+
+def _loads_or_raw(value: bytes) -> Any:
+    """Decode a raw JSON value, returning it as a str if it is not valid JSON."""
+    try:
+        return _json_loads(value)
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+        return value.decode('utf-8', errors='replace')
+
 
 class RedisClient:
     """Redis client wrapper for caching and data storage"""
     
+    # Connection pools shared by every RedisClient pointing at the same server
+    _pools: Dict[tuple, redis.BlockingConnectionPool] = {}
+    _pools_lock = threading.Lock()
+    
+    @classmethod
+    def _get_pool(cls, host: str, port: int, db: int) -> redis.BlockingConnectionPool:
+        """
+        Get (or lazily create) the shared blocking connection pool for a server.
+        
+        A BlockingConnectionPool makes callers wait up to REDIS_POOL_TIMEOUT
+        seconds for a free connection once REDIS_MAX_CONNECTIONS are checked
+        out, instead of opening unbounded sockets or failing immediately.
+        """
+        key = (host, port, db)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = redis.BlockingConnectionPool(
+                    host=host,
+                    port=port,
+                    db=db,
+                    max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', '100')),
+                    timeout=float(os.getenv('REDIS_POOL_TIMEOUT', '1.0')),
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                    # Values come back as bytes and go straight to the JSON
+                    # decoder; only non-JSON reads are decoded to str
+                    decode_responses=False,
+                )
+                cls._pools[key] = pool
+            return pool
+    
     def __init__(self, host: str = None, port: int = None, db: int = 0):
         """
         Initialize Redis client.
@@ -30,12 +121,7 @@ class RedisClient:
         
         try:
             self.client = redis.Redis(
-                host=self.host,
-                port=self.port,
-                db=self.db,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
+                connection_pool=self._get_pool(self.host, self.port, self.db)
             )
             # Test connection
             self.client.ping()
@@ -43,6 +129,21 @@ class RedisClient:
         except redis.ConnectionError as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
+        
+        # Fire-and-forget write queue drained by a background thread (see set_async)
+        self._reset_writer()
+        if hasattr(os, 'register_at_fork'):
+            # A forked child (RQ job) has no writer thread and must not
+            # replay or wait on the parent's queued writes
+            def _reset_in_child(ref=weakref.WeakMethod(self._reset_writer)):
+                reset = ref()
+                if reset is not None:
+                    reset()
+            os.register_at_fork(after_in_child=_reset_in_child)
+        
+        # (fetched_at, stats) memo for get_stats; INFO is a heavy command
+        self._stats_cache = (0.0, {})
+        self._stats_lock = threading.Lock()
     
     def set(self, key: str, value: Any, ttl: int = None) -> bool:
         """
@@ -57,8 +158,7 @@ class RedisClient:
             True if successful
         """
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+            value = self._serialize(value)
             
             if ttl:
                 return self.client.setex(key, ttl, value)
@@ -68,6 +168,121 @@ class RedisClient:
             logger.error(f"Error setting cache key {key}: {e}")
             return False
     
+    def set_many(self, mapping: Dict[str, Any], ttl: int = None) -> bool:
+        """
+        Set multiple key-value pairs in a single round trip.
+        
+        Uses a non-transactional pipeline so every SET/SETEX is sent in one
+        batch instead of paying one network round trip per key.
+        
+        Args:
+            mapping: Dict of cache keys to values (dict/list values are JSON serialized)
+            ttl: Time to live in seconds applied to every key (optional)
+        
+        Returns:
+            True if successful
+        """
+        if not mapping:
+            return True
+        try:
+            self._pipeline_set(
+                (key, self._serialize(value), ttl) for key, value in mapping.items()
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error setting {len(mapping)} cache keys: {e}")
+            return False
+    
+    def set_async(self, key: str, value: Any, ttl: int = None) -> None:
+        """
+        Queue a SET/SETEX to be written in the background.
+        
+        The call only appends to an in-process queue; a daemon thread drains
+        it every WRITE_FLUSH_INTERVAL seconds (or as soon as WRITE_BATCH_SIZE
+        commands are waiting) and sends each batch in a single pipeline.
+        Errors are logged by the writer, not raised to the caller. Use flush()
+        when later code needs the writes to be visible.
+        
+        Args:
+            key: Cache key
+            value: Value to store (will be JSON serialized if dict/list)
+            ttl: Time to live in seconds (optional)
+        """
+        with self._write_cond:
+            self._write_queue.append((key, self._serialize(value), ttl))
+            self._pending_writes += 1
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._drain_loop, name="redis-writer", daemon=True
+                )
+                self._writer_thread.start()
+                atexit.register(self.flush, 5.0)
+            # Wake the writer when a batch starts (it idles on an empty
+            # queue) and again once a full batch is waiting
+            if len(self._write_queue) in (1, WRITE_BATCH_SIZE):
+                self._write_cond.notify_all()
+    
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until every write queued by set_async() has been sent.
+        
+        Args:
+            timeout: Max seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            True if the queue was fully drained, False on timeout
+        """
+        with self._write_cond:
+            self._flush_waiters += 1
+            try:
+                self._write_cond.notify_all()
+                return self._write_cond.wait_for(lambda: self._pending_writes == 0, timeout)
+            finally:
+                self._flush_waiters -= 1
+    
+    def _reset_writer(self) -> None:
+        """Start with an empty write queue and no writer thread."""
+        self._write_queue = collections.deque()
+        self._write_cond = threading.Condition()
+        self._pending_writes = 0  # queued + in-flight commands
+        self._flush_waiters = 0
+        self._writer_thread = None
+    
+    def _drain_loop(self) -> None:
+        """Background writer: pipeline queued writes in batches."""
+        while True:
+            with self._write_cond:
+                while not self._write_queue:
+                    self._write_cond.wait()
+                if len(self._write_queue) < WRITE_BATCH_SIZE and not self._flush_waiters:
+                    # Give the batch a moment to fill; flush() cuts this short
+                    self._write_cond.wait(WRITE_FLUSH_INTERVAL)
+                batch = []
+                while self._write_queue and len(batch) < WRITE_BATCH_SIZE:
+                    batch.append(self._write_queue.popleft())
+            
+            if not batch:
+                continue
+            
+            try:
+                self._pipeline_set(batch)
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} queued cache keys: {e}")
+            finally:
+                with self._write_cond:
+                    self._pending_writes -= len(batch)
+                    self._write_cond.notify_all()
+    
+    def _pipeline_set(self, items) -> None:
+        """Send (key, serialized_value, ttl) tuples as one non-transactional pipeline."""
+        pipe = self.client.pipeline(transaction=False)
+        for key, value, ttl in items:
+            if ttl:
+                pipe.setex(key, ttl, value)
+            else:
+                pipe.set(key, value)
+        pipe.execute()
+    
     def get(self, key: str, deserialize: bool = True) -> Optional[Any]:
         """
         Get a value from Redis.
@@ -86,12 +301,9 @@ class RedisClient:
                 return None
             
             if deserialize:
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    return value
+                return _loads_or_raw(value)
             
-            return value
+            return value.decode('utf-8', errors='replace')
         except Exception as e:
             logger.error(f"Error getting cache key {key}: {e}")
             return None
@@ -128,49 +340,141 @@ class RedisClient:
             logger.error(f"Error setting expiration: {e}")
             return False
     
-    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
-        """Get multiple values at once"""
+    def incr(self, key: str, ttl: int = None) -> int:
+        """
+        Increment a counter, (re)setting its expiration in the same round trip.
+        
+        Args:
+            key: Counter key
+            ttl: Time to live in seconds (optional)
+        
+        Returns:
+            The new count, or 0 on error
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.incr(key)
+            if ttl:
+                pipe.expire(key, ttl)
+            return pipe.execute()[0]
+        except Exception as e:
+            logger.error(f"Error incrementing counter {key}: {e}")
+            return 0
+    
+    def seen_url(self, url: str, mark: bool = True) -> bool:
+        """
+        Check a URL against the shared seen-URLs bitmap.
+        
+        This is a Bloom-style prefilter for the database uniqueness check:
+        False means the URL has definitely not been seen, True means it may
+        have been (fingerprint collisions are possible), so callers should
+        still confirm a True result against Postgres.
+        
+        Args:
+            url: URL to check
+            mark: Also record the URL as seen (SETBIT); otherwise only GETBIT
+        
+        Returns:
+            True if the URL may have been seen before
+        """
+        offset = url_fingerprint(url) % SEEN_URLS_BITS
+        try:
+            if mark:
+                return bool(self.client.setbit(SEEN_URLS_KEY, offset, 1))
+            return bool(self.client.getbit(SEEN_URLS_KEY, offset))
+        except Exception as e:
+            logger.error(f"Error checking seen URL: {e}")
+            return True  # Unknown, so let the caller check the database
+    
+    def get_many(self, keys: List[str], raw: bool = False) -> List[Optional[Any]]:
+        """
+        Get multiple values at once.
+        
+        Args:
+            keys: Cache keys
+            raw: Return the stored bytes as-is instead of decoding JSON
+        
+        Returns:
+            One value (or None) per key, in the same order
+        """
         try:
             values = self.client.mget(keys)
-            result = []
-            for value in values:
-                if value:
-                    try:
-                        result.append(json.loads(value))
-                    except json.JSONDecodeError:
-                        result.append(value)
-                else:
-                    result.append(None)
-            return result
+            if raw:
+                return values
+            return [_loads_or_raw(value) if value else None for value in values]
         except Exception as e:
             logger.error(f"Error getting multiple keys: {e}")
             return [None] * len(keys)
     
-    def cache_articles(self, cache_key: str, articles: List[dict], ttl: int = 3600) -> bool:
+    def cache_articles(
+        self,
+        cache_key: Union[str, Dict[str, List[ArticleDTO]]],
+        articles: Optional[List[ArticleDTO]] = None,
+        ttl: int = 3600
+    ) -> bool:
         """
-        Cache a list of articles.
+        Cache a list of articles, or several lists at once.
         
         Args:
-            cache_key: Unique cache key
-            articles: List of article dictionaries
+            cache_key: Unique cache key, or a dict of {cache_key: articles}
+                       to cache several lists in one pipelined round trip
+            articles: List of ArticleDTOs (when cache_key is a str)
             ttl: Time to live in seconds (default: 1 hour)
         
         Returns:
             True if successful
         """
-        return self.set(cache_key, articles, ttl)
+        try:
+            if isinstance(cache_key, dict):
+                return self.set_many(
+                    {key: encode_articles(value) for key, value in cache_key.items()}, ttl
+                )
+            return self.set(cache_key, encode_articles(articles), ttl)
+        except Exception as e:
+            logger.error(f"Error encoding articles for cache: {e}")
+            return False
     
-    def get_cached_articles(self, cache_key: str) -> Optional[List[dict]]:
+    def get_cached_articles(
+        self,
+        cache_key: Union[str, List[str]]
+    ) -> Union[Optional[List[ArticleDTO]], List[Optional[List[ArticleDTO]]]]:
         """
         Retrieve cached articles.
         
         Args:
-            cache_key: Cache key
+            cache_key: Cache key, or a list of keys to fetch with a single MGET
         
         Returns:
-            List of article dictionaries or None
+            List of ArticleDTOs or None; for a list of keys, one such result
+            per key (same order as input)
         """
-        return self.get(cache_key)
+        keys = list(cache_key) if isinstance(cache_key, (list, tuple)) else [cache_key]
+        try:
+            raws = self.client.mget(keys)
+        except Exception as e:
+            logger.error(f"Error getting cached articles: {e}")
+            raws = [None] * len(keys)
+        
+        results = [self._decode_articles(raw) for raw in raws]
+        return results if isinstance(cache_key, (list, tuple)) else results[0]
+    
+    @staticmethod
+    def _decode_articles(raw: Optional[bytes]) -> Optional[List[ArticleDTO]]:
+        """Decode a cached article list, treating unreadable entries as misses."""
+        if raw is None:
+            return None
+        try:
+            return decode_articles(raw)
+        except Exception as e:
+            logger.error(f"Error decoding cached articles: {e}")
+            return None
+    
+    @staticmethod
+    def _serialize(value: Any) -> Any:
+        """JSON-serialize dict/list values; pass other values through as-is."""
+        if isinstance(value, (dict, list)):
+            return _json_dumps(value)
+        return value
     
     def flush_all(self) -> bool:
         """Clear all cached data (use with caution!)"""
@@ -181,19 +485,33 @@ class RedisClient:
             return False
     
     def get_stats(self) -> dict:
-        """Get Redis statistics"""
-        try:
-            info = self.client.info()
-            return {
-                'used_memory_human': info.get('used_memory_human'),
-                'connected_clients': info.get('connected_clients'),
-                'total_commands_processed': info.get('total_commands_processed'),
-                'keyspace_hits': info.get('keyspace_hits', 0),
-                'keyspace_misses': info.get('keyspace_misses', 0),
-            }
-        except Exception as e:
-            logger.error(f"Error getting stats: {e}")
-            return {}
+        """
+        Get Redis statistics.
+        
+        Results are cached for STATS_CACHE_TTL seconds so dashboards polling
+        this endpoint don't issue an INFO command on every request.
+        """
+        with self._stats_lock:
+            fetched_at, stats = self._stats_cache
+            now = time.monotonic()
+            if stats and now - fetched_at < STATS_CACHE_TTL:
+                return stats
+            
+            try:
+                info = self.client.info()
+                stats = {
+                    'used_memory_human': info.get('used_memory_human'),
+                    'connected_clients': info.get('connected_clients'),
+                    'total_commands_processed': info.get('total_commands_processed'),
+                    'keyspace_hits': info.get('keyspace_hits', 0),
+                    'keyspace_misses': info.get('keyspace_misses', 0),
+                }
+            except Exception as e:
+                logger.error(f"Error getting stats: {e}")
+                return {}
+            
+            self._stats_cache = (now, stats)
+            return stats
 
 
 # Global Redis client instance
@@ -206,3 +524,18 @@ def get_redis_client() -> RedisClient:
     if _redis_client is None:
         _redis_client = RedisClient()
     return _redis_client
+
+
+def flush_redis_client(timeout: float = None) -> bool:
+    """
+    Flush the global client's set_async() writes, if the client exists.
+    
+    Args:
+        timeout: Max seconds to wait (default: wait indefinitely)
+    
+    Returns:
+        True if nothing is left queued, False on timeout
+    """
+    if _redis_client is None:
+        return True
+    return _redis_client.flush(timeout)
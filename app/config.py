@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     # Gemini API
     GEMINI_API_KEY: str = Field(..., description="Google Gemini API key")
     GEMINI_MODEL: str = Field("gemini-1.5-flash", description="Gemini model name")
+    GEMINI_MAX_CONCURRENCY: int = Field(5, description="Max concurrent Gemini requests per digest run")
 
     # Email
     EMAIL_SENDER: str = Field(..., description="SMTP sender address")
@@ -2,8 +2,11 @@
 Database package for AI News Aggregator.
 Provides SQLAlchemy models, database configuration, and CRUD operations.
 """
-from app.database.base import Base, engine, SessionLocal, get_db_session, init_db, drop_all_tables
-from app.database.models import Source, Article, SourceType, OpenAIArticle, AnthropicArticle, YouTubeVideo
+from app.database.base import (
+    Base, engine, SessionLocal, ScopedSession, get_db_session,
+    get_async_db_session, get_async_sessionmaker, init_db, drop_all_tables,
+)
+from app.database.models import Source, Article, SourceType, SourceTypeRow, OpenAIArticle, AnthropicArticle, YouTubeVideo
 from app.database.models_extended import (
     ArticleSummary, ArticleEmbedding, EmailSubscription, EmailDelivery,
     ProcessingQueue, ProcessingStatus, EmailFrequency, DeliveryStatus,
@@ -14,12 +17,16 @@ __all__ = [
     "Base",
     "engine", 
     "SessionLocal",
+    "ScopedSession",
     "get_db_session",
+    "get_async_db_session",
+    "get_async_sessionmaker",
     "init_db",
     "drop_all_tables",
     "Source",
     "Article",
     "SourceType",
+    "SourceTypeRow",
     "OpenAIArticle",
     "AnthropicArticle",
     "YouTubeVideo",
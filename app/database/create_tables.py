@@ -4,16 +4,24 @@ Database initialization script.
 Creates all tables and optionally adds default sources.
 """
 import sys
-import json
+import functools
 import logging
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # Fallback to the stdlib json module if orjson is not installed
+    from json import loads as _json_loads
+
+from sqlalchemy import inspect, select
+
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.database import init_db, get_db_session
+from app.database import init_db, get_db_session, engine
 from app.database.models import Source, SourceType
-from app.database.repository import SourceRepository
+from app.database.repository import SourceRepository, insert_ignoring_duplicates
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,39 +30,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_youtube_channels():
-    """Load YouTube channels from config file"""
+@functools.lru_cache(maxsize=1)
+def load_youtube_channels() -> tuple:
+    """
+    Load YouTube channels from config file.
+    
+    The file is read and parsed once per process; the result is returned as
+    an immutable tuple shared by all callers.
+    """
     config_file = Path(__file__).parent / "config" / "youtube_channels.json"
     try:
         if config_file.exists():
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config.get('channels', [])
+            config = _json_loads(config_file.read_bytes())
+            return tuple(config.get('channels', ()))
     except Exception as e:
         logger.error(f"Error loading YouTube channels: {e}")
-    return []
+    return ()
 
 
 def add_default_sources():
     """Add default sources to the database"""
     logger.info("\n📝 Adding default sources...")
     
-    sources_added = 0
-    sources_skipped = 0
+    rows = []
     
     # Add OpenAI source
-    openai_source = SourceRepository.create_source(
-        name="OpenAI News",
-        source_type=SourceType.OPENAI,
-        url="https://openai.com/news/rss.xml",
-        active=True
-    )
-    if openai_source:
-        sources_added += 1
-        logger.info(f"  ✅ Added: OpenAI News")
-    else:
-        sources_skipped += 1
-        logger.info(f"  ⏭️  Skipped (exists): OpenAI News")
+    rows.append({
+        "name": "OpenAI News",
+        "source_type": SourceType.OPENAI,
+        "url": "https://openai.com/news/rss.xml",
+        "active": True,
+    })
     
     # Add Anthropic sources (Research, Engineering, News)
     anthropic_feeds = {
@@ -64,18 +70,12 @@ def add_default_sources():
     }
     
     for name, url in anthropic_feeds.items():
-        source = SourceRepository.create_source(
-            name=name,
-            source_type=SourceType.ANTHROPIC,
-            url=url,
-            active=True
-        )
-        if source:
-            sources_added += 1
-            logger.info(f"  ✅ Added: {name}")
-        else:
-            sources_skipped += 1
-            logger.info(f"  ⏭️  Skipped (exists): {name}")
+        rows.append({
+            "name": name,
+            "source_type": SourceType.ANTHROPIC,
+            "url": url,
+            "active": True,
+        })
     
     # Add YouTube channels from config
     youtube_channels = load_youtube_channels()
@@ -89,19 +89,36 @@ def add_default_sources():
         # Create RSS feed URL
         rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
         
-        source = SourceRepository.create_source(
-            name=f"YouTube: {channel_name}",
-            source_type=SourceType.YOUTUBE,
-            url=rss_url,
-            active=True
-        )
-        if source:
-            sources_added += 1
-            logger.info(f"  ✅ Added: YouTube: {channel_name}")
+        rows.append({
+            "name": f"YouTube: {channel_name}",
+            "source_type": SourceType.YOUTUBE,
+            "url": rss_url,
+            "active": True,
+        })
+    
+    # Insert everything in one statement; existing URLs are skipped by the
+    # database and, where supported, RETURNING reports only the rows
+    # actually inserted
+    with get_db_session() as session:
+        stmt = insert_ignoring_duplicates(session, Source)
+        if session.get_bind().dialect.insert_returning:
+            inserted_urls = set(session.execute(stmt.values(rows).returning(Source.url)).scalars())
+        else:
+            urls = [row["url"] for row in rows]
+            existing = set(session.scalars(select(Source.url).where(Source.url.in_(urls))))
+            new_rows = [row for row in rows if row["url"] not in existing]
+            if new_rows:
+                session.execute(stmt.values(new_rows))
+            inserted_urls = {row["url"] for row in new_rows}
+    
+    for row in rows:
+        if row["url"] in inserted_urls:
+            logger.info(f"  ✅ Added: {row['name']}")
         else:
-            sources_skipped += 1
-            logger.info(f"  ⏭️  Skipped (exists): YouTube: {channel_name}")
+            logger.info(f"  ⏭️  Skipped (exists): {row['name']}")
     
+    sources_added = len(inserted_urls)
+    sources_skipped = len(rows) - sources_added
     logger.info(f"\n📊 Summary: {sources_added} added, {sources_skipped} skipped")
 
 
@@ -112,9 +129,10 @@ def main():
     print("=" * 60)
     
     try:
-        # Create tables
+        # Create tables; on a fresh database skip the per-table existence checks
         logger.info("\n🔨 Creating database tables...")
-        init_db()
+        fresh = not inspect(engine).has_table(Source.__tablename__)
+        init_db(check=not fresh)
         
         # Add default sources
         add_default_sources()
@@ -125,9 +143,8 @@ def main():
         logger.info(f"  Total sources in database: {len(all_sources)}")
         
         # Show sources by type
-        for source_type in SourceType:
-            sources = SourceRepository.get_sources_by_type(source_type)
-            logger.info(f"  - {source_type.value}: {len(sources)} sources")
+        for source_type, count in SourceRepository.count_sources_by_type().items():
+            logger.info(f"  - {source_type.label}: {count} sources")
         
         print("\n" + "=" * 60)
         print("✅ DATABASE INITIALIZATION COMPLETE!")
@@ -1,20 +1,58 @@
 """
 SQLAlchemy models for AI News Aggregator.
 """
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Text, DateTime, Boolean, ForeignKey, Index, event,
+)
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.sql import func
 import enum
 
 from app.database.base import Base
 
 
-class SourceType(enum.Enum):
-    """Enum for source types"""
-    YOUTUBE = "youtube"
-    OPENAI = "openai"
-    ANTHROPIC = "anthropic"
-    BLOG = "blog"
+# Characters of Article.content kept in Article.content_preview for prompts
+CONTENT_PREVIEW_LENGTH = 2000
+
+
+class SourceType(enum.IntEnum):
+    """
+    Enum for source types.
+
+    Values are the primary keys of the ``source_types`` lookup table, so
+    ``sources.source_type`` is stored as a 2-byte SMALLINT foreign key.
+    """
+    YOUTUBE = 1
+    OPENAI = 2
+    ANTHROPIC = 3
+    BLOG = 4
+
+    @property
+    def label(self) -> str:
+        """Human-readable name (the string value used before normalization)."""
+        return self.name.lower()
+
+
+class SourceTypeRow(Base):
+    """
+    Lookup table backing SourceType.
+    """
+    __tablename__ = "source_types"
+
+    id = Column(SmallInteger, primary_key=True, autoincrement=False)
+    name = Column(String(32), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<SourceTypeRow(id={self.id}, name='{self.name}')>"
+
+
+@event.listens_for(SourceTypeRow.__table__, "after_create")
+def _seed_source_types(target, connection, **kw):
+    """Populate the lookup rows whenever the table is created via create_all()."""
+    connection.execute(
+        target.insert(),
+        [{"id": member.value, "name": member.label} for member in SourceType],
+    )
 
 
 class Source(Base):
@@ -25,16 +63,29 @@ class Source(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    source_type = Column(Enum(SourceType), nullable=False)
+    source_type = Column(SmallInteger, ForeignKey("source_types.id"), nullable=False, index=True)
     url = Column(String(512), nullable=False, unique=True)
     active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationship to articles
     articles = relationship("Article", back_populates="source", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Active-source scans (get_active_source_rows) read only this partial
+        # index: an index-only scan over the active rows
+        Index(
+            "ix_sources_active_true",
+            "source_type",
+            postgresql_include=["id", "name", "url"],
+            postgresql_where=active.is_(True),
+        ),
+        # Sources are rarely updated; leave page room for HOT updates of the few that are
+        {"postgresql_with": {"fillfactor": 90}},
+    )
+
     def __repr__(self):
-        return f"<Source(id={self.id}, name='{self.name}', type={self.source_type.value})>"
+        return f"<Source(id={self.id}, name='{self.name}', type={SourceType(self.source_type).label})>"
 
 
 class Article(Base):
@@ -46,10 +97,11 @@ class Article(Base):
     id = Column(Integer, primary_key=True, index=True)
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False, index=True)
     title = Column(String(512), nullable=False)
-    url = Column(String(512), nullable=False, unique=True, index=True)
+    url = Column(String(512), nullable=False, unique=True)  # indexed via ix_articles_url below
     content = Column(Text, nullable=True)  # Full content/description/transcript
+    content_preview = Column(String(2048), nullable=True)  # Bounded prefix of content (or extracted full_content), set on write
     published_at = Column(DateTime, nullable=True, index=True)
-    scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    scraped_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     
     # Additional metadata
     video_id = Column(String(128), nullable=True)  # For YouTube videos
@@ -60,6 +112,10 @@ class Article(Base):
     full_content = Column(Text, nullable=True)  # Extracted full text content
     extraction_method = Column(String(50), nullable=True)  # e.g., rss, youtube_transcript, newspaper3k
     
+    # Latest summary from the pipeline worker, read directly by the digest
+    summary = Column(Text, nullable=True)
+    summary_generated_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Relationship to source
     source = relationship("Source", back_populates="articles")
     
@@ -68,6 +124,30 @@ class Article(Base):
     embedding = relationship("ArticleEmbedding", back_populates="article", uselist=False, cascade="all, delete-orphan")
     processing_queue = relationship("ProcessingQueue", back_populates="article", uselist=False, cascade="all, delete-orphan")
 
+    # Query -> index map (published_at >= cutoff ORDER BY published_at DESC is
+    # served by a backward scan of ix_articles_published_at, so it needs no
+    # separate DESC index; article_summaries.article_id is indexed on that model):
+    #   per-source digest / get_articles_by_source -> ix_articles_source_published
+    #   get_recent_articles (scraped_at window)     -> ix_articles_scraped_desc
+    #   LLM digest window joined to sources         -> ix_articles_scraped_source
+    #   pipeline backlog (status IN ... + window)   -> ix_articles_status_scraped
+    #   URL dedup lookups                           -> ix_articles_url
+    __table_args__ = (
+        # Digest hot query: recent articles per source, newest first
+        Index("ix_articles_source_published", "source_id", published_at.desc()),
+        Index("ix_articles_scraped_desc", scraped_at.desc()),
+        Index("ix_articles_scraped_source", "scraped_at", "source_id"),
+        Index("ix_articles_status_scraped", "processing_status", "scraped_at"),
+        # Covering URL index so digest/dedup lookups can skip the heap fetch
+        Index("ix_articles_url", "url", postgresql_include=["title", "published_at"]),
+    )
+
+    @validates("content")
+    def _sync_content_preview(self, key, value):
+        """Keep content_preview in step with content so prompts never slice megabyte strings."""
+        self.content_preview = value[:CONTENT_PREVIEW_LENGTH] if value is not None else None
+        return value
+
     def __repr__(self):
         return f"<Article(id={self.id}, title='{self.title[:50]}...', source_id={self.source_id})>"
 
@@ -84,7 +164,7 @@ class OpenAIArticle(Base):
     description = Column(Text, nullable=True)
     published_at = Column(DateTime, nullable=True)
     category = Column(String(128), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
         return f"<OpenAIArticle(guid='{self.guid}', title='{self.title[:50]}...')>"
@@ -102,7 +182,7 @@ class AnthropicArticle(Base):
     description = Column(Text, nullable=True)
     published_at = Column(DateTime, nullable=True)
     category = Column(String(128), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
         return f"<AnthropicArticle(guid='{self.guid}', title='{self.title[:50]}...')>"
@@ -120,7 +200,7 @@ class YouTubeVideo(Base):
     description = Column(Text, nullable=True)
     published_at = Column(DateTime, nullable=True)
     category = Column(String(128), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
         return f"<YouTubeVideo(guid='{self.guid}', title='{self.title[:50]}...')>"
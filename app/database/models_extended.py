@@ -3,12 +3,12 @@ Extended database models for AI News Aggregator pipeline.
 Includes LLM summaries, vector embeddings, and email subscriptions.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Enum, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Enum, Index, text
 from sqlalchemy.orm import relationship
 import enum
 
 try:
-    from pgvector.sqlalchemy import Vector
+    from pgvector.sqlalchemy import HALFVEC as Vector
 except ImportError:
     # Fallback if pgvector is not installed yet
     Vector = None
@@ -56,7 +56,8 @@ class ArticleEmbedding(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
-    embedding = Column(Vector(384) if Vector else Text, nullable=False)  # 384 dimensions for all-MiniLM-L6-v2
+    # halfvec: 384 float16 dimensions (all-MiniLM-L6-v2), half the size of vector(384)
+    embedding = Column(Vector(384) if Vector else Text, nullable=False)
     model = Column(String(50), nullable=False, default="all-MiniLM-L6-v2")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -65,7 +66,10 @@ class ArticleEmbedding(Base):
     
     # Index for vector similarity search
     __table_args__ = (
-        Index('idx_embedding_vector', 'embedding', postgresql_using='ivfflat'),
+        Index(
+            'idx_embedding_vector', 'embedding', postgresql_using='ivfflat',
+            postgresql_ops={'embedding': 'halfvec_cosine_ops'},
+        ),
     ) if Vector else tuple()
 
     def __repr__(self):
@@ -142,8 +146,14 @@ class ProcessingQueue(Base):
     __tablename__ = "processing_queue"
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
-    status = Column(Enum(ProcessingStatus), nullable=False, default=ProcessingStatus.PENDING, index=True)
+    # One entry per article; the status writer upserts on this key
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    # Stored by value ("pending", ...) to match the processingstatus type the
+    # initial migration created, so plain value strings round-trip too
+    status = Column(
+        Enum(ProcessingStatus, values_callable=lambda e: [m.value for m in e]),
+        nullable=False, default=ProcessingStatus.PENDING, index=True,
+    )
     current_stage = Column(String(50), nullable=True)  # extraction, summarization, embedding
     retry_count = Column(Integer, nullable=False, default=0)
     error_message = Column(Text, nullable=True)
@@ -155,6 +165,17 @@ class ProcessingQueue(Base):
     # Relationship to article
     article = relationship("Article", back_populates="processing_queue", uselist=False)
 
+    __table_args__ = (
+        # Retry scanner (ArticlePipeline.retry_failed_articles): oldest
+        # retryable entries first, read without touching finished rows
+        Index(
+            "ix_processing_queue_retryable",
+            "updated_at",
+            postgresql_include=["article_id", "retry_count"],
+            postgresql_where=text("status IN ('failed', 'pending')"),
+        ),
+    )
+
     def __repr__(self):
         return f"<ProcessingQueue(id={self.id}, article_id={self.article_id}, status={self.status.value})>"
 
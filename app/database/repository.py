@@ -3,16 +3,124 @@ CRUD repository for database operations.
 Provides a clean interface for interacting with the database.
 """
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+from datetime import datetime, timezone
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select, insert, update, bindparam, lambda_stmt
+from sqlalchemy.dialects import postgresql, sqlite
 
+from app.cache.bloom import BloomFilter
 from app.database.base import get_db_session
-from app.database.models import Source, Article, SourceType
+from app.database.models import Source, Article, SourceType, CONTENT_PREVIEW_LENGTH
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT in bulk_create_articles
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Process-local Bloom filter of stored article URLs; None until
+# ArticleRepository.warm_url_filter() has loaded it
+_article_url_filter: Optional[BloomFilter] = None
+
+# Seconds get_active_source_rows() serves its cached rows (per process)
+ACTIVE_SOURCES_TTL = 60.0
+
+# (fetched_at, rows); cleared when sources are created or toggled
+_active_sources_cache: tuple = (0.0, None)
+_active_sources_lock = threading.Lock()
+
+# Hot lookups built once as lambda statements: SQLAlchemy caches their
+# construction and compilation, so each call only binds parameters
+_article_by_url = lambda_stmt(lambda: select(Article).where(Article.url == bindparam("url")))
+_source_by_url = lambda_stmt(lambda: select(Source).where(Source.url == bindparam("url")))
+_source_by_name = lambda_stmt(lambda: select(Source).where(Source.name == bindparam("name")).limit(1))
+
+# Columns scrapers need from a source; the active subset is covered by the
+# partial index ix_sources_active_true
+_source_rows = select(Source.id, Source.name, Source.url, Source.source_type)
+
+
+def insert_row(session, model, values: Dict[str, Any], returning: tuple = ("id",)):
+    """
+    Insert one row with a Core INSERT and return it as a transient model object.
+    
+    This skips the ORM unit of work and the refresh SELECT that add/commit/
+    refresh needs to load server defaults: the generated columns named in
+    `returning` come back with the INSERT itself (RETURNING), or just the
+    primary key via lastrowid on dialects without RETURNING support.
+    
+    Args:
+        session: Session to execute in (the caller commits)
+        model: Mapped class to insert into
+        values: Column values for the new row
+        returning: Names of server-generated columns to fetch
+    
+    Returns:
+        Detached instance of `model` populated with values and generated columns
+    """
+    table = model.__table__
+    stmt = insert(table).values(values)
+    if session.get_bind().dialect.insert_returning:
+        row = session.execute(stmt.returning(*(table.c[name] for name in returning))).one()
+        generated = row._asdict()
+    else:
+        result = session.execute(stmt)
+        generated = {"id": result.inserted_primary_key[0]}
+    return model(**values, **generated)
+
+
+def existing_article_urls(session, urls: Iterable[str]) -> Set[str]:
+    """
+    Return the subset of `urls` already stored in articles.
+    
+    One SELECT url ... WHERE url IN (...) per BULK_INSERT_CHUNK_SIZE URLs
+    (keeping each statement under driver parameter limits) replaces a
+    SELECT per candidate, and is answered from the unique url index alone.
+    
+    Args:
+        session: Session to execute in
+        urls: Candidate article URLs
+    
+    Returns:
+        Set of URLs that already exist
+    """
+    urls = list(dict.fromkeys(urls))
+    existing = set()
+    for i in range(0, len(urls), BULK_INSERT_CHUNK_SIZE):
+        chunk = urls[i:i + BULK_INSERT_CHUNK_SIZE]
+        existing.update(session.scalars(select(Article.url).where(Article.url.in_(chunk))))
+    return existing
+
+
+def insert_ignoring_duplicates(session, model):
+    """
+    Build an INSERT into `model`'s table that silently skips rows whose URL exists.
+    
+    Uniqueness is enforced by the table's unique url index, so the database
+    reports duplicates through the affected row count instead of us issuing
+    a SELECT per URL.
+    
+    Args:
+        session: Session whose dialect picks the construct
+        model: Mapped class with a unique `url` column (Article, Source)
+    
+    Returns:
+        INSERT statement; add rows with .values()
+    """
+    table = model.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=["url"])
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=["url"])
+    if dialect in ("mysql", "mariadb"):
+        return insert(table).prefix_with("IGNORE")
+    # Unknown dialect: a duplicate fails its chunk, and the row-by-row retry
+    # then reports it as an error
+    return insert(table)
+
 
 class ArticleRepository:
     """Repository for Article CRUD operations"""
@@ -35,22 +143,21 @@ class ArticleRepository:
         """
         try:
             with get_db_session() as session:
-                article = Article(
-                    source_id=source_id,
-                    title=title,
-                    url=url,
-                    content=content,
-                    published_at=published_at,
-                    video_id=video_id,
-                    category=category,
-                    scraped_at=datetime.utcnow()
-                )
-                session.add(article)
-                session.commit()
-                session.refresh(article)
+                article = insert_row(session, Article, {
+                    "source_id": source_id,
+                    "title": title,
+                    "url": url,
+                    "content": content,
+                    "content_preview": content[:CONTENT_PREVIEW_LENGTH] if content is not None else None,
+                    "published_at": published_at,
+                    "video_id": video_id,
+                    "category": category,
+                }, returning=("id", "scraped_at"))
+                ArticleRepository._remember_urls([url])
                 logger.info(f"Created article: {title[:50]}")
                 return article
         except IntegrityError:
+            ArticleRepository._remember_urls([url])
             logger.debug(f"Article already exists: {url}")
             return None
         except Exception as e:
@@ -62,6 +169,15 @@ class ArticleRepository:
         """
         Bulk create articles from scraped data.
         
+        URLs already in the database are filtered out up front with one IN
+        query per chunk, so their content is never sent. The rest are written
+        with one multi-row INSERT ... ON CONFLICT DO NOTHING per
+        BULK_INSERT_CHUNK_SIZE articles; conflicts (URLs repeated within
+        the batch or inserted concurrently) are counted as duplicates too.
+        The whole batch is one transaction, committed once: each chunk runs
+        in a SAVEPOINT, and a chunk that fails is rolled back to it and
+        retried row by row so that only the bad rows are counted as errors.
+        
         Args:
             articles_data: List of dicts with article data
         
@@ -70,67 +186,138 @@ class ArticleRepository:
         """
         stats = {"created": 0, "duplicates": 0, "errors": 0}
         
+        # Rows go through Core, so fill content_preview here (no ORM validator)
+        rows = []
+        for data in articles_data:
+            try:
+                content = data.get("content")
+                rows.append({
+                    "source_id": data["source_id"],
+                    "title": data["title"],
+                    "url": data["url"],
+                    "content": content,
+                    "content_preview": content[:CONTENT_PREVIEW_LENGTH] if content is not None else None,
+                    "published_at": data.get("published_at"),
+                    "video_id": data.get("video_id"),
+                    "category": data.get("category"),
+                })
+            except Exception as e:
+                stats["errors"] += 1
+                logger.error(f"Error creating article: {e}")
+        
+        # With a warm URL filter only possible repeats go to the database; a
+        # URL stored by another process since warm-up is still caught by
+        # ON CONFLICT below
+        url_filter = _article_url_filter
+        candidates = (
+            row["url"] for row in rows if url_filter is None or row["url"] in url_filter
+        )
+        
         with get_db_session() as session:
-            for data in articles_data:
+            existing = existing_article_urls(session, candidates)
+            if existing:
+                stats["duplicates"] += sum(1 for row in rows if row["url"] in existing)
+                rows = [row for row in rows if row["url"] not in existing]
+            
+            stmt = insert_ignoring_duplicates(session, Article)
+            for i in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                chunk = rows[i:i + BULK_INSERT_CHUNK_SIZE]
                 try:
-                    # Check if article already exists
-                    existing = session.query(Article).filter(
-                        Article.url == data["url"]
-                    ).first()
-                    
-                    if existing:
-                        stats["duplicates"] += 1
-                        continue
-                    
-                    # Create new article
-                    article = Article(
-                        source_id=data["source_id"],
-                        title=data["title"],
-                        url=data["url"],
-                        content=data.get("content"),
-                        published_at=data.get("published_at"),
-                        video_id=data.get("video_id"),
-                        category=data.get("category"),
-                        scraped_at=datetime.utcnow()
-                    )
-                    session.add(article)
-                    session.commit()
-                    stats["created"] += 1
-                    
-                except IntegrityError:
-                    session.rollback()
-                    stats["duplicates"] += 1
+                    with session.begin_nested():
+                        created = session.execute(stmt.values(chunk)).rowcount
+                    stats["created"] += created
+                    stats["duplicates"] += len(chunk) - created
                 except Exception as e:
-                    session.rollback()
-                    stats["errors"] += 1
-                    logger.error(f"Error creating article: {e}")
+                    logger.warning(
+                        f"Bulk insert of {len(chunk)} articles failed, retrying row by row: "
+                        f"{getattr(e, 'orig', e)}"
+                    )
+                    ArticleRepository._insert_rows_individually(session, stmt, chunk, stats)
         
+        ArticleRepository._remember_urls(row["url"] for row in rows)
         return stats
     
+    @staticmethod
+    def warm_url_filter(capacity: Optional[int] = None, error_rate: float = 0.01) -> int:
+        """
+        Load every stored article URL into the process-local Bloom filter.
+        
+        Afterwards bulk_create_articles() only asks the database about URLs
+        the filter has (probably) seen, so brand-new URLs cost no SELECT.
+        Call once at the start of an ingest run.
+        
+        Args:
+            capacity: Expected URL count (default: twice the current count)
+            error_rate: Target false-positive rate at `capacity`
+        
+        Returns:
+            Number of URLs loaded, or -1 if loading failed (filter stays off)
+        """
+        global _article_url_filter
+        try:
+            with get_db_session() as session:
+                if capacity is None:
+                    capacity = 2 * session.scalar(select(func.count(Article.id))) + 10_000
+                url_filter = BloomFilter(capacity, error_rate)
+                url_filter.update(
+                    session.scalars(select(Article.url).execution_options(yield_per=10_000))
+                )
+            _article_url_filter = url_filter
+            logger.info(f"Loaded {len(url_filter)} article URLs into the URL filter")
+            return len(url_filter)
+        except Exception as e:
+            logger.error(f"Error warming article URL filter: {e}")
+            return -1
+    
+    @staticmethod
+    def _remember_urls(urls: Iterable[str]) -> None:
+        """Add stored (or known-duplicate) URLs to the URL filter, if warm."""
+        if _article_url_filter is not None:
+            _article_url_filter.update(urls)
+    
+    @staticmethod
+    def _insert_rows_individually(session, stmt, rows: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+        """Insert rows one at a time so a bad row only fails itself."""
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    created = session.execute(stmt.values(row)).rowcount
+                stats["created"] += created
+                stats["duplicates"] += 1 - created
+            except Exception as e:
+                stats["errors"] += 1
+                logger.error(f"Error creating article: {e}")
+    
     @staticmethod
     def get_article_by_url(url: str) -> Optional[Article]:
         """Get article by URL"""
         with get_db_session() as session:
-            return session.query(Article).filter(Article.url == url).first()
+            return session.execute(_article_by_url, {"url": url}).scalar_one_or_none()
     
     @staticmethod
     def get_articles_by_source(source_id: int, limit: int = 100) -> List[Article]:
         """Get articles for a specific source"""
         with get_db_session() as session:
-            return session.query(Article).filter(
-                Article.source_id == source_id
-            ).order_by(desc(Article.published_at)).limit(limit).all()
+            return session.scalars(
+                select(Article)
+                .where(Article.source_id == source_id)
+                .order_by(desc(Article.published_at))
+                .limit(limit)
+            ).all()
     
     @staticmethod
     def get_recent_articles(hours: int = 24, limit: int = 100) -> List[Article]:
         """Get recent articles within specified hours"""
         from datetime import timedelta
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
         
         with get_db_session() as session:
-            return session.query(Article).filter(
-                Article.scraped_at >= cutoff
-            ).order_by(desc(Article.scraped_at)).limit(limit).all()
+            return session.scalars(
+                select(Article)
+                .where(Article.scraped_at >= cutoff)
+                .order_by(desc(Article.scraped_at))
+                .limit(limit)
+            ).all()
 
 
 class SourceRepository:
@@ -151,17 +338,15 @@ class SourceRepository:
         """
         try:
             with get_db_session() as session:
-                source = Source(
-                    name=name,
-                    source_type=source_type,
-                    url=url,
-                    active=active
-                )
-                session.add(source)
-                session.commit()
-                session.refresh(source)
-                logger.info(f"Created source: {name}")
-                return source
+                source = insert_row(session, Source, {
+                    "name": name,
+                    "source_type": source_type,
+                    "url": url,
+                    "active": active,
+                }, returning=("id", "created_at"))
+            SourceRepository.clear_active_sources_cache()
+            logger.info(f"Created source: {name}")
+            return source
         except IntegrityError:
             logger.debug(f"Source already exists: {url}")
             return None
@@ -173,44 +358,100 @@ class SourceRepository:
     def get_source_by_url(url: str) -> Optional[Source]:
         """Get source by URL"""
         with get_db_session() as session:
-            return session.query(Source).filter(Source.url == url).first()
+            return session.execute(_source_by_url, {"url": url}).scalar_one_or_none()
     
     @staticmethod
     def get_source_by_name(name: str) -> Optional[Source]:
         """Get source by name"""
         with get_db_session() as session:
-            return session.query(Source).filter(Source.name == name).first()
+            return session.execute(_source_by_name, {"name": name}).scalar_one_or_none()
     
     @staticmethod
-    def get_all_sources(active_only: bool = True) -> List[Source]:
-        """Get all sources"""
+    def get_all_sources(active_only: bool = True) -> List[Any]:
+        """
+        Get all sources as rows with id, name, url and source_type attributes.
+        
+        The active list comes from get_active_source_rows() (cached, and
+        served by the partial index); pass active_only=False for every source.
+        """
+        if active_only:
+            return SourceRepository.get_active_source_rows()
         with get_db_session() as session:
-            query = session.query(Source)
-            if active_only:
-                query = query.filter(Source.active == True)
-            return query.all()
+            return session.execute(_source_rows).all()
     
     @staticmethod
-    def get_sources_by_type(source_type: SourceType, active_only: bool = True) -> List[Source]:
-        """Get sources by type"""
+    def get_active_source_rows(source_type: Optional[SourceType] = None) -> List[Any]:
+        """
+        Get active sources as lightweight rows instead of ORM entities.
+        
+        Only id, name, url and source_type are selected, which the partial
+        index ix_sources_active_true covers, so scrapers that just need to
+        know what to fetch skip entity loading and the table heap. The rows
+        are immutable and bound to no session, so the full active list is
+        cached for ACTIVE_SOURCES_TTL seconds and shared across callers;
+        create_source() and update_source_status() clear it.
+        
+        Args:
+            source_type: Restrict to one source type
+        
+        Returns:
+            Named-tuple rows with id, name, url and source_type attributes
+        """
+        global _active_sources_cache
+        with _active_sources_lock:
+            fetched_at, rows = _active_sources_cache
+            now = time.monotonic()
+            if rows is None or now - fetched_at >= ACTIVE_SOURCES_TTL:
+                with get_db_session() as session:
+                    rows = session.execute(_source_rows.where(Source.active.is_(True))).all()
+                _active_sources_cache = (now, rows)
+        if source_type is not None:
+            return [row for row in rows if row.source_type == source_type.value]
+        return list(rows)
+    
+    @staticmethod
+    def clear_active_sources_cache() -> None:
+        """Drop the cached active-source rows so the next read hits the database."""
+        global _active_sources_cache
+        with _active_sources_lock:
+            _active_sources_cache = (0.0, None)
+    
+    @staticmethod
+    def get_sources_by_type(source_type: SourceType, active_only: bool = True) -> List[Any]:
+        """Get sources of one type as rows (see get_all_sources)"""
+        if active_only:
+            return SourceRepository.get_active_source_rows(source_type)
         with get_db_session() as session:
-            query = session.query(Source).filter(Source.source_type == source_type)
-            if active_only:
-                query = query.filter(Source.active == True)
-            return query.all()
+            return session.execute(_source_rows.where(Source.source_type == source_type.value)).all()
+    
+    @staticmethod
+    def count_sources_by_type(active_only: bool = True) -> Dict[SourceType, int]:
+        """
+        Count sources per type with a single GROUP BY query.
+        
+        Returns:
+            Dict mapping every SourceType to its source count (0 if none)
+        """
+        stmt = select(Source.source_type, func.count()).group_by(Source.source_type)
+        if active_only:
+            stmt = stmt.where(Source.active == True)
+        with get_db_session() as session:
+            counts = dict(session.execute(stmt).all())
+        return {source_type: counts.get(source_type.value, 0) for source_type in SourceType}
     
     @staticmethod
     def update_source_status(source_id: int, active: bool) -> bool:
         """Update source active status"""
         try:
             with get_db_session() as session:
-                source = session.query(Source).filter(Source.id == source_id).first()
-                if source:
-                    source.active = active
-                    session.commit()
-                    logger.info(f"Updated source {source_id} active status to {active}")
-                    return True
+                result = session.execute(
+                    update(Source).where(Source.id == source_id).values(active=active)
+                )
+            if result.rowcount == 0:
                 return False
+            SourceRepository.clear_active_sources_cache()
+            logger.info(f"Updated source {source_id} active status to {active}")
+            return True
         except Exception as e:
             logger.error(f"Error updating source status: {e}")
             return False
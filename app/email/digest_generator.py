@@ -1,26 +1,47 @@
 """
 Digest generator - fetches and formats articles for email digest.
 """
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from sqlalchemy import and_
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
 from app.database import SessionLocal, Article, ArticleSummary, Source
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _fmt_date(day: date) -> str:
+    """Format a publish date for the template; most digest rows share one or two days."""
+    return day.strftime('%B %d, %Y')
+
+
 class DigestGenerator:
     """Generates email digests from recent articles"""
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db: Optional[Session] = None):
+        """
+        Args:
+            db: Session to use. If omitted, a session is opened from the
+                shared pool and released by close() (or on leaving a
+                ``with`` block).
+        """
+        self._owns_db = db is None
+        self.db = db if db is not None else SessionLocal()
     
-    def __del__(self):
-        """Close database session"""
-        if hasattr(self, 'db'):
+    def close(self):
+        """Return the owned database session's connection to the pool"""
+        if self._owns_db:
             self.db.close()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def generate_digest(self, hours_back: int = 24) -> List[Dict]:
         """
         Generate digest from articles in the last N hours.
@@ -31,33 +52,29 @@ class DigestGenerator:
         Returns:
             List of formatted article dicts ready for email template
         """
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
-        
-        # Fetch articles with summaries from the time period
-        articles_with_summaries = (
-            self.db.query(Article, ArticleSummary, Source)
-            .join(ArticleSummary, Article.id == ArticleSummary.article_id)
-            .join(Source, Article.source_id == Source.id)
-            .filter(Article.published_at >= cutoff_time)
-            .order_by(Article.published_at.desc())
-            .all()
-        )
+        formatted_articles = list(self.iter_digest(hours_back))
         
-        logger.info(f"Found {len(articles_with_summaries)} articles with summaries from last {hours_back} hours")
+        logger.info(f"Found {len(formatted_articles)} articles with summaries from last {hours_back} hours")
+        return formatted_articles
+    
+    def iter_digest(self, hours_back: int = 24) -> Iterator[Dict]:
+        """
+        Stream the digest articles from the last N hours.
         
-        # Format for email template
-        formatted_articles = []
-        for article, summary, source in articles_with_summaries:
-            formatted_articles.append({
-                'title': article.title,
-                'url': article.url,
-                'published_date': article.published_at.strftime('%B %d, %Y') if article.published_at else 'Unknown',
-                'source_name': source.name,
-                'summary': summary.summary,
-                'key_points': summary.key_points if summary.key_points else []
-            })
+        Rows are pulled from a server-side cursor in batches and formatted
+        one at a time, so a single pass (e.g. EmailRenderer.render_digest)
+        never holds the whole result set.
         
-        return formatted_articles
+        Args:
+            hours_back: How many hours back to look for articles
+            
+        Yields:
+            Formatted article dicts ready for email template
+        """
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
+        return self._iter_digest_rows(
+            self._digest_query().where(Article.published_at >= cutoff_time)
+        )
     
     def fetch_recent_articles(self, since_datetime: datetime) -> List[Article]:
         """
@@ -92,34 +109,61 @@ class DigestGenerator:
         """
         cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
         
-        articles_with_summaries = (
-            self.db.query(Article, ArticleSummary, Source)
-            .join(ArticleSummary, Article.id == ArticleSummary.article_id)
-            .join(Source, Article.source_id == Source.id)
-            .filter(
+        return self._fetch_digest_rows(
+            self._digest_query().where(
                 and_(
                     Article.published_at >= cutoff_time,
                     Source.name == source_name
                 )
             )
-            .order_by(Article.published_at.desc())
-            .all()
         )
+    
+    @staticmethod
+    def _digest_query():
+        """
+        Projection of just the columns the email template needs.
         
-        formatted_articles = []
-        for article, summary, source in articles_with_summaries:
-            formatted_articles.append({
-                'title': article.title,
-                'url': article.url,
-                'published_date': article.published_at.strftime('%B %d, %Y') if article.published_at else 'Unknown',
-                'source_name': source.name,
-                'summary': summary.summary,
-                'key_points': summary.key_points if summary.key_points else []
-            })
-        
-        return formatted_articles
+        Selecting scalars instead of (Article, ArticleSummary, Source)
+        entities avoids loading every column and ORM identity-map work.
+        """
+        return (
+            select(
+                Article.id.label('article_id'),
+                ArticleSummary.id.label('summary_id'),
+                Article.title,
+                Article.url,
+                Article.published_at,
+                Source.name.label('source_name'),
+                ArticleSummary.summary,
+                ArticleSummary.key_points,
+            )
+            .join(ArticleSummary, Article.id == ArticleSummary.article_id)
+            .join(Source, Article.source_id == Source.id)
+            .order_by(Article.published_at.desc())
+        )
+    
+    def _fetch_digest_rows(self, stmt) -> List[Dict]:
+        """Collect projected rows as template-ready dicts."""
+        return list(self._iter_digest_rows(stmt))
+    
+    def _iter_digest_rows(self, stmt) -> Iterator[Dict]:
+        """Stream projected rows straight into template-ready dicts."""
+        result = self.db.execute(
+            stmt.execution_options(stream_results=True, yield_per=500)
+        ).mappings()
+        for row in result:
+            yield {
+                'article_id': row['article_id'],
+                'summary_id': row['summary_id'],
+                'title': row['title'],
+                'url': row['url'],
+                'published_date': _fmt_date(row['published_at'].date()) if row['published_at'] else 'Unknown',
+                'source_name': row['source_name'],
+                'summary': row['summary'],
+                'key_points': row['key_points'] if row['key_points'] else []
+            }
 
 
-def get_digest_generator() -> DigestGenerator:
+def get_digest_generator(db: Optional[Session] = None) -> DigestGenerator:
     """Factory function to create DigestGenerator"""
-    return DigestGenerator()
+    return DigestGenerator(db)
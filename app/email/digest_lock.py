@@ -0,0 +1,108 @@
+"""
+Cross-worker lock for digest runs.
+
+When the same digest is started by more than one worker (e.g. cron plus
+several replicas), only the first should do the reads and send the emails.
+digest_lock() hands out a non-blocking lock per key; losers get False and
+should skip the run.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.database import engine as default_engine
+
+try:
+    import fcntl
+except ImportError:
+    # Fallback to no cross-process file lock on platforms without fcntl (Windows)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Session-level lock functions per dialect: (try-acquire, release)
+_SESSION_LOCKS = {
+    "postgresql": ("SELECT pg_try_advisory_lock(:id)", "SELECT pg_advisory_unlock(:id)"),
+    "mysql": ("SELECT GET_LOCK(:name, 0)", "SELECT RELEASE_LOCK(:name)"),
+    "mariadb": ("SELECT GET_LOCK(:name, 0)", "SELECT RELEASE_LOCK(:name)"),
+}
+
+
+def _lock_id(key: str) -> int:
+    """Stable signed 64-bit id for a key (Python's hash() differs per process)."""
+    digest = hashlib.blake2b(f"digest:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _lock_path(key: str) -> str:
+    """File in the temp directory flocked for a key."""
+    return os.path.join(tempfile.gettempdir(), f"digest-{_lock_id(key) & 0xFFFFFFFFFFFFFFFF:x}.lock")
+
+
+@contextmanager
+def digest_lock(key: str, bind: Optional[Engine] = None) -> Iterator[bool]:
+    """
+    Try to take the digest lock for `key` without waiting.
+
+    Dispatches on the database dialect:
+      - PostgreSQL: pg_try_advisory_lock, released with pg_advisory_unlock
+      - MySQL/MariaDB: GET_LOCK with a zero timeout, released with RELEASE_LOCK
+      - anything else (SQLite): an flock on a file in the temp directory,
+        which only coordinates workers on the same host
+
+    The database locks are session-level and held on a dedicated
+    connection in autocommit mode, so a digest run (minutes of LLM calls
+    and SMTP) never keeps a transaction open. If that connection drops,
+    the server releases the lock.
+
+    Args:
+        key: What is being locked, e.g. "send-all:2026-10-15"
+        bind: Engine to lock on (default: the app engine)
+
+    Yields:
+        True if this worker holds the lock, False if another one does
+    """
+    bind = bind if bind is not None else default_engine
+    statements = _SESSION_LOCKS.get(bind.dialect.name)
+    params = {"id": _lock_id(key), "name": f"digest:{key}"[:64]}
+    connection = None
+    lock_file = None
+    acquired = False
+    try:
+        if statements is not None:
+            connection = bind.connect().execution_options(isolation_level="AUTOCOMMIT")
+            acquired = connection.execute(text(statements[0]), params).scalar() == 1
+        elif fcntl is None:
+            logger.warning(f"No cross-process lock available for digest {key}; proceeding unlocked")
+            acquired = True
+        else:
+            lock_file = open(_lock_path(key), "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+            except BlockingIOError:
+                acquired = False
+
+        if not acquired:
+            logger.info(f"Digest {key} is already running in another worker")
+        yield acquired
+    finally:
+        if lock_file is not None:
+            lock_file.close()  # Closing the file releases the flock
+        if connection is not None:
+            try:
+                if acquired:
+                    connection.execute(text(statements[1]), params)
+            except Exception as e:
+                logger.error(f"Error releasing digest lock {key}: {e}")
+                # Discard the connection rather than pool it; ending the
+                # database session frees the lock
+                connection.invalidate()
+            finally:
+                connection.close()
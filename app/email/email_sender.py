@@ -2,14 +2,22 @@
 Email sending functionality using Gmail SMTP.
 """
 import smtplib
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
 from app.config import config
 
+try:
+    import aiosmtplib
+except ImportError:
+    # Fallback to running smtplib in a worker thread if aiosmtplib is not installed
+    aiosmtplib = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,29 +52,13 @@ class EmailSender:
         Returns:
             True if sent successfully, False otherwise
         """
-        if subject is None:
-            subject = f"🤖 AI News Daily Digest - {datetime.utcnow().strftime('%B %d, %Y')}"
-        
         try:
             logger.info(f"Sending digest email to {recipient}")
             
-            # Create message
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.sender_email
-            message['To'] = recipient
-            
-            # Attach both plain text and HTML versions
-            text_part = MIMEText(text_content, 'plain', 'utf-8')
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            
-            message.attach(text_part)
-            message.attach(html_part)
+            message = self._build_message(recipient, html_content, text_content, subject)
             
             # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()  # Upgrade to secure connection
-                server.login(self.sender_email, self.sender_password)
+            with self._connect() as server:
                 server.send_message(message)
             
             logger.info(f"✅ Digest email sent successfully to {recipient}")
@@ -87,6 +79,190 @@ class EmailSender:
             logger.error(f"❌ Error sending email: {e}")
             return False
     
+    def send_digests(
+        self,
+        digests: Iterable[Tuple[str, str, str, Optional[str]]],
+        sessions: int = 1
+    ) -> List[bool]:
+        """
+        Send many digests over as few SMTP sessions as possible.
+        
+        Each session connects, upgrades to TLS and authenticates once, then
+        sends its share of the messages, instead of paying that handshake
+        per recipient as send_digest() does.
+        
+        Args:
+            digests: (recipient, html_content, text_content, subject) tuples
+            sessions: Number of parallel SMTP sessions for large fan-outs
+        
+        Returns:
+            One success flag per digest, in input order
+        """
+        digests = list(digests)
+        sessions = max(1, min(sessions, len(digests)))
+        if sessions == 1:
+            return self._send_batch(digests)
+        
+        # Deal digests round-robin across sessions, then restore input order
+        shares = [digests[i::sessions] for i in range(sessions)]
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            share_results = list(pool.map(self._send_batch, shares))
+        
+        results = [False] * len(digests)
+        for i, share in enumerate(share_results):
+            results[i::sessions] = share
+        return results
+    
+    def _send_batch(self, digests: List[Tuple[str, str, str, Optional[str]]]) -> List[bool]:
+        """Send digests sequentially over one SMTP session, reconnecting if dropped."""
+        results = []
+        server = None
+        try:
+            for digest in digests:
+                recipient = digest[0]
+                message = self._build_message(*digest)
+                try:
+                    if server is None:
+                        server = self._connect()
+                    try:
+                        server.send_message(message)
+                    except smtplib.SMTPServerDisconnected:
+                        # Server dropped the session (e.g. idle timeout); retry once
+                        server = self._connect()
+                        server.send_message(message)
+                    logger.info(f"✅ Digest email sent successfully to {recipient}")
+                    results.append(True)
+                
+                except smtplib.SMTPAuthenticationError as e:
+                    logger.error(f"❌ SMTP Authentication failed: {e}")
+                    logger.error("Please check your EMAIL_SENDER and EMAIL_PASSWORD in .env")
+                    # Every remaining send would fail the same way
+                    results.extend([False] * (len(digests) - len(results)))
+                    break
+                
+                except Exception as e:
+                    logger.error(f"❌ Error sending email to {recipient}: {e}")
+                    results.append(False)
+        finally:
+            if server is not None:
+                try:
+                    server.quit()
+                except smtplib.SMTPException:
+                    pass
+        return results
+    
+    def _connect(self) -> smtplib.SMTP:
+        """
+        Open an authenticated SMTP session.
+        
+        Port 465 uses implicit TLS (SMTP_SSL), which saves the STARTTLS round
+        trip; other ports connect in plain text and upgrade with STARTTLS.
+        """
+        if self.smtp_port == 465:
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
+        else:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+            server.starttls()  # Upgrade to secure connection
+        try:
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    async def send_digest_async(
+        self,
+        recipient: str,
+        html_content: str,
+        text_content: str,
+        subject: Optional[str] = None
+    ) -> bool:
+        """
+        Send daily digest email without blocking the event loop.
+        
+        Uses aiosmtplib when installed; otherwise runs send_digest() in a
+        worker thread.
+        
+        Returns:
+            True if sent successfully, False otherwise
+        """
+        if aiosmtplib is None:
+            return await asyncio.to_thread(
+                self.send_digest, recipient, html_content, text_content, subject
+            )
+        
+        try:
+            logger.info(f"Sending digest email to {recipient}")
+            message = self._build_message(recipient, html_content, text_content, subject)
+            await aiosmtplib.send(
+                message,
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                use_tls=self.smtp_port == 465,
+                start_tls=self.smtp_port != 465,
+                username=self.sender_email,
+                password=self.sender_password,
+            )
+            logger.info(f"✅ Digest email sent successfully to {recipient}")
+            return True
+        
+        except aiosmtplib.SMTPAuthenticationError as e:
+            logger.error(f"❌ SMTP Authentication failed: {e}")
+            logger.error("Please check your EMAIL_SENDER and EMAIL_PASSWORD in .env")
+            return False
+        
+        except aiosmtplib.SMTPException as e:
+            logger.error(f"❌ SMTP error occurred: {e}")
+            return False
+        
+        except Exception as e:
+            logger.error(f"❌ Error sending email: {e}")
+            return False
+    
+    async def send_digests_async(
+        self,
+        digests: Iterable[Tuple[str, str, str, Optional[str]]],
+        concurrency: int = 10
+    ) -> List[bool]:
+        """
+        Send many digests concurrently.
+        
+        Args:
+            digests: (recipient, html_content, text_content, subject) tuples
+            concurrency: Maximum SMTP sends in flight at once
+        
+        Returns:
+            One success flag per digest, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _send(digest):
+            async with semaphore:
+                return await self.send_digest_async(*digest)
+        
+        return await asyncio.gather(*(_send(digest) for digest in digests))
+    
+    def _build_message(
+        self,
+        recipient: str,
+        html_content: str,
+        text_content: str,
+        subject: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Build the multipart (plain text + HTML) digest message."""
+        if subject is None:
+            subject = f"🤖 AI News Daily Digest - {datetime.utcnow().strftime('%B %d, %Y')}"
+        
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.sender_email
+        message['To'] = recipient
+        
+        # Attach both plain text and HTML versions
+        message.attach(MIMEText(text_content, 'plain', 'utf-8'))
+        message.attach(MIMEText(html_content, 'html', 'utf-8'))
+        return message
+    
     def send_test_email(self, recipient: str) -> bool:
         """
         Send a test email to verify configuration.
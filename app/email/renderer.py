@@ -3,64 +3,172 @@ Email template renderer using Jinja2.
 Renders HTML and text versions of email templates with article data.
 """
 import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import escape
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Max rendered article rows kept by EmailRenderer (one HTML + text pair each)
+ROW_CACHE_SIZE = 4096
+
+# Placeholders rendered into the shared digest shell and filled per subscriber
+SUBSCRIBER_NAME_TOKEN = '__SUB_NAME__'
+UNSUBSCRIBE_URL_TOKEN = '__UNSUB_URL__'
+PREFERENCES_URL_TOKEN = '__PREF_URL__'
+ARTICLE_ROWS_TOKEN = '__ARTICLE_ROWS__'
+_TOKEN_RE = re.compile('(' + '|'.join(map(re.escape, (
+    SUBSCRIBER_NAME_TOKEN, UNSUBSCRIBE_URL_TOKEN, PREFERENCES_URL_TOKEN, ARTICLE_ROWS_TOKEN,
+))) + ')')
+
 
 class EmailRenderer:
     """Renders email templates using Jinja2"""
     
     def __init__(self):
-        """Initialize Jinja2 environment"""
+        """Initialize Jinja2 environment and compile the digest templates once"""
         template_dir = Path(__file__).parent / 'templates'
         self.env = Environment(
             loader=FileSystemLoader(str(template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            auto_reload=False,  # Templates ship with the code; skip per-lookup stat()
+            cache_size=-1,  # Never evict compiled templates
+            keep_trailing_newline=True,  # Row fragments are concatenated verbatim
         )
+        self._html_template = self.env.get_template('digest.html')
+        self._text_template = self.env.get_template('digest.txt')
+        self._html_row_template = self.env.get_template('_article_row.html')
+        self._text_row_template = self.env.get_template('_article_row.txt')
+        
+        # (article_id, summary_id) -> (html_row, text_row); only the shell
+        # around the rows differs between subscribers
+        self._row_cache: "OrderedDict[tuple, Tuple[str, str]]" = OrderedDict()
+        self._row_cache_lock = threading.Lock()
+        
+        # (current_date, article_count) -> shell split around the tokens;
+        # one entry is enough since a fan-out renders the same shell for everyone
+        self._shell: Optional[Tuple[tuple, List[str], List[str]]] = None
         logger.info(f"Initialized EmailRenderer with template dir: {template_dir}")
     
     def render_digest(
         self,
-        articles: List[Dict],
+        articles: Iterable[Dict],
         subscriber_name: Optional[str] = None,
         subscriber_email: Optional[str] = None
     ) -> Tuple[str, str]:
         """
         Render daily digest email in both HTML and text formats.
         
+        Article rows are rendered once per (article_id, summary_id) and the
+        surrounding shell once per day and article count; per subscriber only
+        the name and links are spliced in.
+        
         Args:
-            articles: List of article dicts with summary and key_points
+            articles: Article dicts with summary and key_points (and
+                      article_id/summary_id to enable row caching). Any
+                      iterable works, e.g. DigestGenerator.iter_digest(),
+                      and is consumed in a single pass.
             subscriber_name: Name of subscriber for personalization
             subscriber_email: Email for unsubscribe link
             
         Returns:
             Tuple of (html_content, text_content)
         """
-        # Prepare template context
-        context = {
-            'current_date': datetime.now().strftime('%B %d, %Y'),
-            'article_count': len(articles),
-            'articles': articles,
-            'subscriber_name': subscriber_name or 'Reader',
-            'unsubscribe_url': self._get_unsubscribe_url(subscriber_email),
-            'preferences_url': self._get_preferences_url(subscriber_email),
+        html_rows, text_rows, article_count = self._render_rows(articles)
+        html_shell, text_shell = self._render_shell(article_count)
+        
+        values = {
+            SUBSCRIBER_NAME_TOKEN: subscriber_name or 'Reader',
+            UNSUBSCRIBE_URL_TOKEN: self._get_unsubscribe_url(subscriber_email),
+            PREFERENCES_URL_TOKEN: self._get_preferences_url(subscriber_email),
         }
+        text_content = self._fill(text_shell, values, text_rows)
+        # Match the autoescaping the HTML template would have applied
+        values = {token: str(escape(value)) for token, value in values.items()}
+        html_content = self._fill(html_shell, values, html_rows)
         
-        # Render HTML version
-        html_template = self.env.get_template('digest.html')
-        html_content = html_template.render(**context)
+        logger.info(f"Rendered digest with {article_count} articles")
+        return html_content, text_content
+    
+    def _render_shell(self, article_count: int) -> Tuple[List[str], List[str]]:
+        """Render (or reuse) the HTML and text shells, split around the tokens."""
+        key = (datetime.now().strftime('%B %d, %Y'), article_count)
+        shell = self._shell
+        if shell is None or shell[0] != key:
+            context = {
+                'current_date': key[0],
+                'article_count': article_count,
+                'article_rows': ARTICLE_ROWS_TOKEN,
+                'subscriber_name': SUBSCRIBER_NAME_TOKEN,
+                'unsubscribe_url': UNSUBSCRIBE_URL_TOKEN,
+                'preferences_url': PREFERENCES_URL_TOKEN,
+            }
+            shell = (
+                key,
+                _TOKEN_RE.split(self._render_whole(self._html_template, context)),
+                _TOKEN_RE.split(self._render_whole(self._text_template, context)),
+            )
+            self._shell = shell
+        return shell[1], shell[2]
+    
+    @staticmethod
+    def _render_whole(template, context: Dict) -> str:
+        """
+        Render a complete document, dropping the file's final newline.
         
-        # Render text version
-        text_template = self.env.get_template('digest.txt')
-        text_content = text_template.render(**context)
+        keep_trailing_newline is on for the row fragments; whole documents
+        end the way Jinja's default would render them.
+        """
+        content = template.render(**context)
+        return content[:-1] if content.endswith('\n') else content
+    
+    @staticmethod
+    def _fill(parts: List[str], values: Dict[str, str], rows: str) -> str:
+        """Join a split shell, substituting each token (odd indices) with its value."""
+        filled = list(parts)
+        filled[1::2] = [rows if token == ARTICLE_ROWS_TOKEN else values[token] for token in parts[1::2]]
+        return ''.join(filled)
+    
+    def _render_rows(self, articles: Iterable[Dict]) -> Tuple[str, str, int]:
+        """Render (or fetch from cache) the HTML and text rows, plus the row count."""
+        html_rows = []
+        text_rows = []
+        for article in articles:
+            key = (article.get('article_id'), article.get('summary_id'))
+            cacheable = key[0] is not None
+            rows = None
+            if cacheable:
+                with self._row_cache_lock:
+                    rows = self._row_cache.get(key)
+                    if rows is not None:
+                        self._row_cache.move_to_end(key)
+            
+            if rows is None:
+                rows = (
+                    self._html_row_template.render(article=article),
+                    self._text_row_template.render(article=article),
+                )
+                if cacheable:
+                    with self._row_cache_lock:
+                        self._row_cache[key] = rows
+                        if len(self._row_cache) > ROW_CACHE_SIZE:
+                            self._row_cache.popitem(last=False)
+            
+            html_rows.append(rows[0])
+            text_rows.append(rows[1])
         
-        logger.info(f"Rendered digest with {len(articles)} articles")
-        return html_content, text_content
+        return ''.join(html_rows), ''.join(text_rows), len(html_rows)
+    
+    def clear_row_cache(self) -> None:
+        """Drop cached article rows (e.g. after articles were edited in place)."""
+        with self._row_cache_lock:
+            self._row_cache.clear()
     
     def render_template(
         self,
@@ -77,8 +185,7 @@ class EmailRenderer:
         Returns:
             Rendered template string
         """
-        template = self.env.get_template(template_name)
-        return template.render(**context)
+        return self._render_whole(self.env.get_template(template_name), context)
     
     def _get_unsubscribe_url(self, email: Optional[str]) -> str:
         """Generate unsubscribe URL (placeholder for now)"""
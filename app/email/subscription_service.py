@@ -2,40 +2,93 @@
 Subscription management service for email subscriptions.
 """
 from typing import List, Optional
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, select, update, bindparam, lambda_stmt
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import SessionLocal, EmailSubscription, EmailFrequency
+from app.database.repository import insert_row
 import logging
 import re
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; validate_email() anchors with fullmatch() instead of ^...$
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Seconds get_active_subscribers() serves its cached list (per process)
+ACTIVE_SUBSCRIBERS_TTL = 60.0
+
+# (fetched_at, subscribers); cleared by every subscription mutation
+_active_subscribers_cache: tuple = (0.0, None)
+_active_subscribers_lock = threading.Lock()
+
+
+def clear_active_subscribers_cache() -> None:
+    """Drop the cached active-subscriber list so the next read hits the database."""
+    global _active_subscribers_cache
+    with _active_subscribers_lock:
+        _active_subscribers_cache = (0.0, None)
+
+
+# Built once; SQLAlchemy caches the compiled lambda statement across calls
+_subscriber_by_email = lambda_stmt(
+    lambda: select(EmailSubscription).where(EmailSubscription.email == bindparam("email"))
+)
+
 
 class SubscriptionService:
     """Manages email subscriptions"""
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db: Optional[Session] = None):
+        """
+        Args:
+            db: Session to use. If omitted, a session is opened from the
+                shared pool and released by close() (or on leaving a
+                ``with`` block).
+        """
+        self._owns_db = db is None
+        self.db = db if db is not None else SessionLocal()
     
-    def __del__(self):
-        """Close database session"""
-        if hasattr(self, 'db'):
+    def close(self):
+        """Return the owned database session's connection to the pool"""
+        if self._owns_db:
             self.db.close()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def get_active_subscribers(self) -> List[EmailSubscription]:
         """
         Get all active email subscriptions.
         
+        The list is cached for ACTIVE_SUBSCRIBERS_TTL seconds and shared
+        across service instances; subscription changes made through this
+        module clear it. The returned records are detached from any session.
+        
         Returns:
             List of active EmailSubscription records
         """
-        subscribers = (
-            self.db.query(EmailSubscription)
-            .filter(EmailSubscription.is_active == True)
-            .all()
-        )
+        global _active_subscribers_cache
+        with _active_subscribers_lock:
+            fetched_at, subscribers = _active_subscribers_cache
+            now = time.monotonic()
+            if subscribers is None or now - fetched_at >= ACTIVE_SUBSCRIBERS_TTL:
+                subscribers = (
+                    self.db.query(EmailSubscription)
+                    .filter(EmailSubscription.is_active == True)
+                    .all()
+                )
+                for subscriber in subscribers:
+                    self.db.expunge(subscriber)
+                _active_subscribers_cache = (now, subscribers)
+                logger.info(f"Found {len(subscribers)} active subscribers")
         
-        logger.info(f"Found {len(subscribers)} active subscribers")
-        return subscribers
+        return list(subscribers)
     
     def get_subscriber_by_email(self, email: str) -> Optional[EmailSubscription]:
         """
@@ -47,11 +100,7 @@ class SubscriptionService:
         Returns:
             EmailSubscription or None if not found
         """
-        return (
-            self.db.query(EmailSubscription)
-            .filter(EmailSubscription.email == email)
-            .first()
-        )
+        return self.db.execute(_subscriber_by_email, {"email": email}).scalar_one_or_none()
     
     def create_subscription(
         self,
@@ -83,15 +132,14 @@ class SubscriptionService:
         
         # Create new subscription
         try:
-            subscription = EmailSubscription(
-                email=email,
-                name=name,
-                frequency=frequency,
-                is_active=True
-            )
-            self.db.add(subscription)
+            subscription = insert_row(self.db, EmailSubscription, {
+                "email": email,
+                "name": name,
+                "frequency": frequency,
+                "is_active": True,
+            }, returning=("id", "created_at", "updated_at"))
             self.db.commit()
-            self.db.refresh(subscription)
+            clear_active_subscribers_cache()
             
             logger.info(f"✅ Created subscription for {email}")
             return subscription
@@ -116,22 +164,7 @@ class SubscriptionService:
         Returns:
             True if updated successfully
         """
-        try:
-            subscription = self.db.query(EmailSubscription).get(subscriber_id)
-            if not subscription:
-                logger.error(f"Subscription {subscriber_id} not found")
-                return False
-            
-            subscription.frequency = frequency
-            self.db.commit()
-            
-            logger.info(f"Updated frequency for subscription {subscriber_id} to {frequency.value}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to update frequency: {e}")
-            self.db.rollback()
-            return False
+        return self._update(subscriber_id, "update frequency", frequency=frequency)
     
     def unsubscribe(self, subscriber_id: int) -> bool:
         """
@@ -143,22 +176,7 @@ class SubscriptionService:
         Returns:
             True if unsubscribed successfully
         """
-        try:
-            subscription = self.db.query(EmailSubscription).get(subscriber_id)
-            if not subscription:
-                logger.error(f"Subscription {subscriber_id} not found")
-                return False
-            
-            subscription.is_active = False
-            self.db.commit()
-            
-            logger.info(f"Unsubscribed: {subscription.email}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to unsubscribe: {e}")
-            self.db.rollback()
-            return False
+        return self._update(subscriber_id, "unsubscribe", is_active=False)
     
     def reactivate(self, subscriber_id: int) -> bool:
         """
@@ -170,20 +188,28 @@ class SubscriptionService:
         Returns:
             True if reactivated successfully
         """
+        return self._update(subscriber_id, "reactivate", is_active=True)
+    
+    def _update(self, subscriber_id: int, action: str, **values) -> bool:
+        """Apply a single-row UPDATE, returning False if the row does not exist."""
         try:
-            subscription = self.db.query(EmailSubscription).get(subscriber_id)
-            if not subscription:
+            result = self.db.execute(
+                update(EmailSubscription)
+                .where(EmailSubscription.id == subscriber_id)
+                .values(**values)
+            )
+            if result.rowcount == 0:
                 logger.error(f"Subscription {subscriber_id} not found")
+                self.db.rollback()
                 return False
             
-            subscription.is_active = True
             self.db.commit()
-            
-            logger.info(f"Reactivated subscription: {subscription.email}")
+            clear_active_subscribers_cache()
+            logger.info(f"Subscription {subscriber_id}: {action} succeeded")
             return True
-            
+        
         except Exception as e:
-            logger.error(f"Failed to reactivate: {e}")
+            logger.error(f"Failed to {action}: {e}")
             self.db.rollback()
             return False
     
@@ -198,10 +224,105 @@ class SubscriptionService:
         Returns:
             True if valid email format
         """
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.fullmatch(email) is not None
+
+
+class AsyncSubscriptionService:
+    """
+    asyncio counterpart of SubscriptionService.
+    
+    Queries run on the async engine (see app.database.get_async_db_session),
+    so awaiting subscribers does not pin a worker thread.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_active_subscribers(self) -> List[EmailSubscription]:
+        """Get all active email subscriptions."""
+        result = await self.db.execute(
+            select(EmailSubscription).where(EmailSubscription.is_active == True)
+        )
+        subscribers = result.scalars().all()
+        
+        logger.info(f"Found {len(subscribers)} active subscribers")
+        return subscribers
+    
+    async def get_subscriber_by_email(self, email: str) -> Optional[EmailSubscription]:
+        """Get subscriber by email address."""
+        result = await self.db.execute(_subscriber_by_email, {"email": email})
+        return result.scalar_one_or_none()
+    
+    async def create_subscription(
+        self,
+        email: str,
+        name: Optional[str] = None,
+        frequency: EmailFrequency = EmailFrequency.DAILY
+    ) -> Optional[EmailSubscription]:
+        """Create a new email subscription (returns the existing one if present)."""
+        if not SubscriptionService.validate_email(email):
+            logger.error(f"Invalid email address: {email}")
+            return None
+        
+        existing = await self.get_subscriber_by_email(email)
+        if existing:
+            logger.warning(f"Subscription already exists for {email}")
+            return existing
+        
+        values = {"email": email, "name": name, "frequency": frequency, "is_active": True}
+        table = EmailSubscription.__table__
+        try:
+            result = await self.db.execute(
+                insert(table).values(values).returning(table.c.id, table.c.created_at, table.c.updated_at)
+            )
+            generated = result.one()._asdict()
+            await self.db.commit()
+            clear_active_subscribers_cache()
+            
+            logger.info(f"✅ Created subscription for {email}")
+            return EmailSubscription(**values, **generated)
+        
+        except Exception as e:
+            logger.error(f"Failed to create subscription: {e}")
+            await self.db.rollback()
+            return None
+    
+    async def update_frequency(self, subscriber_id: int, frequency: EmailFrequency) -> bool:
+        """Update subscription frequency."""
+        return await self._update(subscriber_id, "update frequency", frequency=frequency)
+    
+    async def unsubscribe(self, subscriber_id: int) -> bool:
+        """Mark subscription as inactive (unsubscribe)."""
+        return await self._update(subscriber_id, "unsubscribe", is_active=False)
+    
+    async def reactivate(self, subscriber_id: int) -> bool:
+        """Reactivate an inactive subscription."""
+        return await self._update(subscriber_id, "reactivate", is_active=True)
+    
+    async def _update(self, subscriber_id: int, action: str, **values) -> bool:
+        """Apply a single-row UPDATE, returning False if the row does not exist."""
+        try:
+            result = await self.db.execute(
+                update(EmailSubscription)
+                .where(EmailSubscription.id == subscriber_id)
+                .values(**values)
+            )
+            if result.rowcount == 0:
+                logger.error(f"Subscription {subscriber_id} not found")
+                await self.db.rollback()
+                return False
+            
+            await self.db.commit()
+            clear_active_subscribers_cache()
+            logger.info(f"Subscription {subscriber_id}: {action} succeeded")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to {action}: {e}")
+            await self.db.rollback()
+            return False
 
 
-def get_subscription_service() -> SubscriptionService:
+def get_subscription_service(db: Optional[Session] = None) -> SubscriptionService:
     """Factory function to create SubscriptionService"""
-    return SubscriptionService()
+    return SubscriptionService(db)
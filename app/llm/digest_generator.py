@@ -1,43 +1,215 @@
 """
 LLM-powered digest generation using Google Gemini API.
 """
+import asyncio
+import hashlib
+import itertools
+import json
 import logging
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from string import Template
 from typing import List, Dict, Optional
 import google.generativeai as genai
+from jinja2 import Environment
+from markupsafe import escape
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import load_only
 
 from app.database import get_db_session, Article, Source
 from app.config import config
+from app.cache import get_redis_client
 from agent.prompts import (
     load_system_prompt,
     load_agent_config,
     get_article_summary_prompt,
+    get_batch_summary_prompt,
 )
 
 logger = logging.getLogger(__name__)
 
+# Per-request override for batched summaries: ask Gemini for bare JSON
+BATCH_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Rows per fetch when streaming the digest window from the database
+FETCH_BATCH_SIZE = 200
+
+# Generated summaries are cached in Redis for a week; scraped content does not
+# change, so a summary stays valid until the model or system prompt does
+SUMMARY_CACHE_PREFIX = "sum:"
+SUMMARY_CACHE_TTL = 7 * 86400
+
+# Static markup for DigestGenerator._format_digest_html, parsed once at import
+HEADER_TMPL = Template("""
+        <h1 style="color: #2c3e50; font-family: Arial, sans-serif;">🤖 AI News Daily Digest</h1>
+        <p style="color: #7f8c8d; font-family: Arial, sans-serif;">
+            $date
+        </p>
+        <hr style="border: 1px solid #ecf0f1;">
+        """)
+SECTION_OPEN_TMPL = Template("""
+            <h2 style="color: #3498db; font-family: Arial, sans-serif; margin-top: 30px;">
+                📰 $source_name
+            </h2>
+            """)
+ARTICLE_TMPL = Template("""
+                <div style="margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-left: 4px solid #3498db;">
+                    <h3 style="margin: 0 0 10px 0; font-family: Arial, sans-serif;">
+                        <a href="$url" style="color: #2c3e50; text-decoration: none;">
+                            $title
+                        </a>
+                    </h3>
+                    $published_date
+                    <p style="color: #34495e; font-family: Arial, sans-serif; line-height: 1.6; margin: 10px 0;">
+                        $summary
+                    </p>
+                    <a href="$url" style="color: #3498db; text-decoration: none; font-weight: bold;">
+                        Read more →
+                    </a>
+                </div>
+                """)
+PUBLISHED_DATE_TMPL = Template("<small style='color: #95a5a6;'>$date</small>")
+FOOTER_HTML = """
+        <hr style="border: 1px solid #ecf0f1; margin-top: 40px;">
+        <p style="color: #95a5a6; font-size: 12px; font-family: Arial, sans-serif; text-align: center;">
+            This digest was automatically generated by AI News Aggregator
+        </p>
+        """
+
+# Plain-text digest for DigestGenerator._format_digest_text, compiled once at
+# import. Not autoescaped: the output is text/plain.
+TEXT_DIGEST_TMPL = Environment(trim_blocks=True, lstrip_blocks=True, autoescape=False).from_string(
+    """{{ rule }}
+AI NEWS DAILY DIGEST
+{{ date }}
+{{ rule }}
+
+{% for section in sections %}
+
+📰 {{ section.source_name | upper }}
+{{ '-' * 60 }}
+{% for article in section.articles %}
+
+• {{ article.title }}
+{% if article.published_date %}
+  {{ article.published_date }}
+{% endif %}
+
+  {{ article.summary }}
+  Read more: {{ article.url }}
+
+{% endfor %}
+{% endfor %}
+
+{{ rule }}
+Generated by AI News Aggregator
+{{ rule }}"""
+)
+
+# Process-wide Gemini model and the event loop digests run on. The model's
+# async (grpc.aio) client is bound to the loop it was first used on, so the
+# sync generate_digest() reuses one loop instead of a fresh asyncio.run()
+_model: Optional[genai.GenerativeModel] = None
+_model_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_model() -> genai.GenerativeModel:
+    """Configure Gemini and build the shared GenerativeModel on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                genai.configure(api_key=config.GEMINI_API_KEY)
+                model_config = load_agent_config().get('model', {})
+                _model = genai.GenerativeModel(
+                    model_name=config.GEMINI_MODEL,
+                    generation_config={
+                        'temperature': model_config.get('temperature', 0.3),
+                        'max_output_tokens': model_config.get('max_tokens_total', 2000),
+                    }
+                )
+    return _model
+
+
+def _run_on_digest_loop(coro):
+    """Run a coroutine to completion on the shared digest event loop (one run at a time)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+        return _loop.run_until_complete(coro)
+
+
+@lru_cache(maxsize=4096)
+def _fmt_published(day: date) -> str:
+    """Format a publish date for the digest; most articles share one or two days."""
+    return day.strftime('%b %d, %Y')
+
+
+def parse_batch_summaries(response_text: str, count: int) -> List[Optional[str]]:
+    """
+    Parse a batched-summary response into one summary per article.
+    
+    Accepts a bare JSON array or one wrapped in a markdown code fence.
+    
+    Args:
+        response_text: Model output, a JSON array of {"id", "summary"} objects
+        count: Number of articles in the request (ids run from 1 to count)
+    
+    Returns:
+        Summaries in article order; None where the model skipped an article
+    
+    Raises:
+        ValueError: If the response is not a JSON array
+    """
+    text = response_text.strip()
+    if text.startswith("```"):
+        text = text[text.find("\n") + 1:text.rfind("```")]
+    items = json.loads(text)
+    if not isinstance(items, list):
+        raise ValueError(f"Expected a JSON array, got {type(items).__name__}")
+    
+    summaries: List[Optional[str]] = [None] * count
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        summary = item.get("summary")
+        if 0 <= index < count and isinstance(summary, str) and summary.strip():
+            summaries[index] = summary.strip()
+    return summaries
+
 
 class DigestGenerator:
     """Generates daily digests using Google Gemini API"""
     
     def __init__(self):
         """Initialize the digest generator with Gemini API"""
-        # Configure Gemini API
-        genai.configure(api_key=config.GEMINI_API_KEY)
-        
-        # Load agent configuration
+        # Load agent configuration (memoized per process)
         self.agent_config = load_agent_config()
         self.system_prompt = load_system_prompt()
+        self.system_prompt_hash = hashlib.sha256(self.system_prompt.encode()).hexdigest()
         
-        # Initialize model
-        model_config = self.agent_config.get('model', {})
-        self.model = genai.GenerativeModel(
-            model_name=config.GEMINI_MODEL,
-            generation_config={
-                'temperature': model_config.get('temperature', 0.3),
-                'max_output_tokens': model_config.get('max_tokens_total', 2000),
-            }
-        )
+        # Summary cache; digests are still generated (uncached) if Redis is down
+        try:
+            self.cache = get_redis_client()
+        except Exception as e:
+            logger.warning(f"Summary cache disabled, Redis unavailable: {e}")
+            self.cache = None
+        
+        # Shared model, configured once per process
+        self.model = _get_model()
+        
+        # Bounds concurrent Gemini requests; created per run so it binds to that run's event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
         
         logger.info(f"Initialized DigestGenerator with model: {config.GEMINI_MODEL}")
     
@@ -45,6 +217,24 @@ class DigestGenerator:
         """
         Generate a daily digest from recent articles.
         
+        Synchronous wrapper around generate_digest_async() for callers that
+        are not running an event loop. Runs on the shared digest event loop.
+        
+        Args:
+            hours_back: Number of hours to look back for articles (default from config)
+        
+        Returns:
+            Dictionary with digest content and metadata
+        """
+        return _run_on_digest_loop(self.generate_digest_async(hours_back))
+    
+    async def generate_digest_async(self, hours_back: Optional[int] = None) -> Dict[str, any]:
+        """
+        Generate a daily digest from recent articles.
+        
+        Summaries for all sources are requested concurrently, with at most
+        GEMINI_MAX_CONCURRENCY Gemini calls in flight at once.
+        
         Args:
             hours_back: Number of hours to look back for articles (default from config)
         
@@ -56,8 +246,12 @@ class DigestGenerator:
         
         logger.info(f"Generating digest for articles from last {hours_back} hours")
         
-        # Fetch recent articles
-        articles_by_source = self._fetch_recent_articles(hours_back)
+        # One timestamp for the whole digest (headers and generated_at)
+        now = datetime.now(timezone.utc)
+        
+        # Fetch recent articles, at most max_articles per source
+        max_articles = self.agent_config.get('formatting', {}).get('max_articles_per_source', 5)
+        articles_by_source = await asyncio.to_thread(self._fetch_recent_articles, hours_back, max_articles)
         
         if not articles_by_source:
             logger.warning("No articles found for digest generation")
@@ -68,24 +262,35 @@ class DigestGenerator:
                 "text_content": "",
             }
         
+        self._semaphore = asyncio.Semaphore(config.GEMINI_MAX_CONCURRENCY)
+        selected_by_source = {
+            source_name: articles[:max_articles]
+            for source_name, articles in articles_by_source.items()
+        }
+        
+        # One Gemini call per source instead of one per article, all sources in parallel
+        all_summaries = await asyncio.gather(*(
+            self._generate_article_summaries_batch(selected)
+            for selected in selected_by_source.values()
+        ))
+        
         # Generate summaries for each article
         digest_sections = []
         total_articles = 0
         
-        for source_name, articles in articles_by_source.items():
-            logger.info(f"Processing {len(articles)} articles from {source_name}")
+        for (source_name, selected), summaries in zip(selected_by_source.items(), all_summaries):
+            logger.info(f"Processing {len(selected)} articles from {source_name}")
             
             article_summaries = []
-            max_articles = self.agent_config.get('formatting', {}).get('max_articles_per_source', 5)
-            
-            for article in articles[:max_articles]:
-                summary = self._generate_article_summary(article)
+            for article, summary in zip(selected, summaries):
                 if summary:
                     article_summaries.append({
                         'title': article.title,
                         'url': article.url,
                         'summary': summary,
                         'published_at': article.published_at,
+                        # Formatted once here for both the HTML and text digests
+                        'published_date': _fmt_published(article.published_at.date()) if article.published_at else "",
                     })
                     total_articles += 1
             
@@ -96,8 +301,9 @@ class DigestGenerator:
                 })
         
         # Format digest
-        html_content = self._format_digest_html(digest_sections)
-        text_content = self._format_digest_text(digest_sections)
+        date_str = now.strftime('%B %d, %Y')
+        html_content = self._format_digest_html(digest_sections, date_str)
+        text_content = self._format_digest_text(digest_sections, date_str)
         
         logger.info(f"Digest generated successfully with {total_articles} articles from {len(digest_sections)} sources")
         
@@ -107,38 +313,93 @@ class DigestGenerator:
             "total_sources": len(digest_sections),
             "html_content": html_content,
             "text_content": text_content,
-            "generated_at": datetime.utcnow(),
+            "generated_at": now,
         }
     
-    def _fetch_recent_articles(self, hours_back: int) -> Dict[str, List[Article]]:
+    def _fetch_recent_articles(
+        self, hours_back: int, limit_per_source: Optional[int] = None
+    ) -> Dict[str, List[Article]]:
         """
         Fetch recent articles grouped by source.
         
+        The per-source limit is applied in SQL with ROW_NUMBER() so rows the
+        digest would discard are never transferred. Rows come back ordered by
+        source name, so grouping is one linear pass over the stream. They are
+        streamed in FETCH_BATCH_SIZE batches through a server-side cursor, and
+        only the columns the digest reads are loaded (not content/full_content),
+        so other Article attributes are unavailable on the returned, detached
+        objects.
+        
         Args:
             hours_back: Number of hours to look back
+            limit_per_source: Newest articles to keep per source (default: all)
         
         Returns:
-            Dictionary mapping source names to lists of articles
+            Dictionary mapping source names (alphabetically) to lists of
+            articles, newest first
         """
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
-        articles_by_source = {}
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
         
         with get_db_session() as session:
-            # Query articles scraped within the time window
-            articles = session.query(Article).join(Source).filter(
-                Article.scraped_at >= cutoff_time
-            ).order_by(Article.published_at.desc()).all()
+            # Empty windows are common for scheduled runs; answer those with
+            # an indexed EXISTS probe instead of the full join
+            if not session.scalar(select(exists().where(Article.scraped_at >= cutoff_time))):
+                return {}
+            
+            # Query articles scraped within the time window, with the source
+            # name selected from the join rather than lazy-loaded per article
+            stmt = (
+                select(Source.name, Article)
+                .join(Article.source)
+                .options(load_only(
+                    Article.id, Article.title, Article.url, Article.published_at,
+                    Article.source_id, Article.content_preview, Article.summary,
+                ))
+                .where(Article.scraped_at >= cutoff_time)
+                .order_by(Source.name, Article.published_at.desc())
+                .execution_options(stream_results=True, yield_per=FETCH_BATCH_SIZE)
+            )
             
-            # Group by source
-            for article in articles:
-                source_name = article.source.name
-                if source_name not in articles_by_source:
-                    articles_by_source[source_name] = []
-                articles_by_source[source_name].append(article)
-        
-        return articles_by_source
+            # SQLite only has window functions from 3.25; older builds get
+            # every row and rely on the caller's slice
+            dialect = session.get_bind().dialect.name
+            if limit_per_source is not None and (dialect != "sqlite" or sqlite3.sqlite_version_info >= (3, 25)):
+                ranked = (
+                    select(
+                        Article.id,
+                        func.row_number().over(
+                            partition_by=Article.source_id,
+                            order_by=Article.published_at.desc(),
+                        ).label("rn"),
+                    )
+                    .where(Article.scraped_at >= cutoff_time)
+                    .subquery()
+                )
+                stmt = stmt.join(ranked, ranked.c.id == Article.id).where(ranked.c.rn <= limit_per_source)
+            
+            # Rows arrive grouped by source
+            return {
+                source_name: [article for _, article in rows]
+                for source_name, rows in itertools.groupby(session.execute(stmt), key=lambda row: row[0])
+            }
     
-    def _generate_article_summary(self, article: Article) -> Optional[str]:
+    async def _generate_content(self, prompt: str, **kwargs):
+        """
+        Call Gemini asynchronously, waiting for a free concurrency slot.
+        
+        Args:
+            prompt: Full prompt text
+            **kwargs: Passed through to generate_content_async()
+        
+        Returns:
+            Gemini response
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(config.GEMINI_MAX_CONCURRENCY)
+        async with self._semaphore:
+            return await self.model.generate_content_async(prompt, **kwargs)
+    
+    async def _generate_article_summary(self, article: Article) -> Optional[str]:
         """
         Generate a summary for a single article using Gemini.
         
@@ -149,8 +410,8 @@ class DigestGenerator:
             Summary text or None if generation fails
         """
         try:
-            # Prepare content (limit length)
-            content = article.content[:2000] if article.content else article.title
+            # Prepare content (already truncated on write)
+            content = article.content_preview or article.title
             
             # Create prompt
             prompt = f"""{self.system_prompt}
@@ -163,7 +424,7 @@ Content: {content}
 Summary:"""
             
             # Generate summary
-            response = self.model.generate_content(prompt)
+            response = await self._generate_content(prompt)
             summary = response.text.strip()
             
             logger.debug(f"Generated summary for: {article.title}")
@@ -173,101 +434,128 @@ Summary:"""
             logger.error(f"Error generating summary for article {article.id}: {e}")
             return None
     
-    def _format_digest_html(self, digest_sections: List[Dict]) -> str:
+    def _summary_cache_key(self, article: Article) -> str:
+        """
+        Redis key for an article's summary.
+        
+        Covers everything the summary depends on: the model, the system
+        prompt, and the article (its id plus the length of the content sent).
+        """
+        content = article.content_preview or article.title
+        fingerprint = f"{config.GEMINI_MODEL}|{self.system_prompt_hash}|{article.id}|{len(content)}"
+        return SUMMARY_CACHE_PREFIX + hashlib.sha256(fingerprint.encode()).hexdigest()
+    
+    def _get_cached_summaries(self, keys: List[str]) -> List[Optional[str]]:
+        """Look up cached summaries in one MGET; None for misses or if Redis is unavailable."""
+        if self.cache is None:
+            return [None] * len(keys)
+        return [value if isinstance(value, str) else None for value in self.cache.get_many(keys)]
+    
+    async def _generate_article_summaries_batch(self, articles: List[Article]) -> List[Optional[str]]:
+        """
+        Generate summaries for several articles with a single Gemini call.
+        
+        Summaries already stored on the article by the pipeline worker, or
+        cached by an earlier run, are reused. For the rest, the
+        system prompt is sent once, followed by the numbered articles, and the
+        model answers with a JSON array. Articles the batch did not cover (or
+        all of them, if the call or parsing fails) fall back to concurrent
+        _generate_article_summary() calls. New summaries are then cached.
+        
+        Args:
+            articles: Article objects
+        
+        Returns:
+            Summary text (or None) per article, in input order
+        """
+        if not articles:
+            return []
+        
+        summaries: List[Optional[str]] = [article.summary for article in articles]
+        pending = [i for i, summary in enumerate(summaries) if not summary]
+        if not pending:
+            return summaries
+        
+        keys = {i: self._summary_cache_key(articles[i]) for i in pending}
+        for i, summary in zip(pending, self._get_cached_summaries(list(keys.values()))):
+            summaries[i] = summary
+        pending = [i for i in pending if not summaries[i]]
+        if not pending:
+            return summaries
+        
+        try:
+            prompt = f"{self.system_prompt}\n\n" + get_batch_summary_prompt(
+                [(articles[i].title, articles[i].content_preview or articles[i].title) for i in pending]
+            )
+            response = await self._generate_content(prompt, generation_config=BATCH_GENERATION_CONFIG)
+            for i, summary in zip(pending, parse_batch_summaries(response.text, len(pending))):
+                summaries[i] = summary
+            logger.debug(f"Generated {sum(1 for i in pending if summaries[i])} summaries in one batch")
+        except Exception as e:
+            logger.warning(f"Batched summary of {len(pending)} articles failed, falling back to per-article calls: {e}")
+        
+        missing = [i for i in pending if not summaries[i]]
+        fallbacks = await asyncio.gather(
+            *(self._generate_article_summary(articles[i]) for i in missing),
+            return_exceptions=True,
+        )
+        for i, summary in zip(missing, fallbacks):
+            summaries[i] = None if isinstance(summary, BaseException) else summary
+        
+        if self.cache is not None:
+            self.cache.set_many(
+                {keys[i]: summaries[i] for i in pending if summaries[i]}, ttl=SUMMARY_CACHE_TTL
+            )
+        return summaries
+    
+    def _format_digest_html(self, digest_sections: List[Dict], date_str: str) -> str:
         """
         Format digest as HTML for email.
         
+        Source names, titles, URLs and summaries are HTML-escaped; scraped
+        titles and model output routinely contain "&" and "<".
+        
         Args:
             digest_sections: List of digest sections with source and articles
+            date_str: Formatted generation date shown in the header
         
         Returns:
             HTML formatted digest
         """
-        html_parts = []
-        
-        # Header
-        html_parts.append(f"""
-        <h1 style="color: #2c3e50; font-family: Arial, sans-serif;">🤖 AI News Daily Digest</h1>
-        <p style="color: #7f8c8d; font-family: Arial, sans-serif;">
-            {datetime.utcnow().strftime('%B %d, %Y')}
-        </p>
-        <hr style="border: 1px solid #ecf0f1;">
-        """)
+        html_parts = [HEADER_TMPL.substitute(date=date_str)]
         
         # Sections by source
         for section in digest_sections:
-            html_parts.append(f"""
-            <h2 style="color: #3498db; font-family: Arial, sans-serif; margin-top: 30px;">
-                📰 {section['source_name']}
-            </h2>
-            """)
-            
-            for article in section['articles']:
-                published_date = ""
-                if article.get('published_at'):
-                    published_date = f"<small style='color: #95a5a6;'>{article['published_at'].strftime('%b %d, %Y')}</small>"
-                
-                html_parts.append(f"""
-                <div style="margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-left: 4px solid #3498db;">
-                    <h3 style="margin: 0 0 10px 0; font-family: Arial, sans-serif;">
-                        <a href="{article['url']}" style="color: #2c3e50; text-decoration: none;">
-                            {article['title']}
-                        </a>
-                    </h3>
-                    {published_date}
-                    <p style="color: #34495e; font-family: Arial, sans-serif; line-height: 1.6; margin: 10px 0;">
-                        {article['summary']}
-                    </p>
-                    <a href="{article['url']}" style="color: #3498db; text-decoration: none; font-weight: bold;">
-                        Read more →
-                    </a>
-                </div>
-                """)
-        
-        # Footer
-        html_parts.append("""
-        <hr style="border: 1px solid #ecf0f1; margin-top: 40px;">
-        <p style="color: #95a5a6; font-size: 12px; font-family: Arial, sans-serif; text-align: center;">
-            This digest was automatically generated by AI News Aggregator
-        </p>
-        """)
+            html_parts.append(SECTION_OPEN_TMPL.substitute(source_name=escape(section['source_name'])))
+            html_parts.extend(
+                ARTICLE_TMPL.substitute(
+                    url=escape(article['url']),
+                    title=escape(article['title']),
+                    summary=escape(article['summary']),
+                    published_date=PUBLISHED_DATE_TMPL.substitute(
+                        date=article['published_date']
+                    ) if article.get('published_date') else "",
+                )
+                for article in section['articles']
+            )
+        
+        html_parts.append(FOOTER_HTML)
         
         return "".join(html_parts)
     
-    def _format_digest_text(self, digest_sections: List[Dict]) -> str:
+    def _format_digest_text(self, digest_sections: List[Dict], date_str: str) -> str:
         """
         Format digest as plain text.
         
         Args:
             digest_sections: List of digest sections
+            date_str: Formatted generation date shown in the header
         
         Returns:
             Plain text formatted digest
         """
-        text_parts = []
-        
-        # Header
-        text_parts.append("=" * 60)
-        text_parts.append("AI NEWS DAILY DIGEST")
-        text_parts.append(datetime.utcnow().strftime('%B %d, %Y'))
-        text_parts.append("=" * 60)
-        text_parts.append("")
-        
-        # Sections
-        for section in digest_sections:
-            text_parts.append(f"\n📰 {section['source_name'].upper()}")
-            text_parts.append("-" * 60)
-            
-            for article in section['articles']:
-                text_parts.append(f"\n• {article['title']}")
-                if article.get('published_at'):
-                    text_parts.append(f"  {article['published_at'].strftime('%b %d, %Y')}")
-                text_parts.append(f"\n  {article['summary']}")
-                text_parts.append(f"  Read more: {article['url']}\n")
-        
-        # Footer
-        text_parts.append("\n" + "=" * 60)
-        text_parts.append("Generated by AI News Aggregator")
-        text_parts.append("=" * 60)
-        
-        return "\n".join(text_parts)
+        return TEXT_DIGEST_TMPL.render(
+            rule="=" * 60,
+            date=date_str,
+            sections=digest_sections,
+        )
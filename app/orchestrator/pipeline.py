@@ -2,16 +2,38 @@
 Article processing pipeline orchestrator.
 Coordinates the flow of articles through extraction, summarization, and embedding.
 """
+import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal, Article
+from app.database import (
+    SessionLocal, Article, ProcessingQueue, ProcessingStatus, get_async_db_session,
+)
 from app.queue import get_message_queue
 from app.cache import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Most failed entries the retry scanner picks up per call
+RETRY_BATCH_SIZE = 100
+
+
+def _pending_article_ids_stmt(hours_back: int):
+    """
+    Select ids of recent articles that still need processing.
+    
+    Only the ids are needed, so select just that column rather than whole
+    rows with their content.
+    """
+    cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+    return select(Article.id).where(
+        Article.scraped_at >= cutoff_time,
+        Article.processing_status.in_(['pending', 'failed'])
+    )
+
 
 class ArticlePipeline:
     """Orchestrates article processing through the pipeline"""
@@ -58,13 +80,13 @@ class ArticlePipeline:
         Returns:
             Dict with 'enqueued' and 'failed' counts
         """
-        results = {'enqueued': 0, 'failed': 0}
+        # One pipelined enqueue for the whole batch instead of one per article
+        job_ids = self.message_queue.enqueue_extraction_many(article_ids)
         
-        for article_id in article_ids:
-            if self.process_article(article_id):
-                results['enqueued'] += 1
-            else:
-                results['failed'] += 1
+        failed = [article_id for article_id, job_id in zip(article_ids, job_ids) if not job_id]
+        if failed:
+            logger.error(f"Failed to enqueue articles: {failed}")
+        results = {'enqueued': len(article_ids) - len(failed), 'failed': len(failed)}
         
         logger.info(f"Batch processing: {results['enqueued']} enqueued, {results['failed']} failed")
         return results
@@ -79,19 +101,10 @@ class ArticlePipeline:
         Returns:
             Dict with processing statistics
         """
-        from datetime import datetime, timedelta
-        
         db = SessionLocal()
         try:
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
-            
             # Find articles that need processing
-            articles = db.query(Article).filter(
-                Article.scraped_at >= cutoff_time,
-                Article.processing_status.in_(['pending', 'failed'])
-            ).all()
-            
-            article_ids = [a.id for a in articles]
+            article_ids = db.scalars(_pending_article_ids_stmt(hours_back)).all()
             logger.info(f"Found {len(article_ids)} articles to process from last {hours_back} hours")
             
             if not article_ids:
@@ -105,6 +118,32 @@ class ArticlePipeline:
         finally:
             db.close()
     
+    async def process_new_articles_async(self, hours_back: int = 24) -> dict:
+        """
+        Async counterpart of process_new_articles() for event-loop callers.
+        
+        The backlog query runs on the async engine. The batch is then enqueued
+        in one pipelined Redis round trip (see process_articles_batch) on a
+        worker thread, so the event loop is never blocked on I/O.
+        
+        Args:
+            hours_back: How many hours back to look for new articles
+        
+        Returns:
+            Dict with processing statistics
+        """
+        async with get_async_db_session() as db:
+            article_ids = (await db.scalars(_pending_article_ids_stmt(hours_back))).all()
+        logger.info(f"Found {len(article_ids)} articles to process from last {hours_back} hours")
+        
+        if not article_ids:
+            return {'enqueued': 0, 'failed': 0, 'found': 0}
+        
+        results = await asyncio.to_thread(self.process_articles_batch, list(article_ids))
+        results['found'] = len(article_ids)
+        
+        return results
+    
     def get_pipeline_status(self) -> dict:
         """Get current status of the processing pipeline"""
         try:
@@ -143,6 +182,12 @@ class ArticlePipeline:
         """
         Retry articles that failed processing (up to max_retries attempts).
         
+        Picks up to RETRY_BATCH_SIZE of the oldest failed entries with
+        SELECT ... FOR UPDATE SKIP LOCKED, so concurrent scanners take
+        disjoint rows instead of waiting on each other's locks. The batch is
+        enqueued in one pipelined round trip and the enqueued entries are
+        marked pending before the locks are released.
+        
         Args:
             max_retries: Maximum number of retry attempts
         
@@ -151,25 +196,45 @@ class ArticlePipeline:
         """
         db = SessionLocal()
         try:
-            from app.database import ProcessingQueue, ProcessingStatus
-            
-            # Find failed articles with retries remaining
-            failed_entries = db.query(ProcessingQueue).filter(
-                ProcessingQueue.status == ProcessingStatus.FAILED.value,
-                ProcessingQueue.retry_count < max_retries
+            article_ids = db.scalars(
+                select(ProcessingQueue.article_id)
+                .where(
+                    ProcessingQueue.status == ProcessingStatus.FAILED,
+                    ProcessingQueue.retry_count < max_retries,
+                )
+                .order_by(ProcessingQueue.updated_at)
+                .limit(RETRY_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
             ).all()
             
-            logger.info(f"Found {len(failed_entries)} failed articles to retry")
-            
-            article_ids = [entry.article_id for entry in failed_entries]
+            logger.info(f"Found {len(article_ids)} failed articles to retry")
             
             if not article_ids:
-                return {'retried': 0, 'found': 0}
+                db.rollback()
+                return {'enqueued': 0, 'failed': 0, 'found': 0}
             
-            results = self.process_articles_batch(article_ids)
-            results['found'] = len(article_ids)
+            job_ids = self.message_queue.enqueue_extraction_many(article_ids)
+            enqueued = [article_id for article_id, job_id in zip(article_ids, job_ids) if job_id]
+            if enqueued:
+                db.execute(
+                    update(ProcessingQueue)
+                    .where(ProcessingQueue.article_id.in_(enqueued))
+                    .values(status=ProcessingStatus.PENDING, current_stage="extraction")
+                )
+            db.commit()
             
+            results = {
+                'enqueued': len(enqueued),
+                'failed': len(article_ids) - len(enqueued),
+                'found': len(article_ids),
+            }
+            logger.info(f"Retry: {results['enqueued']} enqueued, {results['failed']} failed")
             return results
         
+        except Exception as e:
+            logger.error(f"Error retrying failed articles: {e}")
+            db.rollback()
+            return {'enqueued': 0, 'failed': 0, 'found': 0}
+        
         finally:
             db.close()
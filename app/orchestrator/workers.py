@@ -2,33 +2,402 @@
 Worker functions for RQ (Redis Queue) processing.
 These are the actual jobs that get executed by RQ workers.
 """
-import sys
-import os
-from pathlib import Path
-
-# Add app directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
+import atexit
+import functools
 import logging
-from typing import Optional
-from sqlalchemy.orm import Session
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
 
 from app.database import (
-    SessionLocal, Article, ArticleSummary, ArticleEmbedding,
+    ScopedSession, Article, ArticleSummary, ArticleEmbedding,
     ProcessingQueue, ProcessingStatus, DeadLetter,
 )
+from app.database.models import CONTENT_PREVIEW_LENGTH
 from app.config import settings
-from app.processing.content_extractor import ContentExtractor
+from app.processing.content_extractor import ContentExtractor, EXTRACT_MAX_WORKERS
+from app.processing.llm_cache import LLMCache
 from app.processing.llm_summarizer import LLMSummarizer
 from app.processing.embeddings import EmbeddingGenerator
-from app.cache import get_redis_client
+from app.cache import flush_redis_client, get_redis_client
+from app.queue import get_message_queue
 
 logger = logging.getLogger(__name__)
 
+# Batched embeddings: how long a drain job waits for more articles to arrive,
+# the most ids it takes from the pending set per batch, and texts per forward pass
+EMBEDDING_BATCH_DELAY = 0.1
+EMBEDDING_BATCH_MAX = 256
+EMBEDDING_ENCODE_BATCH_SIZE = 32
+
+# Deferred summaries: the most ids a drain job takes from the pending set
+# per batch (sent to Gemini in packs of PACK_SIZE)
+SUMMARY_BATCH_MAX = 100
+
+# Status writer tuning: how long (seconds) queued status updates wait for
+# more to arrive, and the most articles written per batch
+STATUS_FLUSH_INTERVAL = 0.05
+STATUS_BATCH_SIZE = 100
+
+# Most seconds a finishing job waits for its queued cache writes to be sent
+CACHE_FLUSH_TIMEOUT = 5.0
+
+# Dialect INSERT constructs with ON CONFLICT support, for status upserts
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
 
 def get_db() -> Session:
-    """Get database session"""
-    return SessionLocal()
+    """
+    Get the database session for the current thread.
+
+    Sessions come from the thread-local ScopedSession registry, so every
+    get_db() call within a job reuses one Session and one pooled
+    connection; worker_job removes it when the job returns.
+    """
+    return ScopedSession()
+
+
+class StatusWriter:
+    """
+    Buffers ProcessingQueue status updates and writes them in batches.
+
+    Updates are merged per article while they wait (latest status and stage
+    win, error increments add up), then a daemon thread writes each batch
+    as one multi-row INSERT ... ON CONFLICT DO UPDATE (RETURNING the new
+    retry counts) and one COMMIT, instead of a session and round trips per
+    call.
+    """
+
+    def __init__(self, background: bool = True):
+        """
+        Args:
+            background: Write from a daemon thread. When False, updates are
+                        only written by flush(), in the calling thread.
+        """
+        self._background = background
+        self._reset()
+
+    def _reset(self) -> None:
+        """Start with an empty buffer and no writer thread."""
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._pending: Dict[int, dict] = {}
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._thread = None
+
+    def enqueue(
+        self,
+        article_id: int,
+        status: str,
+        stage: str = None,
+        error: str = None,
+        queue_name: str = None,
+        payload: dict = None,
+    ) -> None:
+        """
+        Queue a status update for the background writer.
+
+        Args:
+            article_id: Article whose queue entry to update
+            status: New ProcessingStatus (member or value string)
+            stage: New current_stage, if it changes
+            error: Error message; counts as one retry
+            queue_name: Queue recorded on a dead letter
+            payload: Job arguments recorded on a dead letter
+        """
+        if self._pid != os.getpid():
+            # Forked worker: the parent's writer thread does not exist here
+            self._reset()
+
+        with self._cond:
+            entry = self._pending.get(article_id)
+            if entry is None:
+                entry = self._pending[article_id] = {
+                    "stage": None, "error": None, "errors": 0,
+                    "queue_name": None, "payload": None,
+                }
+            entry["status"] = ProcessingStatus(status)
+            if stage:
+                entry["stage"] = stage
+            if error:
+                entry["error"] = error
+                entry["errors"] += 1
+                entry["queue_name"] = queue_name or (stage or "unknown")
+                entry["payload"] = payload or {"article_id": article_id}
+
+            if self._background and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._drain_loop, name="status-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush, 5.0)
+            if len(self._pending) in (1, STATUS_BATCH_SIZE):
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until every queued status update has been written.
+
+        Args:
+            timeout: Max seconds to wait (default: wait indefinitely)
+
+        Returns:
+            True if the buffer was fully drained, False on timeout
+        """
+        if self._pid != os.getpid():
+            self._reset()
+        if not self._background:
+            while self._pending:
+                self._write(self._take_batch())
+            return True
+        with self._cond:
+            self._flush_waiters += 1
+            try:
+                self._cond.notify_all()
+                return self._cond.wait_for(
+                    lambda: not self._pending and not self._in_flight, timeout
+                )
+            finally:
+                self._flush_waiters -= 1
+
+    def _drain_loop(self) -> None:
+        """Background writer: write buffered updates in batches."""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                if len(self._pending) < STATUS_BATCH_SIZE and not self._flush_waiters:
+                    # Give the batch a moment to fill; flush() cuts this short
+                    self._cond.wait(STATUS_FLUSH_INTERVAL)
+                batch = self._take_batch()
+                self._in_flight = len(batch)
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} processing status updates: {e}")
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _take_batch(self) -> Dict[int, dict]:
+        """Pop up to STATUS_BATCH_SIZE buffered entries, oldest first."""
+        return {
+            article_id: self._pending.pop(article_id)
+            for article_id in list(self._pending)[:STATUS_BATCH_SIZE]
+        }
+
+    def _write(self, batch: Dict[int, dict]) -> None:
+        """Apply one batch of merged updates in a single transaction."""
+        db = get_db()
+        try:
+            upsert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+            if upsert is not None:
+                retry_counts = self._upsert(db, upsert, batch)
+            else:
+                retry_counts = self._select_then_write(db, batch)
+
+            # Dead-letter entries whose retries are now exhausted
+            dead_letters = []
+            for article_id, entry in batch.items():
+                if not entry["errors"]:
+                    continue
+                retry_count = retry_counts[article_id]
+                if retry_count >= settings.MAX_RETRIES:
+                    dead_letters.append({
+                        "article_id": article_id,
+                        "queue_name": entry["queue_name"],
+                        "payload": entry["payload"],
+                        "error_message": entry["error"],
+                        "retry_count": retry_count,
+                    })
+                    logger.warning(
+                        f"Article {article_id} dead-lettered after {retry_count} retries "
+                        f"(queue={entry['queue_name']}): {entry['error']}"
+                    )
+            if dead_letters:
+                db.execute(insert(DeadLetter), dead_letters)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _rows(batch: Dict[int, dict]) -> List[dict]:
+        """One processing_queue row per entry; retry_count holds the increment."""
+        return [
+            {
+                "article_id": article_id,
+                "status": entry["status"],
+                "current_stage": entry["stage"],
+                "error_message": entry["error"],
+                "retry_count": entry["errors"],
+            }
+            for article_id, entry in batch.items()
+        ]
+
+    def _upsert(self, db: Session, dialect_insert, batch: Dict[int, dict]) -> Dict[int, int]:
+        """
+        INSERT ... ON CONFLICT (article_id) DO UPDATE for the whole batch.
+
+        Returns:
+            New retry_count per article, from RETURNING
+        """
+        table = ProcessingQueue.__table__
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.article_id],
+            set_={
+                "status": stmt.excluded.status,
+                "current_stage": func.coalesce(stmt.excluded.current_stage, table.c.current_stage),
+                "error_message": func.coalesce(stmt.excluded.error_message, table.c.error_message),
+                "retry_count": table.c.retry_count + stmt.excluded.retry_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(table.c.article_id, table.c.retry_count)
+        return dict(db.execute(stmt, self._rows(batch)).all())
+
+    def _select_then_write(self, db: Session, batch: Dict[int, dict]) -> Dict[int, int]:
+        """
+        Upsert fallback for dialects without ON CONFLICT: one SELECT, then
+        executemany INSERT for new rows and UPDATE for existing ones.
+
+        Returns:
+            New retry_count per article
+        """
+        table = ProcessingQueue.__table__
+        retry_counts = dict(db.execute(
+            select(table.c.article_id, table.c.retry_count)
+            .where(table.c.article_id.in_(list(batch)))
+        ).all())
+
+        rows = self._rows(batch)
+        new_rows = [row for row in rows if row["article_id"] not in retry_counts]
+        updates = [
+            {
+                "b_article_id": row["article_id"],
+                "b_status": row["status"],
+                "b_stage": row["current_stage"],
+                "b_error": row["error_message"],
+                "b_inc": row["retry_count"],
+            }
+            for row in rows if row["article_id"] in retry_counts
+        ]
+
+        if new_rows:
+            db.execute(insert(table), new_rows)
+        if updates:
+            db.execute(
+                update(table)
+                .where(table.c.article_id == bindparam("b_article_id"))
+                .values(
+                    status=bindparam("b_status"),
+                    current_stage=func.coalesce(bindparam("b_stage"), table.c.current_stage),
+                    error_message=func.coalesce(bindparam("b_error"), table.c.error_message),
+                    retry_count=table.c.retry_count + bindparam("b_inc"),
+                ),
+                updates,
+            )
+        return {
+            article_id: retry_counts.get(article_id, 0) + entry["errors"]
+            for article_id, entry in batch.items()
+        }
+
+
+STATUS_WRITER = StatusWriter()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_extractor() -> ContentExtractor:
+    """ContentExtractor shared by every job in this process."""
+    return ContentExtractor()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_summarizer(model: str = None) -> LLMSummarizer:
+    """LLMSummarizer per model, shared by every job in this process."""
+    try:
+        cache = LLMCache(get_redis_client())
+    except Exception as e:
+        logger.warning(f"LLM response cache disabled, Redis unavailable: {e}")
+        cache = None
+    if cache is not None:
+        try:
+            cache.embedder = _get_embedder()
+        except Exception as e:
+            logger.warning(f"LLM cache semantic matching disabled: {e}")
+    return LLMSummarizer(provider='gemini', model=model, cache=cache)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedder() -> EmbeddingGenerator:
+    """EmbeddingGenerator (and its loaded model) shared by every job in this process."""
+    return EmbeddingGenerator()
+
+
+def warm_up(queue_names: List[str]) -> None:
+    """
+    Load the heavy job resources for `queue_names` ahead of the first job.
+    
+    Call this in the worker process before it starts taking jobs. With
+    RQ's forking Worker each job runs in a fresh child, so anything cached
+    inside a job is lost when it exits; resources built here in the parent
+    are inherited by every child instead of being rebuilt per job. The
+    Gemini client is not preloaded because its gRPC channel is not
+    fork-safe; it is still cached per process on first use.
+    
+    Args:
+        queue_names: Queues the worker listens to
+    """
+    if 'extraction' in queue_names:
+        _get_extractor()
+    # Summaries are looked up in the LLM cache by embedding as well
+    if 'embedding' in queue_names or 'summarization' in queue_names:
+        try:
+            _get_embedder()
+        except Exception as e:
+            logger.error(f"Error preloading embedding model: {e}")
+
+
+def clear_job_caches() -> None:
+    """Drop the cached job resources so the next job builds fresh ones."""
+    _get_extractor.cache_clear()
+    _get_summarizer.cache_clear()
+    _get_embedder.cache_clear()
+
+
+def worker_job(job):
+    """
+    Wrap an RQ job: flush STATUS_WRITER and queued cache writes, and
+    release the thread's session.
+
+    RQ's forking Worker ends each job with os._exit(), which skips atexit
+    handlers, so buffered writes must be sent before the job finishes.
+    Jobs called from another job share the caller's session; only the
+    outermost one removes it.
+    """
+    @functools.wraps(job)
+    def wrapper(*args, **kwargs):
+        owns_session = not ScopedSession.registry.has()
+        try:
+            return job(*args, **kwargs)
+        finally:
+            STATUS_WRITER.flush()
+            if not flush_redis_client(CACHE_FLUSH_TIMEOUT):
+                logger.warning(f"Cache writes still queued after {CACHE_FLUSH_TIMEOUT}s")
+            if owns_session:
+                ScopedSession.remove()
+    return wrapper
 
 
 def update_processing_status(
@@ -41,53 +410,15 @@ def update_processing_status(
 ):
     """Update processing queue status for an article.
 
-    If the job has failed and retry_count reaches MAX_RETRIES, the entry is
-    moved to the dead_letters table so it can be inspected and replayed later.
+    The update is buffered by STATUS_WRITER and written in a batch shortly
+    after. If the job has failed and retry_count reaches MAX_RETRIES, the
+    entry is moved to the dead_letters table so it can be inspected and
+    replayed later.
     """
-    db = get_db()
-    try:
-        queue_entry = db.query(ProcessingQueue).filter(ProcessingQueue.article_id == article_id).first()
-
-        if not queue_entry:
-            queue_entry = ProcessingQueue(
-                article_id=article_id,
-                status=status,
-                current_stage=stage,
-            )
-            db.add(queue_entry)
-        else:
-            queue_entry.status = status
-            if stage:
-                queue_entry.current_stage = stage
-            if error:
-                queue_entry.error_message = error
-                queue_entry.retry_count += 1
-
-        db.flush()  # get retry_count value before commit
-
-        # Dead-letter if max retries exhausted
-        if error and queue_entry.retry_count >= settings.MAX_RETRIES:
-            dead = DeadLetter(
-                article_id=article_id,
-                queue_name=queue_name or (stage or "unknown"),
-                payload=payload or {"article_id": article_id},
-                error_message=error,
-                retry_count=queue_entry.retry_count,
-            )
-            db.add(dead)
-            logger.warning(
-                f"Article {article_id} dead-lettered after {queue_entry.retry_count} retries "
-                f"(queue={dead.queue_name}): {error}"
-            )
-
-        db.commit()
-    except Exception as e:
-        logger.error(f"Failed to update processing status: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    STATUS_WRITER.enqueue(article_id, status, stage, error, queue_name, payload)
 
 
+@worker_job
 def extract_content(article_id: int) -> bool:
     """
     Extract full content from an article.
@@ -116,12 +447,11 @@ def extract_content(article_id: int) -> bool:
             logger.info(f"Article {article_id} already has full content")
             update_processing_status(article_id, ProcessingStatus.PENDING.value, "summarization")
             # Enqueue summarization
-            from app.queue import get_message_queue
-            get_message_queue().enqueue_summarization(article_id)
+            get_message_queue().enqueue_summarization_batched([article_id])
             return True
         
         # Extract content based on source type
-        extractor = ContentExtractor()
+        extractor = _get_extractor()
         result = None
         
         if article.video_id:
@@ -139,6 +469,10 @@ def extract_content(article_id: int) -> bool:
             # Update article with extracted content
             article.full_content = result['content']
             article.extraction_method = method
+            # Feed digest prompts from the extracted text when it is longer
+            # than the scraped description the preview was cut from
+            if len(result['content']) > len(article.content_preview or ''):
+                article.content_preview = result['content'][:CONTENT_PREVIEW_LENGTH]
             # FIX: Use enum value instead of hardcoded string 'extracted'
             article.processing_status = ProcessingStatus.EXTRACTING.value 
             db.commit()
@@ -146,8 +480,7 @@ def extract_content(article_id: int) -> bool:
             logger.info(f"✅ Content extracted for article {article_id} ({len(result['content'])} chars)")
             
             # Enqueue for summarization
-            from app.queue import get_message_queue
-            get_message_queue().enqueue_summarization(article_id)
+            get_message_queue().enqueue_summarization_batched([article_id])
             update_processing_status(article_id, ProcessingStatus.PENDING.value, "summarization")
             
             return True
@@ -169,6 +502,136 @@ def extract_content(article_id: int) -> bool:
         db.close()
 
 
+@worker_job
+def extract_contents(article_ids: List[int]) -> Dict[str, int]:
+    """
+    Extract full content for several articles with overlapping fetches.
+    This is a worker function executed by RQ.
+    
+    Articles are read with one IN query, their pages and transcripts are
+    fetched on a thread pool (requests and lxml release the GIL while they
+    wait and parse), and the extracted text goes out as one executemany
+    UPDATE in a single commit. Summarization for the whole batch is then
+    enqueued over one Redis pipeline. An article whose fetch raises is
+    marked failed on its own; the rest of the batch carries on.
+    
+    Args:
+        article_ids: IDs of articles to extract
+    
+    Returns:
+        Dict with 'extracted', 'skipped' (already had content) and 'failed' counts
+    """
+    results = {'extracted': 0, 'skipped': 0, 'failed': 0}
+    if not article_ids:
+        return results
+    logger.info(f"Starting batched content extraction for {len(article_ids)} articles")
+    for article_id in article_ids:
+        update_processing_status(article_id, ProcessingStatus.EXTRACTING.value, "extraction")
+    
+    db = get_db()
+    try:
+        articles = {
+            article.id: article
+            for article in db.scalars(select(Article).where(Article.id.in_(article_ids)))
+        }
+        
+        # (article_id, error, raised); raised failures are recorded with a
+        # dead-letter payload, like extract_content's
+        ready, targets, failed = [], [], []
+        for article_id in article_ids:
+            article = articles.get(article_id)
+            if article is None:
+                failed.append((article_id, "Article not found", False))
+            elif article.full_content and len(article.full_content) > 100:
+                ready.append(article_id)
+            else:
+                # Plain tuples, so the pool threads never touch the Session
+                targets.append((article_id, article.video_id, article.url))
+        results['skipped'] = len(ready)
+        
+        extractor = _get_extractor()
+        
+        def extract_one(target):
+            """(result, method, error) for one article; never raises."""
+            article_id, video_id, url = target
+            try:
+                if video_id:
+                    return extractor.extract_video_transcript(video_id), 'youtube_transcript', None
+                result = extractor.extract_article_content(url)
+                return result, result.get('method', 'unknown') if result else 'failed', None
+            except Exception as e:
+                logger.error(f"Error extracting content for article {article_id}: {e}")
+                return None, 'failed', e
+        
+        rows = []
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(EXTRACT_MAX_WORKERS, len(targets))) as pool:
+                for (article_id, _, _), (result, method, error) in zip(targets, pool.map(extract_one, targets)):
+                    if error is not None:
+                        failed.append((article_id, str(error), True))
+                        continue
+                    if not (result and result.get('content')):
+                        failed.append((article_id, "Content extraction failed", False))
+                        continue
+                    content = result['content']
+                    row = {
+                        'id': article_id,
+                        'full_content': content,
+                        'extraction_method': method,
+                        'content_preview': articles[article_id].content_preview,
+                        'processing_status': ProcessingStatus.EXTRACTING.value,
+                    }
+                    # Feed digest prompts from the extracted text when it is
+                    # longer than the scraped description
+                    if len(content) > len(row['content_preview'] or ''):
+                        row['content_preview'] = content[:CONTENT_PREVIEW_LENGTH]
+                    rows.append(row)
+        
+        if rows:
+            db.execute(update(Article), rows)
+            db.commit()
+        done = [row['id'] for row in rows]
+        results['extracted'] = len(done)
+        
+        if done or ready:
+            get_message_queue().enqueue_summarization_batched(done + ready)
+            for article_id in done + ready:
+                update_processing_status(article_id, ProcessingStatus.PENDING.value, "summarization")
+        
+        for article_id, error, raised in failed:
+            logger.warning(f"Article {article_id} not extracted: {error}")
+            if raised:
+                update_processing_status(
+                    article_id, ProcessingStatus.FAILED.value,
+                    error=error, queue_name="extraction",
+                    payload={"article_id": article_id},
+                )
+            else:
+                update_processing_status(article_id, ProcessingStatus.FAILED.value, error=error)
+        results['failed'] = len(failed)
+        
+        logger.info(
+            f"✅ Batched extraction: {results['extracted']} extracted, "
+            f"{results['skipped']} skipped, {results['failed']} failed"
+        )
+        return results
+    
+    except Exception as e:
+        logger.error(f"Error extracting batched content: {e}")
+        db.rollback()
+        for article_id in article_ids:
+            update_processing_status(
+                article_id, ProcessingStatus.FAILED.value,
+                error=str(e), queue_name="extraction",
+                payload={"article_id": article_id},
+            )
+        results['failed'] = len(article_ids)
+        return results
+    finally:
+        db.close()
+
+
+@worker_job
 def generate_summary(article_id: int, model: str = None) -> bool:
     """
     Generate LLM summary for an article.
@@ -193,17 +656,13 @@ def generate_summary(article_id: int, model: str = None) -> bool:
             update_processing_status(article_id, ProcessingStatus.FAILED.value, error="Article not found")
             return False
         
-        # Check if already summarized
-        existing_summary = db.query(ArticleSummary).filter(
-            ArticleSummary.article_id == article_id
-        ).first()
-        
-        if existing_summary:
+        # Check if already summarized (article.summary is set with every
+        # ArticleSummary, so no second query is needed)
+        if article.summary is not None:
             logger.info(f"Article {article_id} already has summary")
             update_processing_status(article_id, ProcessingStatus.PENDING.value, "embedding")
             # Enqueue embedding generation
-            from app.queue import get_message_queue
-            get_message_queue().enqueue_embedding(article_id)
+            get_message_queue().enqueue_embedding_batched([article_id])
             return True
         
         # Get content to summarize
@@ -214,7 +673,7 @@ def generate_summary(article_id: int, model: str = None) -> bool:
             return False
         
         # Generate summary
-        summarizer = LLMSummarizer(provider='gemini', model=model)
+        summarizer = _get_summarizer(model)
         result = summarizer.summarize(content, article.title)
         
         if result:
@@ -227,6 +686,10 @@ def generate_summary(article_id: int, model: str = None) -> bool:
             )
             db.add(summary)
             
+            # Denormalized copy so digests can skip Gemini for this article
+            article.summary = result['summary']
+            article.summary_generated_at = func.now()
+            
             # FIX: Use enum value instead of hardcoded string 'summarized'
             article.processing_status = ProcessingStatus.SUMMARIZING.value
             db.commit()
@@ -234,8 +697,7 @@ def generate_summary(article_id: int, model: str = None) -> bool:
             logger.info(f"✅ Summary generated for article {article_id}")
             
             # Enqueue for embedding generation
-            from app.queue import get_message_queue
-            get_message_queue().enqueue_embedding(article_id)
+            get_message_queue().enqueue_embedding_batched([article_id])
             update_processing_status(article_id, ProcessingStatus.PENDING.value, "embedding")
             
             return True
@@ -257,6 +719,156 @@ def generate_summary(article_id: int, model: str = None) -> bool:
         db.close()
 
 
+@worker_job
+def generate_summaries_batch(article_ids: List[int], model: str = None) -> Dict[str, int]:
+    """
+    Generate LLM summaries for several articles with packed Gemini requests.
+    This is a worker function executed by RQ.
+    
+    Articles are read with one IN query and summarized PACK_SIZE per
+    request, packs in parallel. Summaries go out as one executemany INSERT
+    and one executemany UPDATE in a single commit.
+    
+    Args:
+        article_ids: IDs of articles to summarize
+        model: LLM model to use (optional)
+    
+    Returns:
+        Dict with 'summarized', 'skipped' (already summarized) and 'failed' counts
+    """
+    results = {'summarized': 0, 'skipped': 0, 'failed': 0}
+    if not article_ids:
+        return results
+    logger.info(f"Starting batched summarization for {len(article_ids)} articles")
+    for article_id in article_ids:
+        update_processing_status(article_id, ProcessingStatus.SUMMARIZING.value, "summarization")
+    
+    db = get_db()
+    try:
+        articles = {
+            article.id: article
+            for article in db.scalars(select(Article).where(Article.id.in_(article_ids)))
+        }
+        
+        to_summarize, inputs, ready, failed = [], [], [], []
+        for article_id in article_ids:
+            article = articles.get(article_id)
+            if article is None:
+                failed.append((article_id, "Article not found"))
+                continue
+            if article.summary is not None:
+                ready.append(article_id)
+                continue
+            content = article.full_content or article.content
+            if not content or len(content) < 50:
+                failed.append((article_id, "Insufficient content"))
+                continue
+            to_summarize.append(article_id)
+            inputs.append({'content': content, 'title': article.title})
+        results['skipped'] = len(ready)
+        
+        done = []
+        if inputs:
+            summaries = _get_summarizer(model).summarize_packed_sync(inputs)
+            rows = []
+            for article_id, result in zip(to_summarize, summaries):
+                if result:
+                    rows.append(result)
+                    done.append(article_id)
+                else:
+                    failed.append((article_id, "Summarization failed"))
+            
+            if rows:
+                db.execute(insert(ArticleSummary), [
+                    {
+                        'article_id': article_id,
+                        'model': result['model'],
+                        'summary': result['summary'],
+                        'key_points': result.get('key_points', []),
+                    }
+                    for article_id, result in zip(done, rows)
+                ])
+                # Denormalized copy so digests can skip Gemini for these articles
+                table = Article.__table__
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values(
+                        summary=bindparam("b_summary"),
+                        summary_generated_at=func.now(),
+                        processing_status=ProcessingStatus.SUMMARIZING.value,
+                    ),
+                    [{'b_id': article_id, 'b_summary': result['summary']} for article_id, result in zip(done, rows)],
+                )
+                db.commit()
+        results['summarized'] = len(done)
+        
+        if done or ready:
+            get_message_queue().enqueue_embedding_batched(done + ready)
+            for article_id in done + ready:
+                update_processing_status(article_id, ProcessingStatus.PENDING.value, "embedding")
+        
+        for article_id, error in failed:
+            logger.warning(f"Article {article_id} not summarized: {error}")
+            update_processing_status(article_id, ProcessingStatus.FAILED.value, error=error)
+        results['failed'] = len(failed)
+        
+        logger.info(
+            f"✅ Batched summaries: {results['summarized']} summarized, "
+            f"{results['skipped']} skipped, {results['failed']} failed"
+        )
+        return results
+    
+    except Exception as e:
+        logger.error(f"Error generating batched summaries: {e}")
+        db.rollback()
+        for article_id in article_ids:
+            update_processing_status(
+                article_id, ProcessingStatus.FAILED.value,
+                error=str(e), queue_name="summarization",
+                payload={"article_id": article_id, "model": model},
+            )
+        results['failed'] = len(article_ids)
+        return results
+    finally:
+        db.close()
+
+
+@worker_job
+def generate_pending_summaries() -> Dict[str, int]:
+    """
+    Drain the pending-summary set filled by enqueue_summarization_batched().
+    This is a worker function executed by RQ.
+    
+    Scheduled by enqueue_summarization_batched() to run a fixed delay
+    after the first article was queued, so the articles arriving in that
+    window are summarized together, in chunks of SUMMARY_BATCH_MAX.
+    
+    Returns:
+        Summed counts from generate_summaries_batch()
+    """
+    from app.queue.client import SUMMARY_PENDING_KEY, SUMMARY_SCHEDULED_KEY
+    
+    queue = get_message_queue()
+    # Clear the flag before draining: ids added from now on schedule a new
+    # job, so nothing is left behind in the set. Sent with the first SPOP.
+    pipe = queue.pipeline()
+    pipe.delete(SUMMARY_SCHEDULED_KEY)
+    pipe.spop(SUMMARY_PENDING_KEY, SUMMARY_BATCH_MAX)
+    popped = pipe.execute()[1]
+    
+    totals = {'summarized': 0, 'skipped': 0, 'failed': 0}
+    while popped:
+        for key, count in generate_summaries_batch([int(i) for i in popped]).items():
+            totals[key] += count
+        if len(popped) < SUMMARY_BATCH_MAX:
+            # The set held less than a full batch, so it was drained
+            return totals
+        popped = queue.redis_conn.spop(SUMMARY_PENDING_KEY, SUMMARY_BATCH_MAX)
+    return totals
+
+
+@worker_job
 def generate_embedding(article_id: int) -> bool:
     """
     Generate vector embedding for an article.
@@ -273,29 +885,26 @@ def generate_embedding(article_id: int) -> bool:
     
     db = get_db()
     try:
-        # Get article and summary
-        article = db.query(Article).filter(Article.id == article_id).first()
+        # Get article and any existing embedding in one query
+        article = (
+            db.query(Article)
+            .options(joinedload(Article.embedding))
+            .filter(Article.id == article_id)
+            .first()
+        )
         if not article:
             logger.error(f"Article {article_id} not found")
             update_processing_status(article_id, ProcessingStatus.FAILED.value, error="Article not found")
             return False
         
         # Check if already has embedding
-        existing_embedding = db.query(ArticleEmbedding).filter(
-            ArticleEmbedding.article_id == article_id
-        ).first()
-        
-        if existing_embedding:
+        if article.embedding is not None:
             logger.info(f"Article {article_id} already has embedding")
             update_processing_status(article_id, ProcessingStatus.COMPLETED.value)
             return True
         
-        # Get summary to embed (prefer summary over full content)
-        summary_obj = db.query(ArticleSummary).filter(
-            ArticleSummary.article_id == article_id
-        ).first()
-        
-        text_to_embed = summary_obj.summary if summary_obj else (article.full_content or article.content)
+        # Text to embed: the stored summary, else the article content
+        text_to_embed = article.summary or article.full_content or article.content
         
         if not text_to_embed or len(text_to_embed) < 10:
             logger.warning(f"Article {article_id} has insufficient text for embedding")
@@ -303,10 +912,10 @@ def generate_embedding(article_id: int) -> bool:
             return False
         
         # Generate embedding
-        generator = EmbeddingGenerator()
+        generator = _get_embedder()
         embedding_vector = generator.generate_embedding(text_to_embed)
         
-        if embedding_vector:
+        if embedding_vector is not None:
             # Save to database
             embedding = ArticleEmbedding(
                 article_id=article_id,
@@ -345,6 +954,157 @@ def generate_embedding(article_id: int) -> bool:
         db.close()
 
 
+@worker_job
+def generate_embeddings_batch(article_ids: List[int]) -> Dict[str, int]:
+    """
+    Generate vector embeddings for several articles with one forward pass.
+    This is a worker function executed by RQ.
+    
+    Articles, summaries and existing embeddings are read with one IN query
+    each. The new ArticleEmbedding rows go out as one executemany INSERT
+    (batched into multi-row VALUES by the engine's insertmanyvalues
+    settings), and the status change as one UPDATE, in a single commit.
+    
+    Args:
+        article_ids: IDs of articles to embed
+    
+    Returns:
+        Dict with 'embedded', 'skipped' (already embedded) and 'failed' counts
+    """
+    results = {'embedded': 0, 'skipped': 0, 'failed': 0}
+    if not article_ids:
+        return results
+    logger.info(f"Starting batched embedding generation for {len(article_ids)} articles")
+    for article_id in article_ids:
+        update_processing_status(article_id, ProcessingStatus.EMBEDDING.value, "embedding")
+    
+    db = get_db()
+    try:
+        articles = {
+            article.id: article
+            for article in db.scalars(select(Article).where(Article.id.in_(article_ids)))
+        }
+        embedded = set(db.scalars(
+            select(ArticleEmbedding.article_id).where(ArticleEmbedding.article_id.in_(article_ids))
+        ))
+        
+        # Prefer the summary over full content; Article.summary holds the
+        # latest one, article_summaries covers rows written before it existed
+        missing_summary = [i for i, a in articles.items() if not a.summary and i not in embedded]
+        summaries = {}
+        if missing_summary:
+            for article_id, summary in db.execute(
+                select(ArticleSummary.article_id, ArticleSummary.summary)
+                .where(ArticleSummary.article_id.in_(missing_summary))
+            ):
+                summaries.setdefault(article_id, summary)
+        
+        to_embed, texts, failed = [], [], []
+        for article_id in article_ids:
+            article = articles.get(article_id)
+            if article is None:
+                failed.append((article_id, "Article not found"))
+                continue
+            if article_id in embedded:
+                results['skipped'] += 1
+                continue
+            text = article.summary or summaries.get(article_id) or article.full_content or article.content
+            if not text or len(text) < 10:
+                failed.append((article_id, "Insufficient text"))
+                continue
+            to_embed.append(article_id)
+            texts.append(text)
+        
+        if texts:
+            generator = _get_embedder()
+            vectors = generator.generate_embeddings_batch(texts, batch_size=EMBEDDING_ENCODE_BATCH_SIZE)
+            
+            rows = []
+            for article_id, vector in zip(to_embed, vectors):
+                if vector is not None:
+                    rows.append({'article_id': article_id, 'embedding': vector, 'model': generator.model_name})
+                else:
+                    failed.append((article_id, "Embedding generation failed"))
+            done = [row['article_id'] for row in rows]
+            
+            if rows:
+                db.execute(insert(ArticleEmbedding), rows)
+                db.execute(
+                    update(Article).where(Article.id.in_(done))
+                    .values(processing_status=ProcessingStatus.COMPLETED.value)
+                )
+            db.commit()
+            
+            for article_id in done:
+                update_processing_status(article_id, ProcessingStatus.COMPLETED.value)
+            results['embedded'] = len(done)
+            
+            if done:
+                # Invalidate cache
+                get_redis_client().delete('articles:latest', 'articles:all')
+        
+        for article_id in embedded & set(article_ids):
+            update_processing_status(article_id, ProcessingStatus.COMPLETED.value)
+        for article_id, error in failed:
+            logger.warning(f"Article {article_id} not embedded: {error}")
+            update_processing_status(article_id, ProcessingStatus.FAILED.value, error=error)
+        results['failed'] = len(failed)
+        
+        logger.info(
+            f"✅ Batched embeddings: {results['embedded']} embedded, "
+            f"{results['skipped']} skipped, {results['failed']} failed"
+        )
+        return results
+    
+    except Exception as e:
+        logger.error(f"Error generating batched embeddings: {e}")
+        db.rollback()
+        for article_id in article_ids:
+            update_processing_status(
+                article_id, ProcessingStatus.FAILED.value,
+                error=str(e), queue_name="embedding",
+                payload={"article_id": article_id},
+            )
+        results['failed'] = len(article_ids)
+        return results
+    finally:
+        db.close()
+
+
+@worker_job
+def generate_pending_embeddings() -> Dict[str, int]:
+    """
+    Drain the pending-embedding set filled by enqueue_embedding_batched().
+    This is a worker function executed by RQ.
+    
+    Waits EMBEDDING_BATCH_DELAY so articles finishing together land in the
+    same batch, then embeds the set in chunks of EMBEDDING_BATCH_MAX.
+    
+    Returns:
+        Summed counts from generate_embeddings_batch()
+    """
+    from app.queue.client import EMBEDDING_PENDING_KEY, EMBEDDING_SCHEDULED_KEY
+    
+    time.sleep(EMBEDDING_BATCH_DELAY)
+    queue = get_message_queue()
+    # Clear the flag before draining: ids added from now on schedule a new
+    # job, so nothing is left behind in the set. Sent with the first SPOP.
+    pipe = queue.pipeline()
+    pipe.delete(EMBEDDING_SCHEDULED_KEY)
+    pipe.spop(EMBEDDING_PENDING_KEY, EMBEDDING_BATCH_MAX)
+    popped = pipe.execute()[1]
+    
+    totals = {'embedded': 0, 'skipped': 0, 'failed': 0}
+    while popped:
+        for key, count in generate_embeddings_batch([int(i) for i in popped]).items():
+            totals[key] += count
+        if len(popped) < EMBEDDING_BATCH_MAX:
+            # The set held less than a full batch, so it was drained
+            return totals
+        popped = queue.redis_conn.spop(EMBEDDING_PENDING_KEY, EMBEDDING_BATCH_MAX)
+    return totals
+
+
 def send_email_digest(subscription_id: int) -> bool:
     """
     Send email digest for a subscription.
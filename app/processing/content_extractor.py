@@ -3,25 +3,213 @@ Content extraction for articles and videos.
 Extracts full content from web articles using newspaper3k and transcripts from YouTube.
 """
 import os
+import re
+import hashlib
 import logging
-from typing import Optional, Dict
-from newspaper import Article as NewspaperArticle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from operator import itemgetter
+from typing import Optional, Dict, List, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from newspaper import Article as NewspaperArticle, Config as NewspaperConfig
 from youtube_transcript_api import YouTubeTranscriptApi
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+from app.cache import get_redis_client
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    # Fallback to BeautifulSoup with the lxml parser if selectolax is not installed
+    HTMLParser = None
+
 logger = logging.getLogger(__name__)
 
+# Extraction results cached in Redis, keyed by a hash of the normalized URL
+# (or video id + language), so URLs seen in several feeds are fetched once
+EXTRACTION_CACHE_PREFIX = "extract:"
+EXTRACTION_CACHE_TTL = 7 * 86400
+
+# Negative cache for URLs whose extraction failed: skipped for
+# EXTRACTION_FAIL_TTL seconds, or EXTRACTION_FAIL_LONG_TTL once they have
+# failed more than EXTRACTION_FAIL_MAX times (dead links, paywalls)
+EXTRACTION_FAIL_PREFIX = "extract_fail:"
+EXTRACTION_FAIL_TTL = int(os.getenv('EXTRACTION_FAIL_TTL', 86400))
+EXTRACTION_FAIL_LONG_TTL = int(os.getenv('EXTRACTION_FAIL_LONG_TTL', 30 * 86400))
+EXTRACTION_FAIL_MAX = 3
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+
+# Keep-alive pool shared by every ContentExtractor in the process: hosts
+# kept, connections per host, and threads used by extract_many()
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 32
+EXTRACT_MAX_WORKERS = 16
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def _build_newspaper_config() -> NewspaperConfig:
+    """newspaper3k settings shared by every parsed article."""
+    config = NewspaperConfig()
+    config.memoize_articles = False  # Dedup is done by the extraction cache
+    config.fetch_images = False      # Pick top_image from markup; don't download images
+    config.number_threads = 1
+    config.browser_user_agent = USER_AGENT
+    config.request_timeout = 10
+    return config
+
+
+# Built once per process instead of a default Config per NewspaperArticle
+NEWSPAPER_CONFIG = _build_newspaper_config()
+
+
+def _get_http_session() -> requests.Session:
+    """Process-wide requests.Session, so repeat hosts reuse TCP/TLS connections."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys.
+
+    Lowercases the scheme and host, drops the fragment, a trailing slash
+    and tracking parameters (utm_* etc.), and sorts the remaining query.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/") or "/",
+        urlencode(query),
+        "",
+    ))
+
+
+def _html_text(
+    html: Union[str, bytes], drop_tags: List[str], separator: str = '', strip: bool = False
+) -> Tuple[str, Optional[str]]:
+    """
+    Text and <title> of an HTML document with `drop_tags` (and their content) removed.
+    
+    Parsed with selectolax when installed, otherwise BeautifulSoup on lxml;
+    both are C parsers, unlike BeautifulSoup's default html.parser.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        title = tree.css_first('title')
+        tree.strip_tags(drop_tags)
+        text = tree.root.text(separator=separator, strip=strip) if tree.root else ''
+        return text, title.text() if title else None
+    
+    soup = BeautifulSoup(html, 'lxml')
+    for tag in soup(drop_tags):
+        tag.decompose()
+    return soup.get_text(separator=separator, strip=strip), soup.title.string if soup.title else None
+
+
+# Runs of whitespace (including newlines inside transcript segments)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _join_transcript(transcript_list) -> str:
+    """Join transcript segment texts into one single-spaced string."""
+    return _WHITESPACE_RE.sub(' ', ' '.join(map(itemgetter('text'), transcript_list))).strip()
+
+
+def _cache_key(kind: str, value: str) -> str:
+    """Redis key for a cached extraction result."""
+    return f"{EXTRACTION_CACHE_PREFIX}{kind}:{hashlib.sha256(value.encode()).hexdigest()}"
+
+
+def _failure_key(url: str) -> str:
+    """Redis key counting extraction failures for a URL."""
+    return f"{EXTRACTION_FAIL_PREFIX}{hashlib.sha256(normalize_url(url).encode()).hexdigest()}"
+
 
 class ContentExtractor:
     """Extract full content from articles and videos"""
     
     def __init__(self):
-        self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        self.user_agent = USER_AGENT
+        self.session = _get_http_session()
+        
+        # Result cache; extraction still works (uncached) if Redis is down
+        try:
+            self.cache = get_redis_client()
+        except Exception as e:
+            logger.warning(f"Extraction cache disabled, Redis unavailable: {e}")
+            self.cache = None
+    
+    def _get_cached(self, key: str, label: str) -> Optional[Dict]:
+        """Look up a cached extraction result, logging the hit or miss."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(key)
+        if not isinstance(cached, dict):
+            logger.debug(f"Extraction cache MISS: {label}")
+            return None
+        logger.info(f"Extraction cache HIT: {label}")
+        if cached.get('publish_date'):
+            cached['publish_date'] = datetime.fromisoformat(cached['publish_date'])
+        return cached
+    
+    def _set_cached(self, key: str, result: Optional[Dict]) -> None:
+        """
+        Cache a successful extraction result; failures are retried next time.
+        
+        The write goes through set_async() so the fetch threads never wait
+        on Redis; the worker job flushes it before it exits.
+        """
+        if self.cache is None or not result or not result.get('content'):
+            return
+        payload = dict(result)
+        if isinstance(payload.get('publish_date'), datetime):
+            payload['publish_date'] = payload['publish_date'].isoformat()
+        self.cache.set_async(key, payload, EXTRACTION_CACHE_TTL)
+    
+    def _known_failure(self, url: str) -> bool:
+        """True if the URL failed recently and should not be fetched again yet."""
+        if self.cache is None or not self.cache.exists(_failure_key(url)):
+            return False
+        logger.info(f"Skipping recently failed extraction: {url}")
+        return True
+    
+    def _record_failure(self, url: str) -> None:
+        """Count a failed extraction, keeping repeat offenders out for longer."""
+        if self.cache is None:
+            return
+        key = _failure_key(url)
+        if self.cache.incr(key, EXTRACTION_FAIL_TTL) > EXTRACTION_FAIL_MAX:
+            self.cache.expire(key, EXTRACTION_FAIL_LONG_TTL)
     
     def extract_article_content(self, url: str) -> Optional[Dict[str, str]]:
         """
-        Extract full text from web articles using newspaper3k.
+        Extract full text from web articles, using the Redis result cache.
+        
+        URLs that failed recently (both newspaper3k and the BeautifulSoup
+        fallback) are not fetched again until their negative cache entry
+        expires.
         
         Args:
             url: Article URL
@@ -29,9 +217,45 @@ class ContentExtractor:
         Returns:
             Dict with 'content', 'title', 'authors', 'publish_date' or None if failed
         """
+        key = _cache_key("url", normalize_url(url))
+        result = self._get_cached(key, url)
+        if result is None:
+            if self._known_failure(url):
+                return None
+            result = self._download_article(url)
+            if result and result.get('content'):
+                self._set_cached(key, result)
+            else:
+                self._record_failure(url)
+        return result
+    
+    def extract_many(self, urls: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Extract several articles concurrently so their network waits overlap.
+        
+        Args:
+            urls: Article URLs
+        
+        Returns:
+            Dict of url -> extract_article_content() result
+        """
+        if not urls:
+            return {}
+        unique = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=min(EXTRACT_MAX_WORKERS, len(unique))) as pool:
+            return dict(zip(unique, pool.map(self.extract_article_content, unique)))
+    
+    def _fetch(self, url: str) -> requests.Response:
+        """GET a page over the shared keep-alive session."""
+        response = self.session.get(url, headers={'User-Agent': self.user_agent}, timeout=10)
+        response.raise_for_status()
+        return response
+    
+    def _download_article(self, url: str) -> Optional[Dict[str, str]]:
+        """Download and parse an article with newspaper3k (BeautifulSoup fallback)."""
         try:
-            article = NewspaperArticle(url)
-            article.download()
+            article = NewspaperArticle(url, config=NEWSPAPER_CONFIG)
+            article.download(input_html=self._fetch(url).text)
             article.parse()
             
             return {
@@ -48,20 +272,10 @@ class ContentExtractor:
             return self._extract_with_beautifulsoup(url)
     
     def _extract_with_beautifulsoup(self, url: str) -> Optional[Dict[str, str]]:
-        """Fallback content extraction using BeautifulSoup"""
+        """Fallback content extraction straight from the page HTML"""
         try:
-            headers = {'User-Agent': self.user_agent}
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text
-            text = soup.get_text()
+            # Get text without script and style elements
+            text, title = _html_text(self._fetch(url).content, ["script", "style"])
             
             # Clean up whitespace
             lines = (line.strip() for line in text.splitlines())
@@ -70,7 +284,7 @@ class ContentExtractor:
             
             return {
                 'content': text,
-                'title': soup.title.string if soup.title else '',
+                'title': title or '',
                 'authors': [],
                 'publish_date': None,
                 'top_image': None,
@@ -82,7 +296,7 @@ class ContentExtractor:
     
     def extract_video_transcript(self, video_id: str, language: str = 'en') -> Optional[Dict[str, str]]:
         """
-        Extract transcript from YouTube videos.
+        Extract transcript from YouTube videos, using the Redis result cache.
         
         Args:
             video_id: YouTube video ID
@@ -91,11 +305,20 @@ class ContentExtractor:
         Returns:
             Dict with 'transcript' and 'method' or None if failed
         """
+        key = _cache_key("video", f"{video_id}:{language}")
+        result = self._get_cached(key, f"video {video_id} ({language})")
+        if result is None:
+            result = self._fetch_transcript(video_id, language)
+            self._set_cached(key, result)
+        return result
+    
+    def _fetch_transcript(self, video_id: str, language: str) -> Optional[Dict[str, str]]:
+        """Fetch a transcript in `language`, falling back to any available language."""
         try:
             transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
             
             # Combine all transcript segments
-            full_transcript = ' '.join([item['text'] for item in transcript_list])
+            full_transcript = _join_transcript(transcript_list)
             
             return {
                 'content': full_transcript,
@@ -107,7 +330,7 @@ class ContentExtractor:
             # Try without language specification
             try:
                 transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-                full_transcript = ' '.join([item['text'] for item in transcript_list])
+                full_transcript = _join_transcript(transcript_list)
                 
                 return {
                     'content': full_transcript,
@@ -129,15 +352,8 @@ class ContentExtractor:
             Dict with cleaned 'content' and 'method'
         """
         try:
-            # Parse HTML content from RSS
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove unwanted tags
-            for tag in soup(['script', 'style', 'img', 'video']):
-                tag.decompose()
-            
-            # Get clean text
-            clean_text = soup.get_text(separator=' ', strip=True)
+            # Parse HTML content from RSS, dropping unwanted tags
+            clean_text, _ = _html_text(content, ['script', 'style', 'img', 'video'], separator=' ', strip=True)
             
             return {
                 'content': clean_text,
@@ -1,20 +1,122 @@
 """
-Vector embedding generation using sentence-transformers.
+Vector embedding generation using fastembed (ONNX Runtime) or sentence-transformers.
 Creates embeddings for semantic search and similarity matching.
 """
 import os
+import hashlib
 import logging
 from typing import List, Optional
 import numpy as np
 
+from app.cache import get_redis_client
+
+try:
+    from fastembed import TextEmbedding
+except ImportError:
+    # Fallback to sentence-transformers (PyTorch) if fastembed is not installed
+    TextEmbedding = None
+
 try:
     from sentence_transformers import SentenceTransformer
 except ImportError:
     SentenceTransformer = None
-    logging.warning("sentence-transformers not installed. Embeddings will not work.")
+    if TextEmbedding is None:
+        logging.warning("Neither fastembed nor sentence-transformers installed. Embeddings will not work.")
 
 logger = logging.getLogger(__name__)
 
+# Embedding backend: "auto" prefers fastembed's ONNX Runtime models over
+# PyTorch sentence-transformers; "fastembed" / "sentence-transformers" force one
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'auto')
+
+# Vectors cached in Redis by model + SHA256 of the (truncated) input text, as
+# raw float16 bytes, so duplicate text never goes through the model twice
+# ("norm": entries written since vectors are L2-normalized at encode time)
+EMBEDDING_CACHE_PREFIX = "emb:norm:"
+EMBEDDING_CACHE_TTL = 30 * 86400
+
+# Characters of input text passed to the model (and hashed for the cache key)
+MAX_EMBED_CHARS = 5000
+
+# Embeddings are handed out (and stored in the halfvec column) as float16;
+# similarity math upcasts to float32 once per vector or candidate matrix
+EMBEDDING_DTYPE = np.float16
+
+
+def _as_array(embedding) -> np.ndarray:
+    """float32 vector from a list, an array, or raw float16 bytes."""
+    if isinstance(embedding, (bytes, bytearray, memoryview)):
+        return np.frombuffer(embedding, dtype=EMBEDDING_DTYPE).astype(np.float32)
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def _as_matrix(embeddings) -> np.ndarray:
+    """float32 (n, dim) matrix from lists/arrays or raw float16 bytes, in one conversion."""
+    if len(embeddings) and isinstance(embeddings[0], (bytes, bytearray, memoryview)):
+        flat = np.frombuffer(b"".join(embeddings), dtype=EMBEDDING_DTYPE)
+        return flat.reshape(len(embeddings), -1).astype(np.float32)
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+class _FastEmbedModel:
+    """
+    fastembed TextEmbedding behind the subset of the SentenceTransformer
+    API used here (encode and the embedding dimension).
+    """
+    
+    def __init__(self, model_name: str):
+        # fastembed names models by their Hugging Face id
+        if '/' not in model_name:
+            model_name = f"sentence-transformers/{model_name}"
+        self.model = TextEmbedding(model_name)
+        self.dimension = len(next(iter(self.model.embed(["dimension probe"]))))
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+    
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """Embed one text (1-D result) or a list of texts (2-D result)."""
+        if isinstance(texts, str):
+            return self.encode([texts], batch_size, normalize_embeddings)[0]
+        embeddings = np.stack(list(self.model.embed(texts, batch_size=batch_size)))
+        if normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+
+def _load_model(model_name: str):
+    """Load `model_name` on the configured backend."""
+    use_fastembed = EMBEDDING_BACKEND == 'fastembed' or (
+        EMBEDDING_BACKEND == 'auto' and TextEmbedding is not None
+    )
+    if use_fastembed:
+        if TextEmbedding is None:
+            raise ImportError("fastembed package is required for EMBEDDING_BACKEND=fastembed")
+        return _FastEmbedModel(model_name)
+    if SentenceTransformer is None:
+        raise ImportError("fastembed or sentence-transformers package is required for embeddings")
+    return SentenceTransformer(model_name)
+
+
+def normalize_embeddings(embeddings) -> np.ndarray:
+    """
+    Stack embeddings into a contiguous, L2-normalized float32 (n, dim) matrix.
+    
+    Build this once for a candidate set and pass it to find_similar() with
+    normalized=True, so repeated queries skip the conversion and norms.
+    
+    Args:
+        embeddings: Lists, arrays or float16 bytes, or an (n, dim) array
+    
+    Returns:
+        Row-normalized matrix (all-zero rows are left as zeros)
+    """
+    matrix = np.array(_as_matrix(embeddings), dtype=np.float32, order="C")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
 
 class EmbeddingGenerator:
     """Generate vector embeddings for semantic search"""
@@ -27,20 +129,54 @@ class EmbeddingGenerator:
             model_name: Name of sentence-transformers model
                        (default: all-MiniLM-L6-v2, 384 dimensions)
         """
-        if SentenceTransformer is None:
-            raise ImportError("sentence-transformers package is required for embeddings")
-        
         self.model_name = model_name or os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
         
         try:
-            self.model = SentenceTransformer(self.model_name)
+            self.model = _load_model(self.model_name)
             self.dimension = self.model.get_sentence_embedding_dimension()
-            logger.info(f"Initialized embedding model: {self.model_name} ({self.dimension} dimensions)")
+            logger.info(
+                f"Initialized embedding model: {self.model_name} ({self.dimension} dimensions, "
+                f"{type(self.model).__name__})"
+            )
         except Exception as e:
             logger.error(f"Failed to load embedding model {self.model_name}: {e}")
             raise
+        
+        # Vector cache; embeddings are still computed (uncached) if Redis is down
+        try:
+            self.cache = get_redis_client()
+        except Exception as e:
+            logger.warning(f"Embedding cache disabled, Redis unavailable: {e}")
+            self.cache = None
+    
+    def _cache_key(self, text: str) -> str:
+        """Redis key for the embedding of already-truncated text."""
+        return f"{EMBEDDING_CACHE_PREFIX}{self.model_name}:{hashlib.sha256(text.encode()).hexdigest()}"
     
-    def generate_embedding(self, text: str) -> Optional[List[float]]:
+    def _get_cached(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached vectors for texts (None for misses), fetched with one MGET."""
+        if self.cache is None:
+            return [None] * len(texts)
+        raws = self.cache.get_many([self._cache_key(text) for text in texts], raw=True)
+        return [
+            np.frombuffer(raw, dtype=EMBEDDING_DTYPE)
+            if raw is not None and len(raw) == self.dimension * 2 else None
+            for raw in raws
+        ]
+    
+    def _set_cached(self, texts: List[str], embeddings) -> None:
+        """Store freshly computed vectors as float16 bytes in one pipeline."""
+        if self.cache is None or not texts:
+            return
+        self.cache.set_many(
+            {
+                self._cache_key(text): np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+                for text, embedding in zip(texts, embeddings)
+            },
+            EMBEDDING_CACHE_TTL,
+        )
+    
+    def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """
         Generate embedding vector for a single text.
         
@@ -48,7 +184,7 @@ class EmbeddingGenerator:
             text: Text to embed
         
         Returns:
-            List of floats representing the embedding, or None if failed
+            L2-normalized float16 array of the embedding, or None if failed
         """
         try:
             if not text or not text.strip():
@@ -56,30 +192,35 @@ class EmbeddingGenerator:
                 return None
             
             # Truncate if too long (model has max sequence length)
-            max_chars = 5000  # Safe limit for most models
-            if len(text) > max_chars:
-                text = text[:max_chars]
-                logger.debug(f"Text truncated to {max_chars} characters for embedding")
+            if len(text) > MAX_EMBED_CHARS:
+                text = text[:MAX_EMBED_CHARS]
+                logger.debug(f"Text truncated to {MAX_EMBED_CHARS} characters for embedding")
             
-            # Generate embedding
-            embedding = self.model.encode(text, convert_to_numpy=True)
+            cached = self._get_cached([text])[0]
+            if cached is not None:
+                return cached
             
-            # Convert to list
-            return embedding.tolist()
+            # Generate embedding
+            embedding = self.model.encode(
+                text, convert_to_numpy=True, normalize_embeddings=True
+            ).astype(EMBEDDING_DTYPE)
+            self._set_cached([text], [embedding])
+            return embedding
         
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             return None
     
-    def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+    def generate_embeddings_batch(self, texts: List[str], batch_size: int = 32) -> List[Optional[np.ndarray]]:
         """
         Generate embeddings for multiple texts (more efficient than one-by-one).
         
         Args:
             texts: List of texts to embed
+            batch_size: Texts per forward pass
         
         Returns:
-            List of embedding vectors (same order as input)
+            List of L2-normalized float16 embedding arrays (same order as input)
         """
         try:
             if not texts:
@@ -90,21 +231,34 @@ class EmbeddingGenerator:
             valid_indices = []
             for i, text in enumerate(texts):
                 if text and text.strip():
-                    valid_texts.append(text[:5000])  # Truncate
+                    valid_texts.append(text[:MAX_EMBED_CHARS])  # Truncate
                     valid_indices.append(i)
             
             if not valid_texts:
                 logger.warning("No valid texts to embed")
                 return [None] * len(texts)
             
-            # Generate embeddings in batch
-            embeddings = self.model.encode(valid_texts, convert_to_numpy=True, show_progress_bar=False)
-            
-            # Map back to original order
+            # Only texts without a cached vector go through the model
             result = [None] * len(texts)
-            for i, embedding in zip(valid_indices, embeddings):
-                result[i] = embedding.tolist()
+            miss_texts = []
+            miss_indices = []
+            for i, text, cached in zip(valid_indices, valid_texts, self._get_cached(valid_texts)):
+                if cached is not None:
+                    result[i] = cached
+                else:
+                    miss_texts.append(text)
+                    miss_indices.append(i)
+            
+            if miss_texts:
+                embeddings = self.model.encode(
+                    miss_texts, batch_size=batch_size, convert_to_numpy=True,
+                    normalize_embeddings=True, show_progress_bar=False,
+                ).astype(EMBEDDING_DTYPE)
+                self._set_cached(miss_texts, embeddings)
+                for i, embedding in zip(miss_indices, embeddings):
+                    result[i] = embedding
             
+            logger.debug(f"Embedded {len(miss_texts)} texts, {len(valid_texts) - len(miss_texts)} from cache")
             return result
         
         except Exception as e:
@@ -116,15 +270,15 @@ class EmbeddingGenerator:
         Compute cosine similarity between two embeddings.
         
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First embedding vector (list, array or float16 bytes)
+            embedding2: Second embedding vector (list, array or float16 bytes)
         
         Returns:
             Similarity score between -1 and 1 (higher = more similar)
         """
         try:
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
+            vec1 = _as_array(embedding1)
+            vec2 = _as_array(embedding2)
             
             # Cosine similarity
             similarity = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
@@ -138,30 +292,41 @@ class EmbeddingGenerator:
         self, 
         query_embedding: List[float], 
         candidate_embeddings: List[List[float]], 
-        top_k: int = 5
+        top_k: int = 5,
+        normalized: bool = False
     ) -> List[tuple]:
         """
         Find most similar embeddings to a query.
         
         Args:
             query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embeddings
+            candidate_embeddings: List of candidate embeddings, or a matrix
+                                  from normalize_embeddings()
             top_k: Number of top similar embeddings to return
+            normalized: Candidates are already unit length (a normalize_embeddings()
+                        matrix, or vectors from this generator), so their norms
+                        are not recomputed
         
         Returns:
             List of (index, similarity_score) tuples, sorted by similarity (descending)
         """
         try:
-            query_vec = np.array(query_embedding)
-            candidates = np.array(candidate_embeddings)
+            if normalized:
+                candidates = _as_matrix(candidate_embeddings)
+            else:
+                candidates = normalize_embeddings(candidate_embeddings)
+            query_vec = _as_array(query_embedding)
+            query_vec = query_vec / np.linalg.norm(query_vec)
             
-            # Compute similarities
-            similarities = np.dot(candidates, query_vec) / (
-                np.linalg.norm(candidates, axis=1) * np.linalg.norm(query_vec)
-            )
+            # Cosine similarity is a single matrix-vector product on unit vectors
+            similarities = candidates @ query_vec
             
-            # Get top k indices
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
+            # Partial selection of the top k (O(n)), then sort just those
+            top_k = min(top_k, len(similarities))
+            if top_k <= 0:
+                return []
+            top_indices = np.argpartition(similarities, -top_k)[-top_k:]
+            top_indices = top_indices[np.argsort(similarities[top_indices])[::-1]]
             
             # Return (index, score) pairs
             return [(int(idx), float(similarities[idx])) for idx in top_indices]
@@ -0,0 +1,156 @@
+"""
+Response cache for LLM summaries.
+
+Two tiers sit in front of the Gemini call:
+  1. Exact: SHA-256 of (model, system prompt, title, content) -> the stored
+     summary, so re-ingested articles never reach the API twice.
+  2. Semantic: the embedding of the first SEMANTIC_PREFIX_CHARS of content
+     is compared with the most recent SEMANTIC_INDEX_SIZE cached articles;
+     a cosine similarity at or above `sim_threshold` reuses that summary
+     (reposts, mirrored RSS items).
+
+Summaries are generated at temperature 0.3, so a fresh call could phrase
+the same facts differently; serving a cached summary trades that variation
+for no latency and no tokens. The semantic tier can also return the
+summary of a slightly different article. Raise `sim_threshold` (or pass no
+embedder, which disables the tier) if that matters more than cost.
+
+The deployed Redis has no search module, so the semantic index is a
+bounded hash of float16 vectors scored in-process with numpy instead of an
+FT.SEARCH vector index.
+"""
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.processing.embeddings import EMBEDDING_DTYPE
+
+logger = logging.getLogger(__name__)
+
+# Exact-match entries, the semantic index (hash of key -> vector plus a
+# sorted set ordering keys by insertion time) and hit/miss counters
+LLM_CACHE_PREFIX = "llm:sum:"
+LLM_CACHE_INDEX_KEY = "llm:sum:index"
+LLM_CACHE_ORDER_KEY = "llm:sum:index:order"
+LLM_CACHE_STATS_KEY = "llm:sum:stats"
+
+# Most articles kept in the semantic index, and how much of each article's
+# content is embedded for it
+SEMANTIC_INDEX_SIZE = 1000
+SEMANTIC_PREFIX_CHARS = 2048
+
+
+class LLMCache:
+    """Exact and semantic cache of summarize() results in Redis."""
+
+    def __init__(self, redis, embedder=None, ttl: int = 86400, sim_threshold: float = 0.92):
+        """
+        Args:
+            redis: RedisClient to store entries in
+            embedder: EmbeddingGenerator for the semantic tier (None for exact matches only)
+            ttl: Seconds a cached summary is kept
+            sim_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.redis = redis
+        self.embedder = embedder
+        self.ttl = ttl
+        self.sim_threshold = sim_threshold
+
+    @staticmethod
+    def make_key(model_name: str, system_prompt: str, title: Optional[str], content: str) -> str:
+        """Exact-match key for one summarization request."""
+        payload = json.dumps({"m": model_name, "sys": system_prompt, "t": title, "c": content}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _embed(self, content: str) -> Optional[np.ndarray]:
+        """Unit-length float16 embedding of the start of the content, or None."""
+        if self.embedder is None or not content:
+            return None
+        return self.embedder.generate_embedding(content[:SEMANTIC_PREFIX_CHARS])
+
+    def _count(self, field: str) -> None:
+        try:
+            self.redis.client.hincrby(LLM_CACHE_STATS_KEY, field, 1)
+        except Exception as e:
+            logger.debug(f"LLM cache stats not recorded: {e}")
+
+    def get(self, key: str, content: str) -> Optional[Dict]:
+        """
+        Look up a cached summary, exact match first.
+
+        Args:
+            key: make_key() for the request
+            content: Article content, embedded for the semantic lookup
+
+        Returns:
+            Cached summary dict, or None on a miss
+        """
+        try:
+            cached = self.redis.get(f"{LLM_CACHE_PREFIX}{key}")
+            if isinstance(cached, dict):
+                self._count("hits_exact")
+                return cached
+
+            vector = self._embed(content)
+            if vector is not None:
+                index = self.redis.client.hgetall(LLM_CACHE_INDEX_KEY)
+                dimension = len(vector) * np.dtype(EMBEDDING_DTYPE).itemsize
+                index = {k: v for k, v in index.items() if len(v) == dimension}
+                if index:
+                    keys = list(index)
+                    matrix = np.frombuffer(b"".join(index[k] for k in keys), dtype=EMBEDDING_DTYPE)
+                    scores = matrix.reshape(len(keys), -1).astype(np.float32) @ vector.astype(np.float32)
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.sim_threshold:
+                        match_key = keys[best].decode() if isinstance(keys[best], bytes) else keys[best]
+                        cached = self.redis.get(f"{LLM_CACHE_PREFIX}{match_key}")
+                        if isinstance(cached, dict):
+                            logger.info(f"LLM cache semantic hit (similarity {scores[best]:.3f})")
+                            self._count("hits_semantic")
+                            return cached
+        except Exception as e:
+            logger.error(f"Error reading LLM cache: {e}")
+        self._count("misses")
+        return None
+
+    def set(self, key: str, content: str, result: Dict) -> None:
+        """
+        Store a fresh summary under its exact key and in the semantic index.
+
+        Args:
+            key: make_key() for the request
+            content: Article content, embedded for the semantic index
+            result: summarize() result
+        """
+        try:
+            self.redis.set(f"{LLM_CACHE_PREFIX}{key}", result, self.ttl)
+            vector = self._embed(content)
+            if vector is None:
+                return
+            pipe = self.redis.client.pipeline(transaction=False)
+            pipe.hset(LLM_CACHE_INDEX_KEY, key, np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes())
+            pipe.zadd(LLM_CACHE_ORDER_KEY, {key: time.time()})
+            # Oldest keys beyond the index size, dropped below
+            pipe.zrange(LLM_CACHE_ORDER_KEY, 0, -(SEMANTIC_INDEX_SIZE + 1))
+            evicted = pipe.execute()[-1]
+            if evicted:
+                pipe = self.redis.client.pipeline(transaction=False)
+                pipe.hdel(LLM_CACHE_INDEX_KEY, *evicted)
+                pipe.zrem(LLM_CACHE_ORDER_KEY, *evicted)
+                pipe.execute()
+        except Exception as e:
+            logger.error(f"Error writing LLM cache: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Exact hits, semantic hits and misses counted so far."""
+        try:
+            stats = self.redis.client.hgetall(LLM_CACHE_STATS_KEY)
+        except Exception as e:
+            logger.error(f"Error reading LLM cache stats: {e}")
+            stats = {}
+        fields = {k.decode() if isinstance(k, bytes) else k: int(v) for k, v in stats.items()}
+        return {name: fields.get(name, 0) for name in ("hits_exact", "hits_semantic", "misses")}
@@ -2,15 +2,118 @@
 LLM-based summarization service using Google Gemini.
 Generates concise summaries and key points from article content.
 """
+import asyncio
 import os
 import logging
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, retry, stop_after_attempt, wait_exponential
 import json
 
+from app.processing.llm_cache import LLMCache
+
 logger = logging.getLogger(__name__)
 
+# Gemini requests summarize_batch() keeps in flight at once by default
+SUMMARIZE_BATCH_CONCURRENCY = 8
+
+# Truncate content past this many characters (~6000 tokens)
+MAX_CONTENT_CHARS = 25000
+
+# Articles summarize_packed() sends per Gemini request. The content budget
+# (MAX_CONTENT_CHARS) is split between them; the output budget is
+# PACKED_OUTPUT_TOKENS per article
+PACK_SIZE = 5
+PACKED_OUTPUT_TOKENS = 1024
+
+# Sampling settings for every summarization model
+GENERATION_CONFIG = {
+    "temperature": 0.3,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 1024,
+}
+
+# Process-wide Gemini state. genai.configure() is global, so it runs only
+# when the API key changes, and one GenerativeModel is kept per (API key,
+# model, generation config). The models' async (grpc.aio) clients are bound
+# to the loop they were first used on, so the *_sync() batch wrappers of
+# every summarizer share one event loop instead of a fresh asyncio.run()
+_models: Dict[tuple, genai.GenerativeModel] = {}
+_models_lock = threading.Lock()
+_configured_api_key: Optional[str] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_model(api_key: str, model_name: str, generation_config: Dict) -> genai.GenerativeModel:
+    """Configure Gemini and build (or reuse) the GenerativeModel for these settings."""
+    global _configured_api_key
+    key = (api_key, model_name, tuple(sorted(generation_config.items())))
+    model = _models.get(key)
+    if model is None:
+        with _models_lock:
+            if _configured_api_key != api_key:
+                genai.configure(api_key=api_key)
+                _configured_api_key = api_key
+            model = _models.get(key)
+            if model is None:
+                model = _models[key] = genai.GenerativeModel(model_name, generation_config=dict(generation_config))
+    return model
+
+
+def _run_on_summarizer_loop(coro):
+    """Run a coroutine to completion on the shared summarizer event loop (one run at a time)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+        return _loop.run_until_complete(coro)
+
+
+def parse_packed_summaries(response_text: str, count: int, model_name: str) -> List[Optional[Dict[str, any]]]:
+    """
+    Parse a packed-summary response into one summary dict per article.
+    
+    Accepts a bare JSON array or one wrapped in a markdown code fence.
+    
+    Args:
+        response_text: Model output, a JSON array of {"id", "summary", "key_points"} objects
+        count: Number of articles in the request (ids run from 1 to count)
+        model_name: Recorded as each result's 'model'
+    
+    Returns:
+        Summary dicts in article order; None where the model skipped an article
+    
+    Raises:
+        ValueError: If the response is not a JSON array
+    """
+    text = response_text.strip()
+    if text.startswith("```"):
+        text = text[text.find("\n") + 1:text.rfind("```")]
+    items = json.loads(text)
+    if not isinstance(items, list):
+        raise ValueError(f"Expected a JSON array, got {type(items).__name__}")
+    
+    results: List[Optional[Dict[str, any]]] = [None] * count
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        summary = item.get("summary")
+        if 0 <= index < count and isinstance(summary, str) and summary.strip():
+            key_points = item.get("key_points")
+            results[index] = {
+                'summary': summary.strip(),
+                'key_points': key_points if isinstance(key_points, list) else [],
+                'model': model_name,
+            }
+    return results
+
 
 class LLMSummarizer:
     """Generate summaries using LLM APIs (Gemini)"""
@@ -31,46 +134,132 @@ Return your response as JSON with this exact structure:
     "key_points": ["point 1", "point 2", "point 3"]
 }"""
     
-    def __init__(self, provider: str = 'gemini', model: str = None):
+    def __init__(self, provider: str = 'gemini', model: str = None, cache: Optional[LLMCache] = None):
         """
         Initialize LLM summarizer.
         
         Args:
             provider: LLM provider ('gemini' or 'claude')
             model: Specific model to use (default from env)
+            cache: Response cache checked before calling the LLM (optional)
         """
         self.provider = provider
         self.model_name = model or os.getenv('GEMINI_MODEL', 'models/gemini-2.5-flash')
+        self.cache = cache
         
         if provider == 'gemini':
             api_key = os.getenv('GEMINI_API_KEY')
             if not api_key:
                 raise ValueError("GEMINI_API_KEY not found in environment variables")
             
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(
-                self.model_name,
-                generation_config={
-                    "temperature": 0.3,
-                    "top_p": 0.95,
-                    "top_k": 40,
-                    "max_output_tokens": 1024,
-                }
-            )
+            # Shared per process; configure() and model setup run once
+            self.model = _get_model(api_key, self.model_name, GENERATION_CONFIG)
             logger.info(f"Initialized Gemini LLM with model: {self.model_name}")
         else:
             raise ValueError(f"Unsupported provider: {provider}")
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def _call_gemini(self, prompt: str) -> str:
-        """Call Gemini API with retry logic"""
+    def _call_gemini(self, prompt: str, **kwargs) -> str:
+        """Call Gemini API with retry logic (kwargs go to generate_content())"""
         try:
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(prompt, **kwargs)
             return response.text
         except Exception as e:
             logger.error(f"Gemini API call failed: {e}")
             raise
     
+    async def _call_gemini_async(self, prompt: str, **kwargs) -> str:
+        """Call Gemini's async API with the same retry policy as _call_gemini()"""
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), reraise=True,
+        ):
+            with attempt:
+                try:
+                    response = await self.model.generate_content_async(prompt, **kwargs)
+                    return response.text
+                except Exception as e:
+                    logger.error(f"Gemini API call failed: {e}")
+                    raise
+    
+    def _build_prompt(self, content: str, title: str = None) -> str:
+        """Combine the system prompt with the (truncated) article."""
+        # Truncate content if too long (Gemini has token limits)
+        if len(content) > MAX_CONTENT_CHARS:
+            content = content[:MAX_CONTENT_CHARS] + "..."
+            logger.warning(f"Content truncated to {MAX_CONTENT_CHARS} characters")
+        
+        # Build prompt
+        user_prompt = f"""Analyze and summarize the following article:
+
+Title: {title if title else 'N/A'}
+
+Content:
+{content}
+
+Provide a JSON response with the summary and key points."""
+        
+        # Combine system and user prompts
+        return f"{self.SYSTEM_PROMPT}\n\n{user_prompt}"
+    
+    def _build_packed_prompt(self, articles: List[Dict[str, str]]) -> str:
+        """One prompt asking for a JSON array of summaries, one per article."""
+        max_chars = MAX_CONTENT_CHARS // len(articles)
+        sections = []
+        for number, article in enumerate(articles, 1):
+            content = article.get('content', '')
+            if len(content) > max_chars:
+                content = content[:max_chars] + "..."
+            sections.append(f"[{number}] Title: {article.get('title') or 'N/A'}\nContent:\n{content}")
+        
+        count = len(articles)
+        user_prompt = (
+            f"Summarize each of the following {count} articles. Instead of a single object, "
+            f"return a JSON array of {count} objects in article order, each with the structure "
+            f'above plus the article number: {{"id": 1, "summary": "...", "key_points": ["..."]}}\n\n'
+            + "\n\n".join(sections)
+        )
+        return f"{self.SYSTEM_PROMPT}\n\n{user_prompt}"
+    
+    def _parse_response(self, response_text: str) -> Dict[str, any]:
+        """Parse Gemini's reply into 'summary', 'key_points' and 'model'."""
+        try:
+            # Try to extract JSON from response
+            # Sometimes the model wraps JSON in markdown code blocks
+            if '```json' in response_text:
+                json_start = response_text.find('{')
+                json_end = response_text.rfind('}') + 1
+                json_str = response_text[json_start:json_end]
+                result = json.loads(json_str)
+            elif '{' in response_text:
+                json_start = response_text.find('{')
+                json_end = response_text.rfind('}') + 1
+                json_str = response_text[json_start:json_end]
+                result = json.loads(json_str)
+            else:
+                # Fallback: treat entire response as summary
+                result = {
+                    'summary': response_text.strip(),
+                    'key_points': []
+                }
+            
+            # Validate structure
+            if 'summary' not in result:
+                result['summary'] = response_text.strip()
+            if 'key_points' not in result:
+                result['key_points'] = []
+            
+            result['model'] = self.model_name
+            return result
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            # Return response as plain summary
+            return {
+                'summary': response_text.strip(),
+                'key_points': [],
+                'model': self.model_name
+            }
+    
     def summarize(self, content: str, title: str = None) -> Optional[Dict[str, any]]:
         """
         Generate summary and key points from content.
@@ -83,90 +272,220 @@ Return your response as JSON with this exact structure:
             Dict with 'summary', 'key_points', and 'model' or None if failed
         """
         try:
-            # Truncate content if too long (Gemini has token limits)
-            max_chars = 25000  # ~6000 tokens
-            if len(content) > max_chars:
-                content = content[:max_chars] + "..."
-                logger.warning(f"Content truncated to {max_chars} characters")
-            
-            # Build prompt
-            user_prompt = f"""Analyze and summarize the following article:
-
-Title: {title if title else 'N/A'}
-
-Content:
-{content}
-
-Provide a JSON response with the summary and key points."""
-            
-            # Combine system and user prompts
-            full_prompt = f"{self.SYSTEM_PROMPT}\n\n{user_prompt}"
+            if self.cache is not None:
+                key = LLMCache.make_key(self.model_name, self.SYSTEM_PROMPT, title, content)
+                cached = self.cache.get(key, content)
+                if cached is not None:
+                    return cached
             
             # Call API with retry
-            response_text = self._call_gemini(full_prompt)
-            
-            # Parse JSON response
-            try:
-                # Try to extract JSON from response
-                # Sometimes the model wraps JSON in markdown code blocks
-                if '```json' in response_text:
-                    json_start = response_text.find('{')
-                    json_end = response_text.rfind('}') + 1
-                    json_str = response_text[json_start:json_end]
-                    result = json.loads(json_str)
-                elif '{' in response_text:
-                    json_start = response_text.find('{')
-                    json_end = response_text.rfind('}') + 1
-                    json_str = response_text[json_start:json_end]
-                    result = json.loads(json_str)
-                else:
-                    # Fallback: treat entire response as summary
-                    result = {
-                        'summary': response_text.strip(),
-                        'key_points': []
-                    }
-                
-                # Validate structure
-                if 'summary' not in result:
-                    result['summary'] = response_text.strip()
-                if 'key_points' not in result:
-                    result['key_points'] = []
-                
-                result['model'] = self.model_name
-                return result
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                # Return response as plain summary
-                return {
-                    'summary': response_text.strip(),
-                    'key_points': [],
-                    'model': self.model_name
-                }
+            result = self._parse_response(self._call_gemini(self._build_prompt(content, title)))
+            if self.cache is not None:
+                self.cache.set(key, content, result)
+            return result
+        except Exception as e:
+            logger.error(f"Summarization failed: {e}")
+            return None
+    
+    async def summarize_async(self, content: str, title: str = None) -> Optional[Dict[str, any]]:
+        """
+        Async counterpart of summarize(), using Gemini's async client.
         
+        Args:
+            content: Article content to summarize
+            title: Optional article title for context
+        
+        Returns:
+            Dict with 'summary', 'key_points', and 'model' or None if failed
+        """
+        try:
+            # Cache lookups block (Redis, embedding model), so run them off the loop
+            if self.cache is not None:
+                key = LLMCache.make_key(self.model_name, self.SYSTEM_PROMPT, title, content)
+                cached = await asyncio.to_thread(self.cache.get, key, content)
+                if cached is not None:
+                    return cached
+            
+            result = self._parse_response(await self._call_gemini_async(self._build_prompt(content, title)))
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, key, content, result)
+            return result
         except Exception as e:
             logger.error(f"Summarization failed: {e}")
             return None
     
-    def summarize_batch(self, articles: List[Dict[str, str]]) -> List[Optional[Dict[str, any]]]:
+    async def summarize_batch(
+        self, articles: List[Dict[str, str]], concurrency: int = SUMMARIZE_BATCH_CONCURRENCY
+    ) -> List[Optional[Dict[str, any]]]:
         """
-        Summarize multiple articles.
+        Summarize multiple articles concurrently.
+        
+        At most `concurrency` Gemini requests are in flight at once, to stay
+        under the API key's requests-per-minute quota.
         
         Args:
             articles: List of dicts with 'content' and optional 'title'
+            concurrency: Maximum concurrent Gemini requests
         
         Returns:
             List of summary dicts (same order as input)
         """
-        results = []
-        for article in articles:
-            content = article.get('content', '')
-            title = article.get('title')
-            summary = self.summarize(content, title)
-            results.append(summary)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def summarize_one(article: Dict[str, str]) -> Optional[Dict[str, any]]:
+            async with semaphore:
+                return await self.summarize_async(article.get('content', ''), article.get('title'))
+        
+        return await asyncio.gather(*(summarize_one(article) for article in articles))
+    
+    def summarize_batch_sync(
+        self, articles: List[Dict[str, str]], concurrency: int = SUMMARIZE_BATCH_CONCURRENCY
+    ) -> List[Optional[Dict[str, any]]]:
+        """
+        Synchronous wrapper around summarize_batch() for RQ workers.
+        
+        Runs on the shared summarizer event loop rather than a fresh
+        asyncio.run(): the model's async (grpc.aio) client is bound to the
+        loop it was first used on.
         
+        Args:
+            articles: List of dicts with 'content' and optional 'title'
+            concurrency: Maximum concurrent Gemini requests
+        
+        Returns:
+            List of summary dicts (same order as input)
+        """
+        return _run_on_summarizer_loop(self.summarize_batch(articles, concurrency))
+    
+    def _cache_lookup(self, articles: List[Dict[str, str]]) -> Tuple[List, List]:
+        """Cache keys and cached results (None for misses) for each article."""
+        if self.cache is None:
+            return [None] * len(articles), [None] * len(articles)
+        keys = [
+            LLMCache.make_key(self.model_name, self.SYSTEM_PROMPT, article.get('title'), article.get('content', ''))
+            for article in articles
+        ]
+        return keys, [self.cache.get(key, article.get('content', '')) for key, article in zip(keys, articles)]
+    
+    def _pack_request(self, pack: List[Dict[str, str]]) -> Tuple[str, Dict]:
+        """Prompt and generate_content() kwargs for one packed request."""
+        return (
+            self._build_packed_prompt(pack),
+            {"generation_config": {"max_output_tokens": PACKED_OUTPUT_TOKENS * len(pack)}},
+        )
+    
+    def summarize_packed(
+        self, articles: List[Dict[str, str]], pack_size: int = PACK_SIZE
+    ) -> List[Optional[Dict[str, any]]]:
+        """
+        Summarize articles `pack_size` at a time, one Gemini request per pack.
+        
+        Packing divides the request count (the binding limit under an RPM
+        quota) by `pack_size` and sends SYSTEM_PROMPT once per pack. Cached
+        articles are not sent; articles the packed reply misses or garbles
+        are summarized individually.
+        
+        Args:
+            articles: List of dicts with 'content' and optional 'title'
+            pack_size: Articles per request
+        
+        Returns:
+            List of summary dicts (same order as input)
+        """
+        keys, results = self._cache_lookup(articles)
+        pending = [index for index, result in enumerate(results) if result is None]
+        
+        for start in range(0, len(pending), pack_size):
+            indices = pending[start:start + pack_size]
+            pack = [articles[index] for index in indices]
+            try:
+                prompt, kwargs = self._pack_request(pack)
+                packed = parse_packed_summaries(self._call_gemini(prompt, **kwargs), len(pack), self.model_name)
+            except Exception as e:
+                logger.error(f"Packed summarization failed, falling back per article: {e}")
+                packed = [None] * len(pack)
+            
+            for index, article, result in zip(indices, pack, packed):
+                if result is None:
+                    results[index] = self.summarize(article.get('content', ''), article.get('title'))
+                else:
+                    results[index] = result
+                    if self.cache is not None:
+                        self.cache.set(keys[index], article.get('content', ''), result)
         return results
     
+    async def summarize_packed_async(
+        self,
+        articles: List[Dict[str, str]],
+        pack_size: int = PACK_SIZE,
+        concurrency: int = SUMMARIZE_BATCH_CONCURRENCY,
+    ) -> List[Optional[Dict[str, any]]]:
+        """
+        Async counterpart of summarize_packed(), with packs sent concurrently.
+        
+        Args:
+            articles: List of dicts with 'content' and optional 'title'
+            pack_size: Articles per request
+            concurrency: Maximum concurrent Gemini requests
+        
+        Returns:
+            List of summary dicts (same order as input)
+        """
+        keys, results = await asyncio.to_thread(self._cache_lookup, articles)
+        pending = [index for index, result in enumerate(results) if result is None]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def summarize_one(index: int) -> None:
+            article = articles[index]
+            async with semaphore:
+                results[index] = await self.summarize_async(article.get('content', ''), article.get('title'))
+        
+        async def summarize_pack(indices: List[int]) -> None:
+            pack = [articles[index] for index in indices]
+            try:
+                prompt, kwargs = self._pack_request(pack)
+                async with semaphore:
+                    response_text = await self._call_gemini_async(prompt, **kwargs)
+                packed = parse_packed_summaries(response_text, len(pack), self.model_name)
+            except Exception as e:
+                logger.error(f"Packed summarization failed, falling back per article: {e}")
+                packed = [None] * len(pack)
+            
+            fallbacks = []
+            for index, article, result in zip(indices, pack, packed):
+                if result is None:
+                    fallbacks.append(summarize_one(index))
+                else:
+                    results[index] = result
+                    if self.cache is not None:
+                        await asyncio.to_thread(self.cache.set, keys[index], article.get('content', ''), result)
+            await asyncio.gather(*fallbacks)
+        
+        await asyncio.gather(*(
+            summarize_pack(pending[start:start + pack_size])
+            for start in range(0, len(pending), pack_size)
+        ))
+        return results
+    
+    def summarize_packed_sync(
+        self,
+        articles: List[Dict[str, str]],
+        pack_size: int = PACK_SIZE,
+        concurrency: int = SUMMARIZE_BATCH_CONCURRENCY,
+    ) -> List[Optional[Dict[str, any]]]:
+        """
+        Synchronous wrapper around summarize_packed_async() for RQ workers.
+        
+        Args:
+            articles: List of dicts with 'content' and optional 'title'
+            pack_size: Articles per request
+            concurrency: Maximum concurrent Gemini requests
+        
+        Returns:
+            List of summary dicts (same order as input)
+        """
+        return _run_on_summarizer_loop(self.summarize_packed_async(articles, pack_size, concurrency))
+    
     def get_rate_limit_status(self) -> Dict[str, any]:
         """Get current rate limit status (if supported by provider)"""
         # Gemini doesn't provide rate limit info via API
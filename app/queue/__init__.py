@@ -1,4 +1,4 @@
 """Queue package for AI News Aggregator."""
-from app.queue.client import MessageQueue, get_message_queue
+from app.queue.client import MessageQueue, get_message_queue, get_redis
 
-__all__ = ["MessageQueue", "get_message_queue"]
+__all__ = ["MessageQueue", "get_message_queue", "get_redis"]
@@ -3,13 +3,65 @@ Message queue client using Redis Queue (RQ).
 Manages article processing pipeline through queue system.
 """
 import os
-from redis import Redis
+import threading
+import time
+from datetime import timedelta
+from redis import ConnectionPool, Redis
+from redis.client import Pipeline
 from rq import Queue
-from typing import Optional
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Articles waiting for a batched embedding job, and the flag marking that a
+# drain job is already queued (expires in case that job is lost)
+EMBEDDING_PENDING_KEY = "embedding:pending"
+EMBEDDING_SCHEDULED_KEY = "embedding:batch_scheduled"
+EMBEDDING_SCHEDULED_TTL = 60
+
+# Articles waiting for a deferred summarization job, the flag marking that
+# one is scheduled, and how long (seconds) it collects articles before
+# running. The flag outlives the delay in case the job is lost.
+SUMMARY_PENDING_KEY = "summarization:pending"
+SUMMARY_SCHEDULED_KEY = "summarization:batch_scheduled"
+SUMMARY_BATCH_DELAY = 60
+SUMMARY_SCHEDULED_TTL = SUMMARY_BATCH_DELAY + 300
+
+# Articles per extract_contents() job when extraction is enqueued in bulk;
+# each job fetches its articles concurrently
+EXTRACTION_BATCH_SIZE = 16
+
+# Connections in the pool shared by every queue, the workers and the
+# scheduler of one process. No socket_timeout: RQ workers block on BLPOP
+# for longer than any sensible read timeout.
+QUEUE_MAX_CONNECTIONS = int(os.getenv('REDIS_QUEUE_MAX_CONNECTIONS', '16'))
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(host: str, port: int) -> ConnectionPool:
+    """
+    Connection pool for the queues on (host, port), created once per process.
+    
+    redis-py resets a pool whose creating PID differs from the current one,
+    so forked RQ job processes open their own connections on first use.
+    """
+    key = (host, port)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                host=host,
+                port=port,
+                max_connections=QUEUE_MAX_CONNECTIONS,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+            )
+            _pools[key] = pool
+        return pool
+
 
 class MessageQueue:
     """
@@ -29,12 +81,9 @@ class MessageQueue:
         self.redis_port = int(redis_port or os.getenv('REDIS_PORT', 6379))
         
         try:
-            # Connect to Redis
-            self.redis_conn = Redis(
-                host=self.redis_host,
-                port=self.redis_port,
-                socket_connect_timeout=5
-            )
+            # All queues share one client on the process-wide pool
+            self.pool = _get_pool(self.redis_host, self.redis_port)
+            self.redis_conn = Redis(connection_pool=self.pool)
             
             # Create queues for different pipeline stages
             self.extraction_queue = Queue('extraction', connection=self.redis_conn)
@@ -47,6 +96,16 @@ class MessageQueue:
             logger.error(f"Failed to initialize message queue: {e}")
             raise
     
+    def pipeline(self) -> Pipeline:
+        """
+        Non-transactional pipeline on the queue connection.
+        
+        Pass it as `pipeline=` to enqueue_summarization() (and queue other
+        commands on it) to send everything in one round trip with
+        pipe.execute().
+        """
+        return self.redis_conn.pipeline(transaction=False)
+    
     def enqueue_extraction(self, article_id: int, **kwargs) -> Optional[str]:
         """
         Enqueue article for content extraction.
@@ -73,13 +132,53 @@ class MessageQueue:
             logger.error(f"Error enqueueing extraction for article {article_id}: {e}")
             return None
     
-    def enqueue_summarization(self, article_id: int, model: str = None, **kwargs) -> Optional[str]:
+    def enqueue_extraction_many(self, article_ids: List[int], **kwargs) -> List[Optional[str]]:
+        """
+        Enqueue several articles for content extraction in one round trip.
+        
+        Articles are grouped into extract_contents() jobs of up to
+        EXTRACTION_BATCH_SIZE, which fetch their pages concurrently, and all
+        jobs are written through a single Redis pipeline via RQ's
+        enqueue_many.
+        
+        Args:
+            article_ids: IDs of articles to extract
+            **kwargs: Additional job parameters (as accepted by Queue.prepare_data)
+        
+        Returns:
+            ID of the job covering each article, in input order; all None if
+            enqueueing failed
+        """
+        if not article_ids:
+            return []
+        try:
+            from app.orchestrator.workers import extract_contents
+            
+            chunks = [
+                article_ids[i:i + EXTRACTION_BATCH_SIZE]
+                for i in range(0, len(article_ids), EXTRACTION_BATCH_SIZE)
+            ]
+            jobs = self.extraction_queue.enqueue_many([
+                Queue.prepare_data(extract_contents, args=(chunk,), timeout='10m', **kwargs)
+                for chunk in chunks
+            ])
+            logger.info(f"Enqueued {len(article_ids)} articles for extraction in {len(jobs)} jobs")
+            return [job.id for job, chunk in zip(jobs, chunks) for _ in chunk]
+        except Exception as e:
+            logger.error(f"Error enqueueing extraction for {len(article_ids)} articles: {e}")
+            return [None] * len(article_ids)
+    
+    def enqueue_summarization(
+        self, article_id: int, model: str = None, pipeline: Pipeline = None, **kwargs
+    ) -> Optional[str]:
         """
         Enqueue article for LLM summarization.
         
         Args:
             article_id: ID of article to summarize
             model: LLM model to use (default: from env)
+            pipeline: Queue the job's Redis commands on this pipeline; they
+                      are sent when the caller executes it
             **kwargs: Additional job parameters
         
         Returns:
@@ -93,6 +192,7 @@ class MessageQueue:
                 article_id,
                 model=model,
                 job_timeout='10m',
+                pipeline=pipeline,
                 **kwargs
             )
             logger.info(f"Enqueued article {article_id} for summarization (job: {job.id})")
@@ -101,6 +201,44 @@ class MessageQueue:
             logger.error(f"Error enqueueing summarization for article {article_id}: {e}")
             return None
     
+    def enqueue_summarization_batched(self, article_ids: List[int]) -> bool:
+        """
+        Queue articles for the next deferred, packed summarization job.
+        
+        For articles that are not needed right away (the digest tolerates
+        delay). The ids are added to a pending set, and if no job is
+        scheduled yet, one is scheduled SUMMARY_BATCH_DELAY seconds out, so
+        articles arriving in that window share packed Gemini requests. Use
+        enqueue_summarization() when an article must be summarized now.
+        Scheduled jobs need a worker started with the RQ scheduler.
+        
+        Args:
+            article_ids: IDs of articles to summarize
+        
+        Returns:
+            True if the articles were queued
+        """
+        if not article_ids:
+            return True
+        try:
+            from app.orchestrator.workers import generate_pending_summaries
+            
+            pipe = self.redis_conn.pipeline(transaction=False)
+            pipe.sadd(SUMMARY_PENDING_KEY, *article_ids)
+            pipe.set(SUMMARY_SCHEDULED_KEY, 1, nx=True, ex=SUMMARY_SCHEDULED_TTL)
+            _, scheduled = pipe.execute()
+            
+            if scheduled:
+                job = self.summarization_queue.enqueue_in(
+                    timedelta(seconds=SUMMARY_BATCH_DELAY), generate_pending_summaries, job_timeout='30m'
+                )
+                logger.info(f"Scheduled deferred summarization job {job.id}")
+            logger.info(f"Queued {len(article_ids)} articles for deferred summarization")
+            return True
+        except Exception as e:
+            logger.error(f"Error queueing deferred summarization for {len(article_ids)} articles: {e}")
+            return False
+    
     def enqueue_embedding(self, article_id: int, **kwargs) -> Optional[str]:
         """
         Enqueue article for embedding generation.
@@ -127,6 +265,40 @@ class MessageQueue:
             logger.error(f"Error enqueueing embedding for article {article_id}: {e}")
             return None
     
+    def enqueue_embedding_batched(self, article_ids: List[int]) -> bool:
+        """
+        Queue articles for the next batched embedding job.
+        
+        The ids are added to a pending set, and a drain job is enqueued only
+        if none is already scheduled, so articles that finish summarization
+        close together are embedded in one forward pass. Use
+        enqueue_embedding() when a single article must be embedded right away.
+        
+        Args:
+            article_ids: IDs of articles to embed
+        
+        Returns:
+            True if the articles were queued
+        """
+        if not article_ids:
+            return True
+        try:
+            from app.orchestrator.workers import generate_pending_embeddings
+            
+            pipe = self.redis_conn.pipeline(transaction=False)
+            pipe.sadd(EMBEDDING_PENDING_KEY, *article_ids)
+            pipe.set(EMBEDDING_SCHEDULED_KEY, 1, nx=True, ex=EMBEDDING_SCHEDULED_TTL)
+            _, scheduled = pipe.execute()
+            
+            if scheduled:
+                job = self.embedding_queue.enqueue(generate_pending_embeddings, job_timeout='10m')
+                logger.info(f"Scheduled batched embedding job {job.id}")
+            logger.info(f"Queued {len(article_ids)} articles for batched embedding")
+            return True
+        except Exception as e:
+            logger.error(f"Error queueing batched embedding for {len(article_ids)} articles: {e}")
+            return False
+    
     def enqueue_email_digest(self, subscription_id: int, **kwargs) -> Optional[str]:
         """
         Enqueue email digest for sending.
@@ -154,26 +326,35 @@ class MessageQueue:
             return None
     
     def get_queue_stats(self) -> dict:
-        """Get statistics for all queues"""
+        """
+        Get statistics for all queues.
+        
+        The queue lengths and failed-job counts are read in one pipelined
+        round trip. Failed jobs are counted without running
+        FailedJobRegistry.cleanup() on every poll: entries whose expiry
+        score lies between 0 and now are expired and left out, which gives
+        the number FailedJobRegistry.count would report. Jobs failed with a
+        negative TTL are stored with that negative score and never expire.
+        """
+        queues = {
+            'extraction': self.extraction_queue,
+            'summarization': self.summarization_queue,
+            'embedding': self.embedding_queue,
+            'email': self.email_queue,
+        }
         try:
-            return {
-                'extraction': {
-                    'count': len(self.extraction_queue),
-                    'failed': self.extraction_queue.failed_job_registry.count
-                },
-                'summarization': {
-                    'count': len(self.summarization_queue),
-                    'failed': self.summarization_queue.failed_job_registry.count
-                },
-                'embedding': {
-                    'count': len(self.embedding_queue),
-                    'failed': self.embedding_queue.failed_job_registry.count
-                },
-                'email': {
-                    'count': len(self.email_queue),
-                    'failed': self.email_queue.failed_job_registry.count
-                }
-            }
+            now = time.time()
+            pipe = self.pipeline()
+            for queue in queues.values():
+                pipe.llen(queue.key)
+                pipe.zcard(queue.failed_job_registry.key)
+                pipe.zcount(queue.failed_job_registry.key, 0, now)
+            results = iter(pipe.execute())
+            stats = {}
+            for name in queues:
+                count, failed, expired = next(results), next(results), next(results)
+                stats[name] = {'count': count, 'failed': failed - expired}
+            return stats
         except Exception as e:
             logger.error(f"Error getting queue stats: {e}")
             return {}
@@ -204,3 +385,13 @@ def get_message_queue() -> MessageQueue:
     if _message_queue is None:
         _message_queue = MessageQueue()
     return _message_queue
+
+
+def get_redis() -> Redis:
+    """
+    Redis client on the shared queue connection pool.
+    
+    Use this in worker callables and scripts instead of constructing a new
+    Redis(), so they do not open connections of their own.
+    """
+    return get_message_queue().redis_conn
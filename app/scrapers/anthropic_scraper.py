@@ -2,14 +2,39 @@
 Clean and simple Anthropic RSS scraper.
 Combines Research, Engineering, and News feeds.
 """
+import io
+import threading
 import feedparser
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool for feed and article fetches (hosts kept, connections per
+# host), and retries for transient upstream errors
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 16
+HTTP_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+
+# Browser-like headers so article pages behind Cloudflare are served
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0',
+}
+
 
 # ============================================================================
 # Pydantic Models
@@ -49,6 +74,10 @@ class AnthropicScraper:
         "news": "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml"
     }
     
+    # Docling converter (heavy to build); see _get_converter()
+    _converter = None
+    _converter_lock = threading.Lock()
+    
     def __init__(self, hours_back: int = 24):
         """
         Initialize Anthropic scraper.
@@ -57,6 +86,15 @@ class AnthropicScraper:
             hours_back: Number of hours to look back for articles (default: 24)
         """
         self.hours_back = hours_back
+        
+        # One pooled session, so feeds and articles reuse TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update(BROWSER_HEADERS)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=HTTP_RETRY,
+        ))
     
     def scrape_articles(self, filter_by_time: bool = True) -> List[AnthropicArticle]:
         """
@@ -76,11 +114,16 @@ class AnthropicScraper:
             cutoff_time = datetime.utcnow() - timedelta(hours=self.hours_back)
             logger.info(f"⏰ Filtering articles published after: {cutoff_time}")
         
-        # Scrape each feed
-        for category, feed_url in self.FEEDS.items():
+        # Fetch and parse the feeds concurrently over the shared session;
+        # wall time is the slowest feed rather than the sum of all three
+        def scrape(item):
+            category, feed_url = item
             logger.info(f"📰 Fetching Anthropic {category.upper()} feed")
-            articles = self._scrape_feed(feed_url, category, cutoff_time, filter_by_time)
-            all_articles.extend(articles)
+            return self._scrape_feed(feed_url, category, cutoff_time, filter_by_time)
+        
+        with ThreadPoolExecutor(max_workers=len(self.FEEDS)) as pool:
+            for articles in pool.map(scrape, self.FEEDS.items()):
+                all_articles.extend(articles)
         
         logger.info(f"📊 Total scraped: {len(all_articles)} articles from Anthropic")
         return all_articles
@@ -105,11 +148,9 @@ class AnthropicScraper:
             List of AnthropicArticle models
         """
         try:
-            import requests
-            
             # For GitHub raw URLs, fetch content first then parse
             # This avoids the "text/plain" content-type issue
-            response = requests.get(feed_url, timeout=10)
+            response = self.session.get(feed_url, timeout=10)
             response.raise_for_status()
             
             # Parse the fetched content as XML
@@ -158,11 +199,21 @@ class AnthropicScraper:
         except Exception:
             return None
     
-    @staticmethod
-    def get_article_content(url: str) -> Optional[str]:
+    @classmethod
+    def _get_converter(cls):
+        """Docling DocumentConverter shared by every scraper, built on first use."""
+        if cls._converter is None:
+            with cls._converter_lock:
+                if cls._converter is None:
+                    from docling.document_converter import DocumentConverter
+                    cls._converter = DocumentConverter()
+        return cls._converter
+    
+    def get_article_content(self, url: str) -> Optional[str]:
         """
         Extract article content from URL and convert to Markdown.
-        Uses requests with proper headers to bypass Cloudflare protection.
+        Uses the scraper's session, whose browser-like headers get past
+        Cloudflare protection.
         
         Args:
             url: Article URL to extract content from
@@ -171,56 +222,31 @@ class AnthropicScraper:
             Article content in Markdown format, or None if extraction fails
         """
         try:
-            import requests
-            import tempfile
-            from pathlib import Path
-            from docling.document_converter import DocumentConverter
+            from docling.datamodel.base_models import DocumentStream
             
             logger.info(f"📄 Extracting content from: {url}")
             
-            # Use requests with proper headers to bypass Cloudflare
-            # Note: requests library automatically handles gzip/deflate decompression
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Cache-Control': 'max-age=0',
-            }
-            
-            # Download content with proper headers
+            # Download content over the shared session (headers preset)
             # requests automatically decompresses gzip/deflate responses
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
             # Ensure we have the text content properly decoded
             response.encoding = response.apparent_encoding or 'utf-8'
             html_content = response.text
             
-            # Save to temporary file with explicit UTF-8 encoding
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8', errors='replace') as tmp_file:
-                tmp_file.write(html_content)
-                tmp_path = tmp_file.name
+            # Hand Docling the page as UTF-8 bytes in memory (no temp file)
+            stream = DocumentStream(
+                name="article.html",
+                stream=io.BytesIO(html_content.encode('utf-8', errors='replace')),
+            )
+            result = self._get_converter().convert(stream)
             
-            try:
-                # Convert the downloaded HTML file with Docling
-                converter = DocumentConverter()
-                result = converter.convert(tmp_path)
-                
-                # Export to Markdown
-                document = result.document
-                markdown_output = document.export_to_markdown()
-                
-                logger.info(f"✅ Successfully extracted {len(markdown_output)} characters")
-                return markdown_output
+            # Export to Markdown
+            markdown_output = result.document.export_to_markdown()
             
-            finally:
-                # Clean up temp file
-                Path(tmp_path).unlink(missing_ok=True)
+            logger.info(f"✅ Successfully extracted {len(markdown_output)} characters")
+            return markdown_output
         
         except Exception as e:
             logger.error(f"❌ Error extracting content from {url}: {e}")
@@ -234,7 +260,6 @@ class AnthropicScraper:
 
 if __name__ == "__main__":
     import sys
-    import io
     
     # Fix Windows encoding
     if sys.platform == 'win32':
@@ -294,7 +319,7 @@ if __name__ == "__main__":
             print(f"\nExtracting content from: {test_article.title}")
             print(f"URL: {test_article.url}\n")
             
-            markdown = AnthropicScraper.get_article_content(test_article.url)
+            markdown = scraper.get_article_content(test_article.url)
             if markdown:
                 print(f"Successfully extracted {len(markdown)} characters")
                 print(f"First 300 characters:\n{markdown[:300]}...")
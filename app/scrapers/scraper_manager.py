@@ -4,11 +4,12 @@ Scraper manager to orchestrate all scraping operations.
 import logging
 import json
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db_session, Source, Article, SourceType
+from app.database.repository import SourceRepository, existing_article_urls
+from app.cache import get_redis_client
 from app.scrapers.youtube_scraper import YouTubeScraper
 from app.scrapers.blog_scraper import BlogScraper
 from app.scrapers.openai_scraper import OpenAIScraper
@@ -36,6 +37,37 @@ class ScraperManager:
         # Path to YouTube channels config
         self.config_dir = Path(__file__).parent.parent.parent / "config"
         self.youtube_channels_file = self.config_dir / "youtube_channels.json"
+        
+        # Redis seen-URL prefilter; resolved lazily, None if Redis is unavailable
+        self._url_cache = None
+        self._url_cache_checked = False
+    
+    def _may_exist(self, url: str) -> bool:
+        """
+        Return False only if the URL is definitely not in the database yet.
+        
+        Uses the Redis seen-URL bitmap so new articles skip the SELECT; falls
+        back to always checking the database when Redis is unavailable.
+        """
+        if not self._url_cache_checked:
+            self._url_cache_checked = True
+            try:
+                self._url_cache = get_redis_client()
+            except Exception as e:
+                logger.warning(f"Seen-URL prefilter disabled, Redis unavailable: {e}")
+        if self._url_cache is None:
+            return True
+        return self._url_cache.seen_url(url)
+    
+    def _existing_urls(self, session, articles_data: List[Dict]) -> Set[str]:
+        """
+        Return the scraped URLs already stored, in one IN query.
+        
+        URLs the seen-URL prefilter has never seen are left out of the query.
+        """
+        return existing_article_urls(
+            session, [a["url"] for a in articles_data if a.get("url") and self._may_exist(a["url"])]
+        )
     
     def load_youtube_channels(self) -> List[Dict]:
         """
@@ -177,14 +209,14 @@ class ScraperManager:
         }
         
         with get_db_session() as session:
-            # Get all active sources
-            sources = session.query(Source).filter(Source.active == True).all()
+            # Get all active sources (plain rows; the session is shared via get_db_session)
+            sources = SourceRepository.get_active_source_rows()
             
             logger.info(f"Found {len(sources)} active sources to scrape")
             
             for source in sources:
                 try:
-                    logger.info(f"Scraping source: {source.name} ({source.source_type.value})")
+                    logger.info(f"Scraping source: {source.name} ({SourceType(source.source_type).label})")
                     
                     # Scrape based on source type
                     if source.source_type == SourceType.YOUTUBE:
@@ -198,15 +230,12 @@ class ScraperManager:
                     stats["sources_processed"] += 1
                     stats["articles_found"] += len(articles_data)
                     
+                    existing = self._existing_urls(session, articles_data)
+                    
                     # Save articles to database
                     for article_data in articles_data:
                         try:
-                            # Check if article already exists
-                            existing = session.query(Article).filter(
-                                Article.url == article_data["url"]
-                            ).first()
-                            
-                            if existing:
+                            if article_data["url"] in existing:
                                 stats["articles_duplicate"] += 1
                                 logger.debug(f"Article already exists: {article_data['title']}")
                                 continue
@@ -218,7 +247,6 @@ class ScraperManager:
                                 url=article_data["url"],
                                 content=article_data.get("content", ""),
                                 published_at=article_data.get("published_at"),
-                                scraped_at=datetime.utcnow(),
                             )
                             
                             session.add(article)
@@ -279,14 +307,12 @@ class ScraperManager:
             
             stats["articles_found"] = len(articles_data)
             
+            existing = self._existing_urls(session, articles_data)
+            
             # Save articles
             for article_data in articles_data:
                 try:
-                    existing = session.query(Article).filter(
-                        Article.url == article_data["url"]
-                    ).first()
-                    
-                    if existing:
+                    if article_data["url"] in existing:
                         stats["articles_duplicate"] += 1
                         continue
                     
@@ -296,7 +322,6 @@ class ScraperManager:
                         url=article_data["url"],
                         content=article_data.get("content", ""),
                         published_at=article_data.get("published_at"),
-                        scraped_at=datetime.utcnow(),
                     )
                     
                     session.add(article)
@@ -12,6 +12,7 @@ from app.logging_config import configure_logging
 from app.scrapers.scraper_manager import ScraperManager
 from app.llm.digest_generator import DigestGenerator
 from app.email.email_sender import EmailSender
+from app.email.digest_lock import digest_lock
 
 configure_logging()
 
@@ -19,6 +20,15 @@ logger = logging.getLogger(__name__)
 
 
 def run_daily_digest():
+    """Run the daily pipeline, skipping it if another worker is already running today's."""
+    with digest_lock(f"daily:{datetime.utcnow().date().isoformat()}") as acquired:
+        if not acquired:
+            logger.warning("Daily digest already running in another worker. Skipping.")
+            return
+        _run_daily_digest()
+
+
+def _run_daily_digest():
     """
     Main function to run the complete daily digest workflow:
     1. Scrape all sources
@@ -62,7 +72,6 @@ def run_daily_digest():
             logger.warning("No new articles found. Skipping digest generation.")
             pipeline_run.completed_at = datetime.utcnow()
             db.commit()
-            db.close()
             return
         
         # Step 2: Generate digest
@@ -98,14 +107,12 @@ def run_daily_digest():
 
         pipeline_run.completed_at = datetime.utcnow()
         db.commit()
-        db.close()
 
     except ValueError as e:
         logger.error("Configuration error: %s", e)
         pipeline_run.articles_failed += 1
         pipeline_run.completed_at = datetime.utcnow()
         db.commit()
-        db.close()
         sys.exit(1)
 
     except Exception as e:
@@ -113,9 +120,12 @@ def run_daily_digest():
         pipeline_run.articles_failed += 1
         pipeline_run.completed_at = datetime.utcnow()
         db.commit()
-        db.close()
         sys.exit(1)
 
+    finally:
+        # Covers every exit, including the early return on digest failure
+        db.close()
+
 
 def test_scraping():
     """Test scraping functionality"""
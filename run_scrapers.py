@@ -375,6 +375,10 @@ Examples:
             logger.info("💾 Database saving: DISABLED (dry run)")
         logger.info("=" * 60)
         
+        if save_to_db:
+            # Lets bulk inserts skip the existence SELECT for never-seen URLs
+            ArticleRepository.warm_url_filter()
+        
         # Run all scrapers
 
         youtube_results = run_youtube_scraper(args.hours, args.transcripts, youtube_config, save_to_db)
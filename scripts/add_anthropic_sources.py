@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import engine
+from app.database import engine, SourceType
 from sqlalchemy import text
 
 def add_anthropic_sources_sql():
@@ -33,8 +33,8 @@ def add_anthropic_sources_sql():
                 # Insert new source
                 conn.execute(text("""
                     INSERT INTO sources (name, url, source_type, active, created_at)
-                    VALUES (:name, :url, 'ANTHROPIC'::sourcetype, true, NOW())
-                """), {"name": name, "url": url})
+                    VALUES (:name, :url, :source_type, true, NOW())
+                """), {"name": name, "url": url, "source_type": SourceType.ANTHROPIC.value})
                 conn.commit()
                 print(f"✅ Added: {name}")
     
@@ -103,7 +103,7 @@ def list_sources():
             status = "✅ Active" if source.active else "❌ Inactive"
             print(f"\nID: {source.id}")
             print(f"Name: {source.name}")
-            print(f"Type: {source.source_type.value}")
+            print(f"Type: {SourceType(source.source_type).label}")
             print(f"URL: {source.url}")
             print(f"Status: {status}")
             print("-" * 60)
@@ -80,9 +80,9 @@ def reset_and_enqueue(article, stage: str, mq, dry_run: bool = False) -> bool:
     if stage == "extraction":
         mq.enqueue_extraction(article.id)
     elif stage == "summarization":
-        mq.enqueue_summarization(article.id)
+        mq.enqueue_summarization_batched([article.id])
     elif stage == "embedding":
-        mq.enqueue_embedding(article.id)
+        mq.enqueue_embedding_batched([article.id])
 
     print(f"  [enqueued] article {article.id}: '{article.title[:60]}' → {stage}")
     return True
@@ -124,9 +124,8 @@ def main():
 
         if args.since:
             since_dt = datetime.fromisoformat(args.since).replace(tzinfo=timezone.utc)
-            # Strip timezone for comparison with naive DB timestamps
-            since_naive = since_dt.replace(tzinfo=None)
-            found = get_articles_since(db, since_naive)
+            # scraped_at is timestamptz; compare with an aware UTC datetime
+            found = get_articles_since(db, since_dt)
             print(f"Found {len(found)} articles scraped since {args.since}")
             # Deduplicate
             seen = {a.id for a in articles}
@@ -21,11 +21,10 @@ def benchmark_digest_generation():
     """Benchmark digest generation for 50 articles"""
     logger.info("📊 Benchmarking digest generation (50 articles)...")
     
-    generator = get_digest_generator()
-    
-    start = time.time()
-    articles = generator.generate_digest(hours_back=168)
-    end = time.time()
+    with get_digest_generator() as generator:
+        start = time.time()
+        articles = generator.generate_digest(hours_back=168)
+        end = time.time()
     
     duration = end - start
     
@@ -73,33 +72,30 @@ def check_database_performance():
     """Check database query performance with indexes"""
     logger.info("\n🗄️ Checking database performance...")
     
-    db = SessionLocal()
-    
-    # Test 1: Recent articles query
-    start = time.time()
-    cutoff = datetime.now() - timedelta(days=7)
-    articles = db.query(Article).filter(Article.published_at >= cutoff).limit(100).all()
-    end = time.time()
-    
-    duration1 = end - start
-    logger.info(f"   Recent articles query (100): {duration1*1000:.0f}ms")
-    logger.info(f"   Result: {'✅ PASS' if duration1 < 0.1 else '⚠️ SLOW'} (target: < 100ms)")
-    
-    # Test 2: Join query (articles + summaries)
-    start = time.time()
-    results = (
-        db.query(Article, ArticleSummary)
-        .join(ArticleSummary, Article.id == ArticleSummary.article_id)
-        .limit(50)
-        .all()
-    )
-    end = time.time()
-    
-    duration2 = end - start
-    logger.info(f"   Join query (50 articles): {duration2*1000:.0f}ms")
-    logger.info(f"   Result: {'✅ PASS' if duration2 < 0.5 else '⚠️ SLOW'} (target: < 500ms)")
-    
-    db.close()
+    with SessionLocal() as db:
+        # Test 1: Recent articles query
+        start = time.time()
+        cutoff = datetime.now() - timedelta(days=7)
+        articles = db.query(Article).filter(Article.published_at >= cutoff).limit(100).all()
+        end = time.time()
+    
+        duration1 = end - start
+        logger.info(f"   Recent articles query (100): {duration1*1000:.0f}ms")
+        logger.info(f"   Result: {'✅ PASS' if duration1 < 0.1 else '⚠️ SLOW'} (target: < 100ms)")
+    
+        # Test 2: Join query (articles + summaries)
+        start = time.time()
+        results = (
+            db.query(Article, ArticleSummary)
+            .join(ArticleSummary, Article.id == ArticleSummary.article_id)
+            .limit(50)
+            .all()
+        )
+        end = time.time()
+    
+        duration2 = end - start
+        logger.info(f"   Join query (50 articles): {duration2*1000:.0f}ms")
+        logger.info(f"   Result: {'✅ PASS' if duration2 < 0.5 else '⚠️ SLOW'} (target: < 500ms)")
     
     return duration1, duration2
 
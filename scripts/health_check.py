@@ -86,13 +86,12 @@ def check_data_counts():
     try:
         from app.database import Article, ArticleSummary, ArticleEmbedding, Source, EmailSubscription
         
-        db = SessionLocal()
-        
-        article_count = db.query(Article).count()
-        summary_count = db.query(ArticleSummary).count()
-        embedding_count = db.query(ArticleEmbedding).count()
-        source_count = db.query(Source).count()
-        subscription_count = db.query(EmailSubscription).count()
+        with SessionLocal() as db:
+            article_count = db.query(Article).count()
+            summary_count = db.query(ArticleSummary).count()
+            embedding_count = db.query(ArticleEmbedding).count()
+            source_count = db.query(Source).count()
+            subscription_count = db.query(EmailSubscription).count()
         
         logger.info("✅ Database Records:")
         logger.info(f"   - Sources: {source_count}")
@@ -101,7 +100,6 @@ def check_data_counts():
         logger.info(f"   - Embeddings: {embedding_count}")
         logger.info(f"   - Subscriptions: {subscription_count}")
         
-        db.close()
         return True
     except Exception as e:
         logger.error(f"❌ Record Count Check: Failed - {e}")
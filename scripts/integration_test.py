@@ -131,8 +131,8 @@ class IntegrationTests:
     
     def test_digest_generation(self):
         """Test digest generator can fetch articles"""
-        generator = get_digest_generator()
-        articles = generator.generate_digest(hours_back=168)
+        with get_digest_generator() as generator:
+            articles = generator.generate_digest(hours_back=168)
         
         if not articles:
             logger.info("      No articles with summaries found")
@@ -163,8 +163,8 @@ class IntegrationTests:
     
     def test_subscription_service(self):
         """Test subscription management"""
-        service = get_subscription_service()
-        subscribers = service.get_active_subscribers()
+        with get_subscription_service() as service:
+            subscribers = service.get_active_subscribers()
         
         logger.info(f"      {len(subscribers)} active subscribers")
         
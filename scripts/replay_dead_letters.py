@@ -53,8 +53,13 @@ def print_entry(entry: DeadLetter):
         print(f"    replayed_at: {entry.replayed_at.isoformat()}")
 
 
-def replay_entry(entry: DeadLetter, mq, dry_run: bool = False) -> bool:
-    """Re-enqueue a dead letter based on its queue_name."""
+def replay_entry(entry: DeadLetter, mq, dry_run: bool = False, pipeline=None) -> bool:
+    """
+    Re-enqueue a dead letter based on its queue_name.
+
+    Summarization jobs are queued on `pipeline` when one is given; the
+    caller sends them with pipeline.execute().
+    """
     article_id = entry.article_id
     if article_id is None:
         print(f"  [skip] id={entry.id}: article_id is NULL (article deleted)")
@@ -68,9 +73,9 @@ def replay_entry(entry: DeadLetter, mq, dry_run: bool = False) -> bool:
         mq.enqueue_extraction(article_id)
     elif entry.queue_name == "summarization":
         model = entry.payload.get("model")
-        mq.enqueue_summarization(article_id, model=model)
+        mq.enqueue_summarization(article_id, model=model, pipeline=pipeline)
     elif entry.queue_name == "embedding":
-        mq.enqueue_embedding(article_id)
+        mq.enqueue_embedding_batched([article_id])
     else:
         print(f"  [skip] id={entry.id}: unknown queue '{entry.queue_name}'")
         return False
@@ -111,17 +116,20 @@ def main():
 
         if args.replay:
             mq = get_message_queue()
+            # Summarization jobs for every entry go out in one round trip
+            pipe = mq.pipeline()
             replayed_count = 0
             for entry in entries:
                 if entry.replayed and not args.id:
                     continue
-                if replay_entry(entry, mq, dry_run=args.dry_run):
+                if replay_entry(entry, mq, dry_run=args.dry_run, pipeline=pipe):
                     if not args.dry_run:
                         entry.replayed = True
                         entry.replayed_at = datetime.utcnow()
                     replayed_count += 1
 
             if not args.dry_run:
+                pipe.execute()
                 db.commit()
 
             action = "Would replay" if args.dry_run else "Replayed"
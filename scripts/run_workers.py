@@ -11,12 +11,12 @@ import logging
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from redis import Redis
 from rq import Worker, Queue, SimpleWorker
 from rq.job import Job
 import platform
 
 from app.logging_config import configure_logging
+from app.queue import get_redis
 configure_logging()
 logger = logging.getLogger(__name__)
 
@@ -44,12 +44,12 @@ def main():
     
     args = parser.parse_args()
     
-    # Connect to Redis
+    # Connect to Redis on the shared queue pool
     redis_host = os.getenv('REDIS_HOST', 'localhost')
     redis_port = int(os.getenv('REDIS_PORT', 6379))
     
     try:
-        redis_conn = Redis(host=redis_host, port=redis_port)
+        redis_conn = get_redis()
         redis_conn.ping()
         logger.info(f"Connected to Redis at {redis_host}:{redis_port}")
     except Exception as e:
@@ -73,6 +73,10 @@ def main():
         logger.info("Unix/Linux detected: Using Worker (with forking)")
         worker_class = Worker
     
+    # Load models once here so forked job processes inherit them
+    from app.orchestrator.workers import warm_up
+    warm_up(args.queues)
+    
     # Create and start worker
     worker = worker_class(
         queues,
@@ -81,7 +85,8 @@ def main():
     )
     
     try:
-        worker.work(burst=args.burst)
+        # The scheduler releases deferred jobs (enqueue_summarization_batched)
+        worker.work(burst=args.burst, with_scheduler=True)
     except KeyboardInterrupt:
         logger.info("\nWorker stopped by user")
     except Exception as e:
@@ -46,12 +46,12 @@ def seed_sources():
             ).first()
             
             if existing:
-                logger.info(f"  ⏭️  {source_data['name']} ({source_data['source_type'].value}) - already exists")
+                logger.info(f"  ⏭️  {source_data['name']} ({source_data['source_type'].label}) - already exists")
                 skipped += 1
             else:
                 source = Source(**source_data)
                 db.add(source)
-                logger.info(f"  ✅ {source_data['name']} ({source_data['source_type'].value}) - created")
+                logger.info(f"  ✅ {source_data['name']} ({source_data['source_type'].label}) - created")
                 created += 1
         
         db.commit()
@@ -34,12 +34,12 @@ def seed_subscription(email: str, name: str = None, frequency: str = 'daily'):
     }
     freq_enum = freq_map.get(frequency.lower(), EmailFrequency.DAILY)
     
-    service = get_subscription_service()
-    subscription = service.create_subscription(
-        email=email,
-        name=name,
-        frequency=freq_enum
-    )
+    with get_subscription_service() as service:
+        subscription = service.create_subscription(
+            email=email,
+            name=name,
+            frequency=freq_enum
+        )
     
     if subscription:
         logger.info(f"✅ Subscription created:")
@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 import argparse
 import logging
+from datetime import date
 
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -14,6 +15,7 @@ from app.email.digest_generator import get_digest_generator
 from app.email.renderer import get_email_renderer
 from app.email.email_sender import EmailSender
 from app.email.subscription_service import get_subscription_service
+from app.email.digest_lock import digest_lock
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -25,8 +27,8 @@ def send_digest_to_subscriber(subscriber, hours_back=24):
         logger.info(f"Generating digest for {subscriber.email}...")
         
         # Generate digest
-        generator = get_digest_generator()
-        articles = generator.generate_digest(hours_back=hours_back)
+        with get_digest_generator() as generator:
+            articles = generator.generate_digest(hours_back=hours_back)
         
         if not articles:
             logger.warning(f"No articles found in last {hours_back} hours. Skipping {subscriber.email}")
@@ -61,12 +63,20 @@ def send_digest_to_subscriber(subscriber, hours_back=24):
 
 
 def send_digest_to_all(hours_back=24):
-    """Send digest to all active subscribers"""
+    """Send digest to all active subscribers, unless another worker already is"""
+    with digest_lock(f"send-all:{date.today().isoformat()}:{hours_back}") as acquired:
+        if not acquired:
+            logger.warning("Digest fan-out already running in another worker. Skipping.")
+            return
+        _send_digest_to_all(hours_back)
+
+
+def _send_digest_to_all(hours_back):
     logger.info("📧 Sending digest to all active subscribers...")
     
     # Get all active subscribers
-    sub_service = get_subscription_service()
-    subscribers = sub_service.get_active_subscribers()
+    with get_subscription_service() as sub_service:
+        subscribers = sub_service.get_active_subscribers()
     
     if not subscribers:
         logger.warning("No active subscribers found")
@@ -74,16 +84,30 @@ def send_digest_to_all(hours_back=24):
     
     logger.info(f"Found {len(subscribers)} active subscriber(s)")
     
-    # Send to each subscriber
-    sent_count = 0
-    failed_count = 0
+    # The article set is the same for everyone, so generate it once
+    with get_digest_generator() as generator:
+        articles = generator.generate_digest(hours_back=hours_back)
+    
+    if not articles:
+        logger.warning(f"No articles found in last {hours_back} hours. Nothing to send.")
+        return
+    
+    logger.info(f"Found {len(articles)} articles for digest")
     
+    # Render per subscriber, then send everything over one SMTP session
+    renderer = get_email_renderer()
+    digests = []
     for subscriber in subscribers:
-        success = send_digest_to_subscriber(subscriber, hours_back)
-        if success:
-            sent_count += 1
-        else:
-            failed_count += 1
+        html, text = renderer.render_digest(
+            articles=articles,
+            subscriber_name=subscriber.name,
+            subscriber_email=subscriber.email
+        )
+        digests.append((subscriber.email, html, text, None))
+    
+    results = EmailSender().send_digests(digests)
+    sent_count = sum(results)
+    failed_count = len(results) - sent_count
     
     # Print summary
     logger.info("")
@@ -101,8 +125,8 @@ def send_digest_to_email(email: str, hours_back=24):
     logger.info(f"📧 Sending digest to {email}...")
     
     # Check if subscriber exists
-    sub_service = get_subscription_service()
-    subscriber = sub_service.get_subscriber_by_email(email)
+    with get_subscription_service() as sub_service:
+        subscriber = sub_service.get_subscriber_by_email(email)
     
     if not subscriber:
         logger.warning(f"Email {email} not found in subscriptions")
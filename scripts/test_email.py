@@ -98,8 +98,8 @@ def test_digest_generation():
     logger.info("🧪 Testing digest generation from database...")
     
     try:
-        generator = get_digest_generator()
-        articles = generator.generate_digest(hours_back=168)  # Last week
+        with get_digest_generator() as generator:
+            articles = generator.generate_digest(hours_back=168)  # Last week
         
         logger.info(f"✅ Found {len(articles)} articles with summaries")
         
@@ -121,8 +121,8 @@ def test_full_email(recipient: str):
     
     try:
         # Generate digest
-        generator = get_digest_generator()
-        articles = generator.generate_digest(hours_back=168)  # Last week
+        with get_digest_generator() as generator:
+            articles = generator.generate_digest(hours_back=168)  # Last week
         
         if not articles:
             logger.warning("No articles found, using sample data instead")
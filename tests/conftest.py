@@ -12,6 +12,7 @@ from unittest.mock import patch
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.database.base import Base
 # Import all models so Base.metadata is fully populated before create_all
@@ -20,10 +21,15 @@ from app.database import models, models_extended  # noqa: F401
 
 @pytest.fixture
 def test_engine():
-    """Function-scoped in-memory SQLite engine — each test gets a clean DB."""
+    """Function-scoped in-memory SQLite engine — each test gets a clean DB.
+
+    StaticPool shares the one connection across threads, so background
+    writers (e.g. workers.STATUS_WRITER) see the same database.
+    """
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
     Base.metadata.create_all(engine)
     yield engine
@@ -66,6 +72,16 @@ def patch_worker_session(db_session):
     """
     Patch workers.get_db() to return the test session.
     Use this for worker functions that call get_db() directly.
+
+    Status updates are written in the calling thread when the job flushes,
+    so the shared test session is never used from two threads at once.
     """
-    with patch("app.orchestrator.workers.get_db", return_value=db_session):
+    from app.orchestrator.workers import StatusWriter, clear_job_caches
+
+    # Job resources are cached per process; start each test without them
+    # so patched ContentExtractor/EmbeddingGenerator classes take effect
+    clear_job_caches()
+    with patch("app.orchestrator.workers.get_db", return_value=db_session), \
+         patch("app.orchestrator.workers.STATUS_WRITER", StatusWriter(background=False)):
         yield db_session
+    clear_job_caches()
@@ -0,0 +1,25 @@
+"""
+Tests for the positional ArticleDTO codec used by the article cache.
+"""
+from app.cache.dto import ArticleDTO, decode_articles, encode_articles
+from agent.prompts import get_digest_generation_prompt
+
+
+def test_round_trip():
+    articles = [ArticleDTO("Title", "https://example.com/a", "Body"), ArticleDTO("T2", "u2")]
+    decoded = decode_articles(encode_articles(articles))
+    assert decoded == articles
+    assert decoded[1].content == ""
+
+
+def test_wire_format_is_positional():
+    """Payloads are arrays so msgspec and fallback builds can share a cache."""
+    raw = encode_articles([ArticleDTO("t", "u", "c")])
+    assert decode_articles(raw.decode()) == [ArticleDTO("t", "u", "c")]
+    assert raw == b'[["t","u","c"]]'
+
+
+def test_digest_prompt_accepts_dtos():
+    prompt = get_digest_generation_prompt({"Blog": [ArticleDTO("Hello", "https://x", "world")]})
+    assert "1. **Hello**" in prompt
+    assert "URL: https://x" in prompt
@@ -0,0 +1,27 @@
+"""
+Tests for seeding default sources in app/database/create_tables.py.
+
+Runs on the SQLite test engine to check that the seeding INSERT follows
+the repository's dialect dispatch instead of assuming PostgreSQL. Turning
+off insert_returning covers dialects without RETURNING (MySQL).
+"""
+from unittest.mock import patch
+
+import pytest
+
+from app.database import create_tables, repository
+from app.database.models import Source
+
+
+@pytest.mark.parametrize("returning", [True, False], ids=["returning", "no-returning"])
+def test_default_sources_are_seeded_once(patch_db_session, monkeypatch, returning):
+    db = patch_db_session
+    monkeypatch.setattr(db.get_bind().dialect, "insert_returning", returning)
+    # create_tables imports get_db_session directly; reuse the test session
+    with patch.object(create_tables, "get_db_session", repository.get_db_session):
+        create_tables.add_default_sources()
+        seeded = db.query(Source).count()
+        create_tables.add_default_sources()
+
+    assert seeded >= 4  # OpenAI plus the three Anthropic feeds
+    assert db.query(Source).count() == seeded
@@ -0,0 +1,76 @@
+"""
+Tests for get_db_session() nesting in app/database/base.py.
+
+A nested block shares the thread's session inside a SAVEPOINT. pysqlite
+needs its own transaction handling turned off (and BEGIN emitted by
+SQLAlchemy) for SAVEPOINT to behave, so these tests use a dedicated engine.
+"""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import base
+from app.database.base import Base, get_db_session
+from app.database.models import Source, SourceType
+
+
+@pytest.fixture
+def scoped_sqlite():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    registry = scoped_session(sessionmaker(bind=engine, autoflush=False, expire_on_commit=False))
+    with patch.object(base, "ScopedSession", registry):
+        yield engine
+    registry.remove()
+    engine.dispose()
+
+
+def _source(name):
+    return Source(name=name, source_type=SourceType.BLOG, url=f"https://example.com/{name}")
+
+
+def _source_names(engine):
+    with engine.connect() as conn:
+        return set(conn.scalars(select(Source.name)))
+
+
+def test_inner_rollback_keeps_outer_work(scoped_sqlite):
+    with get_db_session() as outer:
+        outer.add(_source("outer"))
+        outer.flush()
+        with pytest.raises(RuntimeError):
+            with get_db_session() as inner:
+                assert inner is outer
+                inner.add(_source("inner"))
+                inner.flush()
+                raise RuntimeError("inner failure")
+        assert outer.scalar(select(func.count()).select_from(Source)) == 1
+
+    assert _source_names(scoped_sqlite) == {"outer"}
+
+
+def test_inner_commit_waits_for_outer_block(scoped_sqlite):
+    with pytest.raises(RuntimeError):
+        with get_db_session() as outer:
+            with get_db_session() as inner:
+                inner.add(_source("inner"))
+            raise RuntimeError("outer failure")
+
+    assert _source_names(scoped_sqlite) == set()
+    assert not base.ScopedSession.registry.has()
@@ -4,7 +4,8 @@ Tests for URL deduplication logic in ArticleRepository.bulk_create_articles().
 from datetime import datetime
 
 from app.database.models import Source, SourceType
-from app.database.repository import ArticleRepository
+from app.database import repository
+from app.database.repository import ArticleRepository, existing_article_urls
 
 
 def _make_source(db_session) -> int:
@@ -75,3 +76,50 @@ def test_mixed_batch_partial_duplicates(patch_db_session):
     assert stats["created"] == 2
     assert stats["duplicates"] == 1
     assert stats["errors"] == 0
+
+
+def test_bad_row_does_not_fail_batch(patch_db_session):
+    """A row violating a constraint should not prevent the rest of its chunk from inserting."""
+    source_id = _make_source(patch_db_session)
+    batch = [
+        _article_data(source_id, "https://example.com/ok-1"),
+        {"source_id": source_id, "url": "https://example.com/missing-title"},
+        _article_data(source_id, "https://example.com/ok-2"),
+    ]
+    stats = ArticleRepository.bulk_create_articles(batch)
+    assert stats["created"] == 2
+    assert stats["errors"] == 1
+
+
+def test_existing_urls_prefiltered(patch_db_session):
+    """URLs already stored are reported as duplicates without being re-inserted."""
+    source_id = _make_source(patch_db_session)
+    ArticleRepository.bulk_create_articles([_article_data(source_id, "https://example.com/a")])
+
+    assert existing_article_urls(
+        patch_db_session, ["https://example.com/a", "https://example.com/b"]
+    ) == {"https://example.com/a"}
+
+    stats = ArticleRepository.bulk_create_articles([
+        _article_data(source_id, "https://example.com/a"),
+        _article_data(source_id, "https://example.com/b"),
+        _article_data(source_id, "https://example.com/b"),
+    ])
+    assert stats == {"created": 1, "duplicates": 2, "errors": 0}
+
+
+def test_warm_url_filter_still_dedups(patch_db_session, monkeypatch):
+    """With the URL filter warm, stored URLs are still caught as duplicates."""
+    monkeypatch.setattr(repository, "_article_url_filter", None)
+    source_id = _make_source(patch_db_session)
+    ArticleRepository.bulk_create_articles([_article_data(source_id, "https://example.com/a")])
+
+    assert ArticleRepository.warm_url_filter() == 1
+    assert "https://example.com/a" in repository._article_url_filter
+
+    stats = ArticleRepository.bulk_create_articles([
+        _article_data(source_id, "https://example.com/a"),
+        _article_data(source_id, "https://example.com/b"),
+    ])
+    assert stats == {"created": 1, "duplicates": 1, "errors": 0}
+    assert "https://example.com/b" in repository._article_url_filter
@@ -0,0 +1,73 @@
+"""
+Tests for digest_lock() in app/email/digest_lock.py.
+
+SQLite falls back to an flock in the temp directory (pointed at tmp_path
+here). The Postgres branch runs against a mocked engine to check that the
+session-level lock is taken and released on an autocommit connection.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.email import digest_lock as lock_module
+from app.email.digest_lock import digest_lock
+
+
+@pytest.fixture
+def lock_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lock_module.tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.skipif(lock_module.fcntl is None, reason="needs fcntl")
+def test_file_lock_is_exclusive_and_released(test_engine, lock_dir):
+    with digest_lock("send-all:2026-10-15", bind=test_engine) as acquired:
+        assert acquired
+        with digest_lock("send-all:2026-10-15", bind=test_engine) as second:
+            assert not second
+        with digest_lock("send-all:2026-10-16", bind=test_engine) as other_key:
+            assert other_key
+
+    with digest_lock("send-all:2026-10-15", bind=test_engine) as again:
+        assert again
+
+
+@pytest.mark.skipif(lock_module.fcntl is None, reason="needs fcntl")
+def test_file_lock_is_released_when_the_run_fails(test_engine, lock_dir):
+    with pytest.raises(RuntimeError):
+        with digest_lock("daily", bind=test_engine):
+            raise RuntimeError("SMTP down")
+
+    with digest_lock("daily", bind=test_engine) as acquired:
+        assert acquired
+
+
+def _postgres_engine(locked: bool):
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    connection = engine.connect.return_value.execution_options.return_value
+    connection.execute.return_value.scalar.return_value = locked
+    return engine, connection
+
+
+def test_postgres_lock_uses_an_autocommit_session_lock():
+    engine, connection = _postgres_engine(locked=True)
+
+    with digest_lock("daily", bind=engine) as acquired:
+        assert acquired
+        connection.close.assert_not_called()
+
+    engine.connect.return_value.execution_options.assert_called_once_with(isolation_level="AUTOCOMMIT")
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert statements == ["SELECT pg_try_advisory_lock(:id)", "SELECT pg_advisory_unlock(:id)"]
+    connection.close.assert_called_once()
+
+
+def test_postgres_lock_held_elsewhere_is_not_unlocked():
+    engine, connection = _postgres_engine(locked=False)
+
+    with digest_lock("daily", bind=engine) as acquired:
+        assert not acquired
+
+    assert connection.execute.call_count == 1
+    connection.close.assert_called_once()
@@ -0,0 +1,168 @@
+"""
+Tests for EmailSender.send_digests() and its async counterparts in
+app/email/email_sender.py.
+
+smtplib.SMTP is mocked; the tests check how many sessions are opened and
+how a failure for one recipient affects the rest of the fan-out. The async
+tests mock aiosmtplib.send and check the TLS mode, result order, the
+concurrency bound, and the worker-thread fallback without aiosmtplib.
+"""
+import asyncio
+import smtplib
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.email.email_sender import EmailSender
+
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
+# aiosmtplib ships in the optional "async" extra
+requires_aiosmtplib = pytest.mark.skipif(aiosmtplib is None, reason="aiosmtplib not installed")
+
+
+def _digests(count):
+    return [(f"user{i}@example.com", "<p>Digest</p>", "Digest", "Subject") for i in range(count)]
+
+
+@pytest.fixture
+def smtp():
+    with patch("app.email.email_sender.smtplib.SMTP") as smtp_cls:
+        yield smtp_cls
+
+
+@pytest.fixture
+def sender():
+    sender = EmailSender()
+    sender.smtp_port = 587
+    return sender
+
+
+def test_fan_out_reuses_one_authenticated_session(smtp, sender):
+    results = sender.send_digests(_digests(3))
+
+    assert results == [True, True, True]
+    smtp.assert_called_once()
+    server = smtp.return_value
+    server.starttls.assert_called_once()
+    server.login.assert_called_once()
+    assert server.send_message.call_count == 3
+    assert [call.args[0]["To"] for call in server.send_message.call_args_list] == [
+        "user0@example.com", "user1@example.com", "user2@example.com",
+    ]
+    server.quit.assert_called_once()
+
+
+def test_failed_recipient_does_not_stop_the_rest(smtp, sender):
+    server = smtp.return_value
+    server.send_message.side_effect = [
+        None,
+        smtplib.SMTPRecipientsRefused({"user1@example.com": (550, b"No such user")}),
+        None,
+    ]
+
+    results = sender.send_digests(_digests(3))
+
+    assert results == [True, False, True]
+    server.login.assert_called_once()
+    assert server.send_message.call_count == 3
+
+
+def test_dropped_session_is_reopened_once(smtp, sender):
+    first, second = MagicMock(), MagicMock()
+    smtp.side_effect = [first, second]
+    first.send_message.side_effect = [None, smtplib.SMTPServerDisconnected("idle timeout")]
+
+    results = sender.send_digests(_digests(3))
+
+    assert results == [True, True, True]
+    assert first.send_message.call_count == 2
+    assert second.send_message.call_count == 2
+    second.login.assert_called_once()
+
+
+def test_authentication_failure_fails_every_digest(smtp, sender):
+    smtp.return_value.login.side_effect = smtplib.SMTPAuthenticationError(535, b"Bad credentials")
+
+    results = sender.send_digests(_digests(3))
+
+    assert results == [False, False, False]
+    smtp.return_value.send_message.assert_not_called()
+
+
+@pytest.fixture
+def async_send():
+    with patch("app.email.email_sender.aiosmtplib.send", new_callable=AsyncMock) as send:
+        yield send
+
+
+@requires_aiosmtplib
+@pytest.mark.parametrize("port, use_tls", [(465, True), (587, False)], ids=["implicit-tls", "starttls"])
+def test_async_send_picks_tls_mode_from_port(async_send, sender, port, use_tls):
+    sender.smtp_port = port
+
+    assert asyncio.run(sender.send_digest_async(*_digests(1)[0]))
+
+    async_send.assert_awaited_once()
+    message = async_send.call_args.args[0]
+    kwargs = async_send.call_args.kwargs
+    assert message["To"] == "user0@example.com"
+    assert kwargs["port"] == port
+    assert kwargs["use_tls"] is use_tls
+    assert kwargs["start_tls"] is not use_tls
+
+
+@requires_aiosmtplib
+def test_async_fan_out_keeps_input_order(async_send, sender):
+    async def send(message, **kwargs):
+        index = int(message["To"][len("user"):].split("@")[0])
+        # Later recipients finish first
+        await asyncio.sleep(0.01 * (3 - index))
+        if index == 1:
+            raise aiosmtplib.SMTPRecipientsRefused([])
+
+    async_send.side_effect = send
+
+    results = asyncio.run(sender.send_digests_async(_digests(3)))
+
+    assert results == [True, False, True]
+
+
+@requires_aiosmtplib
+def test_async_fan_out_respects_concurrency(async_send, sender):
+    in_flight = peak = 0
+
+    async def send(message, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async_send.side_effect = send
+
+    results = asyncio.run(sender.send_digests_async(_digests(7), concurrency=2))
+
+    assert results == [True] * 7
+    assert async_send.await_count == 7
+    assert peak == 2
+
+
+def test_async_send_without_aiosmtplib_uses_worker_thread(sender):
+    threads = []
+
+    def send_digest(*args):
+        threads.append(threading.current_thread())
+        return True
+
+    with patch("app.email.email_sender.aiosmtplib", None), \
+         patch.object(sender, "send_digest", side_effect=send_digest) as sync_send:
+        results = asyncio.run(sender.send_digests_async(_digests(2)))
+
+    assert results == [True, True]
+    assert [call.args for call in sync_send.call_args_list] == [tuple(d) for d in _digests(2)]
+    assert threading.main_thread() not in threads
@@ -0,0 +1,128 @@
+"""
+Tests for the batched embedding worker in app/orchestrator/workers.py and
+the vector cache in app/processing/embeddings.py.
+
+The sentence-transformers model and Redis are mocked; articles, summaries
+and embeddings live in the in-memory SQLite database from conftest.
+"""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from app.database import Article, ArticleEmbedding, Source, SourceType
+from app.orchestrator import workers
+from app.processing.embeddings import EmbeddingGenerator, normalize_embeddings
+
+
+def _add_article(db, source_id, n, **fields):
+    article = Article(source_id=source_id, title=f"Article {n}", url=f"https://example.com/{n}", **fields)
+    db.add(article)
+    db.flush()
+    return article.id
+
+
+def test_generate_embeddings_batch_encodes_once(patch_worker_session):
+    db = patch_worker_session
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    with_summary = _add_article(db, source.id, 1, content="Long enough content", summary="A stored summary.")
+    content_only = _add_article(db, source.id, 2, content="Only raw content here")
+    too_short = _add_article(db, source.id, 3, content="short")
+    db.commit()
+
+    generator = MagicMock(model_name="test-model")
+    generator.generate_embeddings_batch.side_effect = lambda texts, batch_size: [[0.1] * 384 for _ in texts]
+    with patch.object(workers, "EmbeddingGenerator", return_value=generator), \
+         patch.object(workers, "get_redis_client"):
+        results = workers.generate_embeddings_batch([with_summary, content_only, too_short, 999])
+
+    assert results == {"embedded": 2, "skipped": 0, "failed": 2}
+    generator.generate_embeddings_batch.assert_called_once()
+    texts = generator.generate_embeddings_batch.call_args.args[0]
+    assert texts == ["A stored summary.", "Only raw content here"]
+
+    embedded = {row.article_id for row in db.query(ArticleEmbedding)}
+    assert embedded == {with_summary, content_only}
+    assert db.get(Article, with_summary).processing_status == "completed"
+
+
+def test_generate_embedding_uses_stored_summary(patch_worker_session):
+    db = patch_worker_session
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    article_id = _add_article(db, source.id, 1, content="Raw content", summary="A stored summary.")
+    db.commit()
+
+    generator = MagicMock(model_name="test-model")
+    generator.generate_embedding.return_value = np.zeros(384, dtype=np.float16)
+    with patch.object(workers, "EmbeddingGenerator", return_value=generator), \
+         patch.object(workers, "get_redis_client"):
+        assert workers.generate_embedding(article_id) is True
+        # Second run sees the eager-loaded embedding and skips the model
+        assert workers.generate_embedding(article_id) is True
+
+    generator.generate_embedding.assert_called_once_with("A stored summary.")
+
+
+def _embedding_generator(cached_raws):
+    """EmbeddingGenerator with a fake model and a mocked Redis cache."""
+    generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
+    generator.model_name = "test-model"
+    generator.dimension = 4
+    generator.model = MagicMock()
+    generator.model.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 4), dtype=np.float32)
+    generator.cache = MagicMock()
+    generator.cache.get_many.return_value = cached_raws
+    return generator
+
+
+def test_batch_only_encodes_cache_misses():
+    cached = np.full(4, 0.5, dtype=np.float16).tobytes()
+    generator = _embedding_generator([cached, None])
+
+    results = generator.generate_embeddings_batch(["seen before", "new text", ""])
+
+    assert [r.tolist() if r is not None else None for r in results] == [[0.5] * 4, [1.0] * 4, None]
+    assert results[1].dtype == np.float16
+    assert generator.model.encode.call_args.args[0] == ["new text"]
+    stored = generator.cache.set_many.call_args.args[0]
+    assert list(stored.values()) == [np.ones(4, dtype=np.float16).tobytes()]
+    assert next(iter(stored)).startswith("emb:norm:test-model:")
+
+
+def test_find_similar_accepts_float16_bytes():
+    generator = _embedding_generator([])
+    candidates = [np.array(v, dtype=np.float16).tobytes() for v in ([1, 0, 0, 0], [0, 1, 0, 0], [1, 1, 0, 0])]
+
+    ranked = generator.find_similar([1.0, 0.0, 0.0, 0.0], candidates, top_k=2)
+
+    assert [index for index, _ in ranked] == [0, 2]
+    assert ranked[0][1] == 1.0
+
+
+def test_find_similar_with_prenormalized_matrix():
+    generator = _embedding_generator([])
+    matrix = normalize_embeddings([[3.0, 0.0], [1.0, 1.0], [0.0, 0.0], [0.0, -2.0]])
+
+    ranked = generator.find_similar([2.0, 0.0], matrix, top_k=10, normalized=True)
+
+    assert [index for index, _ in ranked] == [0, 1, 2, 3]
+    assert np.isclose(ranked[1][1], np.sqrt(0.5))
+
+
+def test_encode_requests_unit_vectors():
+    generator = _embedding_generator([None])
+
+    generator.generate_embeddings_batch(["some text"])
+
+    assert generator.model.encode.call_args.kwargs["normalize_embeddings"] is True
+    assert next(iter(generator.cache.set_many.call_args.args[0])).startswith("emb:norm:test-model:")
+
+
+def test_embedding_generator_is_built_once_per_process(patch_worker_session):
+    with patch.object(workers, "EmbeddingGenerator") as generator_cls:
+        first = workers._get_embedder()
+        assert workers._get_embedder() is first
+    generator_cls.assert_called_once_with()
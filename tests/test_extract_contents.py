@@ -0,0 +1,122 @@
+"""
+Tests for the batched extraction and summarization workers in
+app/orchestrator/workers.py.
+
+ContentExtractor, LLMSummarizer and the message queue are mocked; articles
+live in the in-memory SQLite database from conftest.
+"""
+from unittest.mock import MagicMock, patch
+
+from app.database import Article, ArticleSummary, ProcessingQueue, ProcessingStatus, Source, SourceType
+from app.orchestrator import workers
+
+
+def test_extract_contents_updates_batch_and_enqueues_summaries(patch_worker_session):
+    db = patch_worker_session
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    articles = [
+        Article(source_id=source.id, title="Web", url="https://example.com/1", content_preview="Short"),
+        Article(source_id=source.id, title="Video", url="https://youtube.com/watch?v=abc", video_id="abc"),
+        Article(source_id=source.id, title="Done", url="https://example.com/3", full_content="x" * 200),
+        Article(source_id=source.id, title="Broken", url="https://example.com/4"),
+    ]
+    db.add_all(articles)
+    db.commit()
+    web, video, done, broken = (article.id for article in articles)
+
+    extractor = MagicMock()
+    extractor.extract_article_content.side_effect = lambda url: (
+        {"content": "Extracted body text", "method": "newspaper3k"} if url.endswith("/1") else None
+    )
+    extractor.extract_video_transcript.return_value = {"content": "Transcript text"}
+    queue = MagicMock()
+    with patch.object(workers, "ContentExtractor", return_value=extractor), \
+         patch("app.orchestrator.workers.get_message_queue", return_value=queue):
+        results = workers.extract_contents([web, video, done, broken, 999])
+
+    assert results == {"extracted": 2, "skipped": 1, "failed": 2}
+    db.expire_all()
+    assert db.get(Article, web).full_content == "Extracted body text"
+    assert db.get(Article, web).content_preview == "Extracted body text"
+    assert db.get(Article, web).extraction_method == "newspaper3k"
+    assert db.get(Article, video).extraction_method == "youtube_transcript"
+    assert db.get(Article, broken).full_content is None
+
+    (summarized,), _ = queue.enqueue_summarization_batched.call_args
+    assert sorted(summarized) == sorted([web, video, done])
+
+
+def test_generate_summaries_batch_packs_and_writes_once(patch_worker_session):
+    db = patch_worker_session
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    articles = [
+        Article(source_id=source.id, title="One", url="https://example.com/1", full_content="a" * 100),
+        Article(source_id=source.id, title="Two", url="https://example.com/2", full_content="b" * 100),
+        Article(source_id=source.id, title="Done", url="https://example.com/3", summary="Stored."),
+        Article(source_id=source.id, title="Short", url="https://example.com/4", content="tiny"),
+    ]
+    db.add_all(articles)
+    db.commit()
+    one, two, done, short = (article.id for article in articles)
+
+    summarizer = MagicMock()
+    summarizer.summarize_packed_sync.return_value = [
+        {"summary": "Summary one.", "key_points": ["k"], "model": "gemini-test"},
+        None,
+    ]
+    queue = MagicMock()
+    with patch.object(workers, "_get_summarizer", return_value=summarizer), \
+         patch("app.orchestrator.workers.get_message_queue", return_value=queue):
+        results = workers.generate_summaries_batch([one, two, done, short])
+
+    assert results == {"summarized": 1, "skipped": 1, "failed": 2}
+    inputs = summarizer.summarize_packed_sync.call_args.args[0]
+    assert [item["title"] for item in inputs] == ["One", "Two"]
+    db.expire_all()
+    assert db.get(Article, one).summary == "Summary one."
+    assert db.get(Article, one).summary_generated_at is not None
+    assert [row.article_id for row in db.query(ArticleSummary)] == [one]
+    (embedded,), _ = queue.enqueue_embedding_batched.call_args
+    assert sorted(embedded) == sorted([one, done])
+
+
+def test_extract_contents_isolates_an_article_that_raises(patch_worker_session):
+    db = patch_worker_session
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    articles = [
+        Article(source_id=source.id, title="Good", url="https://example.com/good"),
+        Article(source_id=source.id, title="Bad", url="https://example.com/bad"),
+    ]
+    db.add_all(articles)
+    db.commit()
+    good, bad = (article.id for article in articles)
+
+    def extract(url):
+        if url.endswith("/bad"):
+            raise TimeoutError("Read timed out")
+        return {"content": "Extracted body text", "method": "newspaper3k"}
+
+    extractor = MagicMock()
+    extractor.extract_article_content.side_effect = extract
+    queue = MagicMock()
+    with patch.object(workers, "ContentExtractor", return_value=extractor), \
+         patch("app.orchestrator.workers.get_message_queue", return_value=queue):
+        results = workers.extract_contents([good, bad])
+
+    assert results == {"extracted": 1, "skipped": 0, "failed": 1}
+    db.expire_all()
+    assert db.get(Article, good).full_content == "Extracted body text"
+    queue.enqueue_summarization_batched.assert_called_once_with([good])
+
+    entries = {entry.article_id: entry for entry in db.query(ProcessingQueue)}
+    assert entries[good].status is ProcessingStatus.PENDING
+    assert entries[good].retry_count == 0
+    assert entries[bad].status is ProcessingStatus.FAILED
+    assert entries[bad].retry_count == 1
+    assert entries[bad].error_message == "Read timed out"
@@ -0,0 +1,101 @@
+"""
+Tests for ContentExtractor in app/processing/content_extractor.py: the Redis
+result cache, the shared HTTP session and HTML text extraction.
+
+Redis is replaced by a MagicMock; the download helpers are patched so no
+network access happens.
+"""
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from app.processing.content_extractor import (
+    EXTRACTION_FAIL_LONG_TTL, EXTRACTION_FAIL_TTL, ContentExtractor, normalize_url,
+)
+
+
+def _extractor(cached=None):
+    cache = MagicMock()
+    cache.get.return_value = cached
+    cache.exists.return_value = False
+    with patch("app.processing.content_extractor.get_redis_client", return_value=cache):
+        return ContentExtractor()
+
+
+def test_normalize_url_drops_tracking_and_fragment():
+    assert normalize_url("HTTPS://Example.com/post/?utm_source=rss&b=2&a=1#top") == \
+        "https://example.com/post?a=1&b=2"
+    assert normalize_url("https://example.com/post") == normalize_url("https://example.com/post/?fbclid=x")
+
+
+def test_cache_miss_downloads_and_stores():
+    extractor = _extractor()
+    result = {"content": "Body", "publish_date": datetime(2026, 10, 15, 8, 30), "method": "newspaper3k"}
+    with patch.object(extractor, "_download_article", return_value=result) as download:
+        assert extractor.extract_article_content("https://example.com/a") is result
+
+    download.assert_called_once_with("https://example.com/a")
+    key, payload, ttl = extractor.cache.set_async.call_args.args
+    assert key.startswith("extract:url:")
+    assert payload["publish_date"] == "2026-10-15T08:30:00"
+
+
+def test_cache_hit_skips_download():
+    extractor = _extractor({"content": "Body", "publish_date": "2026-10-15T08:30:00", "method": "newspaper3k"})
+    with patch.object(extractor, "_download_article") as download:
+        result = extractor.extract_article_content("https://example.com/a?utm_medium=feed")
+
+    download.assert_not_called()
+    assert result["publish_date"] == datetime(2026, 10, 15, 8, 30)
+
+
+def test_failed_extraction_is_not_cached():
+    extractor = _extractor()
+    with patch.object(extractor, "_fetch_transcript", return_value=None):
+        assert extractor.extract_video_transcript("abc123") is None
+    extractor.cache.set_async.assert_not_called()
+
+
+def test_failed_url_is_negatively_cached():
+    extractor = _extractor()
+    extractor.cache.incr.return_value = 4
+    with patch.object(extractor, "_download_article", return_value=None):
+        assert extractor.extract_article_content("https://example.com/gone") is None
+
+    key, ttl = extractor.cache.incr.call_args.args
+    assert key.startswith("extract_fail:")
+    assert ttl == EXTRACTION_FAIL_TTL
+    extractor.cache.expire.assert_called_once_with(key, EXTRACTION_FAIL_LONG_TTL)
+    extractor.cache.set_async.assert_not_called()
+
+    extractor.cache.exists.return_value = True
+    with patch.object(extractor, "_download_article") as download:
+        assert extractor.extract_article_content("https://example.com/gone/?utm_source=rss") is None
+    download.assert_not_called()
+
+
+def test_extract_many_dedupes_and_shares_session():
+    extractor = _extractor()
+    assert extractor.session is _extractor().session
+    with patch.object(extractor, "extract_article_content", side_effect=lambda url: {"content": url}) as extract:
+        results = extractor.extract_many(["https://a.example", "https://b.example", "https://a.example"])
+
+    assert results == {"https://a.example": {"content": "https://a.example"},
+                       "https://b.example": {"content": "https://b.example"}}
+    assert extract.call_count == 2
+
+
+def test_rss_content_drops_scripts_and_media():
+    extractor = _extractor()
+    result = extractor.extract_rss_content(
+        "<p>Hello <b>world</b></p><script>alert(1)</script><img src='x.png'><p>Again</p>"
+    )
+    assert result == {"content": "Hello world Again", "method": "rss_parse"}
+
+
+def test_transcript_segments_are_single_spaced():
+    extractor = _extractor()
+    segments = [{"text": "Hello\nthere"}, {"text": "  general "}, {"text": "Kenobi"}]
+    with patch("app.processing.content_extractor.YouTubeTranscriptApi.get_transcript", return_value=segments, create=True):
+        result = extractor.extract_video_transcript("abc123")
+
+    assert result["content"] == "Hello there general Kenobi"
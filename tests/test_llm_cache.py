@@ -0,0 +1,57 @@
+"""
+Tests for the exact + semantic summary cache in app/processing/llm_cache.py.
+
+Redis and the embedding model are MagicMocks; vectors are tiny unit-length
+float16 arrays.
+"""
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from app.processing.llm_cache import LLMCache
+
+
+def _vector(*values):
+    vector = np.array(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).astype(np.float16)
+
+
+def test_exact_hit_skips_embedding():
+    redis, embedder = MagicMock(), MagicMock()
+    redis.get.return_value = {"summary": "Cached.", "key_points": []}
+    cache = LLMCache(redis, embedder)
+
+    assert cache.get("abc", "Body")["summary"] == "Cached."
+    redis.get.assert_called_once_with("llm:sum:abc")
+    embedder.generate_embedding.assert_not_called()
+
+
+def test_semantic_hit_above_threshold_only():
+    redis, embedder = MagicMock(), MagicMock()
+    stored = {"summary": "Near duplicate.", "key_points": []}
+    redis.get.side_effect = lambda key: stored if key == "llm:sum:similar" else None
+    redis.client.hgetall.return_value = {
+        b"similar": _vector(1.0, 0.1, 0.0).tobytes(),
+        b"other": _vector(0.0, 0.0, 1.0).tobytes(),
+    }
+    cache = LLMCache(redis, embedder, sim_threshold=0.92)
+
+    embedder.generate_embedding.return_value = _vector(1.0, 0.0, 0.0)
+    assert cache.get("new", "Body") == stored
+
+    embedder.generate_embedding.return_value = _vector(1.0, 1.0, 0.0)
+    assert cache.get("new", "Body") is None
+
+
+def test_set_stores_exact_entry_and_indexes_vector():
+    redis, embedder = MagicMock(), MagicMock()
+    embedder.generate_embedding.return_value = _vector(1.0, 0.0, 0.0)
+    pipe = redis.client.pipeline.return_value
+    pipe.execute.return_value = [1, 1, []]
+    cache = LLMCache(redis, embedder, ttl=60)
+
+    cache.set("abc", "x" * 5000, {"summary": "Fresh."})
+
+    redis.set.assert_called_once_with("llm:sum:abc", {"summary": "Fresh."}, 60)
+    assert len(embedder.generate_embedding.call_args.args[0]) == 2048
+    pipe.hset.assert_called_once_with("llm:sum:index", "abc", _vector(1.0, 0.0, 0.0).tobytes())
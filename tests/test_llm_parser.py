@@ -6,9 +6,13 @@ They verify that the parser handles the three response formats Gemini can return
   1. Raw JSON object
   2. Markdown-fenced JSON block (```json ... ```)
   3. Plain text (no valid JSON) — graceful fallback
+
+TestBatchSummaryParser covers the batched per-source summaries in
+app/llm/digest_generator.py the same way.
 """
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -25,6 +29,7 @@ def _make_summarizer(model_name="gemini-test"):
         summarizer.provider = "gemini"
         summarizer.model_name = model_name
         summarizer.model = mock_model_instance
+        summarizer.cache = None
         summarizer.SYSTEM_PROMPT = "You are a helpful assistant."
 
     return summarizer
@@ -98,3 +103,200 @@ class TestLLMOutputParser:
             result = summarizer.summarize("Content.", title="Title")
 
         assert result is None
+
+    def test_batch_runs_concurrently_and_keeps_order(self):
+        """summarize_batch() overlaps calls up to `concurrency` and returns input order."""
+        summarizer = _make_summarizer()
+        in_flight, peak = 0, 0
+
+        async def call(prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            title = prompt.split("Title: ")[1].split("\n")[0]
+            return json.dumps({"summary": f"Summary of {title}."})
+
+        articles = [{"content": "Body", "title": f"T{i}"} for i in range(5)]
+        with patch.object(summarizer, "_call_gemini_async", side_effect=call):
+            results = asyncio.run(summarizer.summarize_batch(articles, concurrency=2))
+
+        assert [r["summary"] for r in results] == [f"Summary of T{i}." for i in range(5)]
+        assert peak == 2
+
+    def test_packed_request_with_per_article_fallback(self):
+        """summarize_packed() sends one request per pack and re-asks only for skipped articles."""
+        summarizer = _make_summarizer()
+        packed_reply = "```json\n" + json.dumps([
+            {"id": 1, "summary": "First.", "key_points": ["a"]},
+            {"id": 3, "summary": "Third."},
+        ]) + "\n```"
+        articles = [{"content": "x" * 10000, "title": f"T{i}"} for i in range(3)]
+
+        with patch.object(summarizer, "_call_gemini", return_value=packed_reply) as call, \
+             patch.object(summarizer, "summarize", return_value={"summary": "Second."}) as single:
+            results = summarizer.summarize_packed(articles, pack_size=3)
+
+        assert [r["summary"] for r in results] == ["First.", "Second.", "Third."]
+        assert results[0]["key_points"] == ["a"] and results[2]["key_points"] == []
+        call.assert_called_once()
+        prompt = call.call_args.args[0]
+        assert "[3] Title: T2" in prompt and "x" * 8334 not in prompt
+        assert call.call_args.kwargs["generation_config"] == {"max_output_tokens": 3072}
+        single.assert_called_once_with("x" * 10000, "T1")
+
+
+def _make_digest_generator(cache=None):
+    """Build a DigestGenerator with a mocked Gemini model, skipping __init__."""
+    from app.llm.digest_generator import DigestGenerator
+    generator = DigestGenerator.__new__(DigestGenerator)
+    generator.system_prompt = "System."
+    generator.system_prompt_hash = "hash"
+    generator._semaphore = None
+    generator.cache = cache
+    generator.model = MagicMock()
+    return generator
+
+
+class TestBatchSummaryParser:
+    """parse_batch_summaries() / DigestGenerator._generate_article_summaries_batch()."""
+
+    def test_fenced_array_is_parsed_in_article_order(self):
+        from app.llm.digest_generator import parse_batch_summaries
+        payload = [{"id": 2, "summary": "Second."}, {"id": 1, "summary": "First."}]
+        response = f"```json\n{json.dumps(payload)}\n```"
+        assert parse_batch_summaries(response, 2) == ["First.", "Second."]
+
+    def test_missing_and_bad_ids_become_none(self):
+        from app.llm.digest_generator import parse_batch_summaries
+        payload = [{"id": 1, "summary": "Only one."}, {"id": 9, "summary": "Out of range."}, "junk"]
+        assert parse_batch_summaries(json.dumps(payload), 3) == ["Only one.", None, None]
+
+    def test_non_array_raises(self):
+        from app.llm.digest_generator import parse_batch_summaries
+        with pytest.raises(ValueError):
+            parse_batch_summaries('{"summary": "not a list"}', 1)
+
+    def test_batch_falls_back_per_article_for_gaps(self):
+        """Articles the batch response skipped are summarized individually."""
+        generator = _make_digest_generator()
+        generator.model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text=json.dumps([{"id": 1, "summary": "Batched."}]))
+        )
+        articles = [MagicMock(title=f"T{i}", content_preview="c", summary=None) for i in range(2)]
+
+        with patch.object(generator, "_generate_article_summary", AsyncMock(return_value="Single.")) as single:
+            result = asyncio.run(generator._generate_article_summaries_batch(articles))
+        assert result == ["Batched.", "Single."]
+        single.assert_awaited_once_with(articles[1])
+        assert generator.model.generate_content_async.await_count == 1
+
+    def test_failed_fallback_becomes_none(self):
+        """An exception from one fallback call does not sink the other articles."""
+        generator = _make_digest_generator()
+        generator.model.generate_content_async = AsyncMock(side_effect=Exception("API error"))
+        articles = [MagicMock(title=f"T{i}", content_preview="c", summary=None) for i in range(2)]
+
+        single = AsyncMock(side_effect=["Single.", RuntimeError("boom")])
+        with patch.object(generator, "_generate_article_summary", single):
+            result = asyncio.run(generator._generate_article_summaries_batch(articles))
+        assert result == ["Single.", None]
+
+    def test_stored_summaries_skip_gemini(self):
+        """Summaries persisted on the article by the pipeline worker are used as-is."""
+        generator = _make_digest_generator(cache=MagicMock())
+        generator.model.generate_content_async = AsyncMock()
+        articles = [MagicMock(title=f"T{i}", summary=f"Stored {i}.") for i in range(2)]
+
+        result = asyncio.run(generator._generate_article_summaries_batch(articles))
+
+        assert result == ["Stored 0.", "Stored 1."]
+        generator.model.generate_content_async.assert_not_awaited()
+        generator.cache.get_many.assert_not_called()
+
+    def test_cached_summaries_skip_gemini(self):
+        """Only uncached articles are sent to Gemini, and their summaries are cached."""
+        from app.llm.digest_generator import SUMMARY_CACHE_TTL
+        generator = _make_digest_generator(cache=MagicMock())
+        generator.cache.get_many.return_value = ["Cached.", None]
+        generator.model.generate_content_async = AsyncMock(
+            return_value=MagicMock(text=json.dumps([{"id": 1, "summary": "Fresh."}]))
+        )
+        articles = [MagicMock(id=i, title=f"T{i}", content_preview="c", summary=None) for i in range(2)]
+
+        result = asyncio.run(generator._generate_article_summaries_batch(articles))
+
+        assert result == ["Cached.", "Fresh."]
+        prompt = generator.model.generate_content_async.await_args.args[0]
+        assert "T1" in prompt and "T0" not in prompt
+        key = generator._summary_cache_key(articles[1])
+        generator.cache.set_many.assert_called_once_with({key: "Fresh."}, ttl=SUMMARY_CACHE_TTL)
+
+
+def test_digest_html_escapes_article_fields():
+    """Titles, URLs and summaries are HTML-escaped in the LLM digest."""
+    generator = _make_digest_generator()
+    sections = [{
+        "source_name": "R&D",
+        "articles": [{"title": "<b>GPT</b>", "url": "https://x.test/?a=1&b=2", "summary": "5 < 6"}],
+    }]
+
+    html = generator._format_digest_html(sections, "October 15, 2026")
+
+    assert "R&amp;D" in html
+    assert "&lt;b&gt;GPT&lt;/b&gt;" in html
+    assert 'href="https://x.test/?a=1&amp;b=2"' in html
+    assert "5 &lt; 6" in html
+
+
+def test_fetch_recent_articles_limits_per_source(db_session):
+    """The per-source limit keeps only each source's newest articles."""
+    from contextlib import contextmanager
+    from datetime import datetime, timedelta
+    from app.database.models import Article, Source, SourceType
+
+    now = datetime.utcnow()
+    for name in ("B", "A"):
+        source = Source(name=name, source_type=SourceType.BLOG, url=f"https://{name}.test/feed")
+        db_session.add(source)
+        db_session.flush()
+        for i in range(3):
+            db_session.add(Article(
+                source_id=source.id, title=f"{name}{i}", url=f"https://{name}.test/{i}",
+                published_at=now - timedelta(hours=i), scraped_at=now,
+            ))
+    db_session.flush()
+
+    @contextmanager
+    def _test_session():
+        yield db_session
+
+    with patch("app.llm.digest_generator.get_db_session", _test_session):
+        result = _make_digest_generator()._fetch_recent_articles(24, limit_per_source=2)
+
+    assert {name: [a.title for a in articles] for name, articles in result.items()} == {
+        "A": ["A0", "A1"], "B": ["B0", "B1"],
+    }
+    assert list(result) == ["A", "B"]
+
+
+def test_summarizers_share_one_configured_model(monkeypatch):
+    """genai.configure() and GenerativeModel() run once per key/model/config."""
+    from app.processing import llm_summarizer
+
+    mock_genai = MagicMock()
+    mock_genai.GenerativeModel.side_effect = lambda *args, **kwargs: MagicMock()
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_summarizer, "genai", mock_genai)
+    monkeypatch.setattr(llm_summarizer, "_models", {})
+    monkeypatch.setattr(llm_summarizer, "_configured_api_key", None)
+
+    first = llm_summarizer.LLMSummarizer(model="gemini-test")
+    second = llm_summarizer.LLMSummarizer(model="gemini-test")
+    other = llm_summarizer.LLMSummarizer(model="gemini-other")
+
+    assert first.model is second.model
+    assert other.model is not first.model
+    mock_genai.configure.assert_called_once_with(api_key="test-key")
+    assert mock_genai.GenerativeModel.call_count == 2
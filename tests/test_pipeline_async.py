@@ -0,0 +1,94 @@
+"""
+Tests for ArticlePipeline.process_new_articles_async() in app/orchestrator/pipeline.py.
+
+The backlog is read through the real async session factory on a file SQLite
+database (sqlite+aiosqlite), and the enqueue side is a mocked message queue.
+The tests check which articles are picked up and how found/enqueued/failed
+are counted.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import base
+from app.database.models import Article, Base, Source, SourceType
+from app.orchestrator.pipeline import ArticlePipeline
+
+
+@pytest.fixture
+def sync_db(tmp_path, monkeypatch):
+    """A file database shared by a sync session (setup) and the async engine."""
+    url = f"sqlite:///{tmp_path / 'pipeline.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(base, "ASYNC_DATABASE_URL", base._async_database_url(url))
+    monkeypatch.setattr(base, "_async_engine", None)
+    monkeypatch.setattr(base, "_AsyncSessionLocal", None)
+    with Session(engine) as session:
+        yield session
+    if base._async_engine is not None:
+        asyncio.run(base._async_engine.dispose())
+    engine.dispose()
+
+
+@pytest.fixture
+def message_queue():
+    mq = MagicMock()
+    with patch("app.orchestrator.pipeline.get_message_queue", return_value=mq), \
+         patch("app.orchestrator.pipeline.get_redis_client"):
+        yield mq
+
+
+def _add_articles(db, *articles):
+    source = Source(name="blog", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    rows = [
+        Article(source_id=source.id, title=name, url=f"https://example.com/{name}",
+                processing_status=status, scraped_at=scraped_at)
+        for name, status, scraped_at in articles
+    ]
+    db.add_all(rows)
+    db.commit()
+    return {row.title: row.id for row in rows}
+
+
+def test_backlog_is_enqueued_and_counted(sync_db, message_queue):
+    now = datetime.now(timezone.utc)
+    ids = _add_articles(
+        sync_db,
+        ("new", "pending", now - timedelta(hours=1)),
+        ("retry", "failed", now - timedelta(hours=2)),
+        ("dropped", "pending", now - timedelta(hours=3)),
+        ("done", "completed", now - timedelta(hours=1)),
+        ("stale", "pending", now - timedelta(hours=48)),
+    )
+    # One enqueue fails (no job id) and must be counted as failed
+    message_queue.enqueue_extraction_many.side_effect = lambda article_ids: [
+        None if article_id == ids["dropped"] else f"job-{article_id}" for article_id in article_ids
+    ]
+
+    result = asyncio.run(ArticlePipeline().process_new_articles_async(hours_back=24))
+
+    assert result == {"enqueued": 2, "failed": 1, "found": 3}
+    message_queue.enqueue_extraction_many.assert_called_once()
+    enqueued = message_queue.enqueue_extraction_many.call_args.args[0]
+    assert sorted(enqueued) == sorted([ids["new"], ids["retry"], ids["dropped"]])
+
+
+def test_empty_backlog_skips_the_queue(sync_db, message_queue):
+    now = datetime.now(timezone.utc)
+    _add_articles(
+        sync_db,
+        ("done", "completed", now - timedelta(hours=1)),
+        ("stale", "pending", now - timedelta(hours=48)),
+    )
+
+    result = asyncio.run(ArticlePipeline().process_new_articles_async(hours_back=24))
+
+    assert result == {"enqueued": 0, "failed": 0, "found": 0}
+    message_queue.enqueue_extraction_many.assert_not_called()
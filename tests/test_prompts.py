@@ -0,0 +1,42 @@
+"""
+Tests for the prompt/config loaders in agent/prompts.py.
+
+The loaders are memoized per process, so these tests check that repeat calls
+return the same shared object and that the shared config cannot be mutated.
+"""
+import pytest
+
+from agent.prompts import clear_prompt_caches, load_agent_config, load_system_prompt
+
+
+def test_agent_config_is_cached():
+    """Repeated calls should return the identical cached object."""
+    assert load_agent_config() is load_agent_config()
+
+
+def test_agent_config_is_read_only():
+    """Callers must not be able to mutate the shared cached config."""
+    config = load_agent_config()
+    with pytest.raises(TypeError):
+        config["model"] = {}
+    with pytest.raises(TypeError):
+        config["model"]["temperature"] = 1.0
+
+
+def test_agent_config_supports_nested_get():
+    """Existing .get() chains used by DigestGenerator should keep working."""
+    config = load_agent_config()
+    assert config.get("formatting", {}).get("max_articles_per_source") == 5
+
+
+def test_system_prompt_is_cached():
+    assert load_system_prompt() is load_system_prompt()
+
+
+def test_clear_prompt_caches_reloads():
+    """After clearing, the loaders re-read the files into new objects."""
+    config = load_agent_config()
+    clear_prompt_caches()
+    reloaded = load_agent_config()
+    assert reloaded is not config
+    assert reloaded == config
@@ -90,7 +90,7 @@ class TestSummarizationQualityGate:
 
         with patch("app.orchestrator.workers.get_db", return_value=db), \
              patch("app.orchestrator.workers.LLMSummarizer", return_value=mock_summarizer), \
-             patch("app.queue.get_message_queue", return_value=mock_queue):
+             patch("app.orchestrator.workers.get_message_queue", return_value=mock_queue):
             result = generate_summary(article.id)
 
         assert result is True
@@ -112,7 +112,7 @@ class TestExtractionQualityGate:
 
         with patch("app.orchestrator.workers.get_db", return_value=db), \
              patch("app.orchestrator.workers.ContentExtractor", return_value=mock_extractor), \
-             patch("app.queue.get_message_queue", return_value=mock_queue):
+             patch("app.orchestrator.workers.get_message_queue", return_value=mock_queue):
             result = extract_content(article.id)
 
         mock_extractor.extract_article_content.assert_not_called()
@@ -134,7 +134,7 @@ class TestExtractionQualityGate:
 
         with patch("app.orchestrator.workers.get_db", return_value=db), \
              patch("app.orchestrator.workers.ContentExtractor", return_value=mock_extractor), \
-             patch("app.queue.get_message_queue", return_value=mock_queue):
+             patch("app.orchestrator.workers.get_message_queue", return_value=mock_queue):
             result = extract_content(article.id)
 
         mock_extractor.extract_article_content.assert_called_once()
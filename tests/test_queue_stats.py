@@ -0,0 +1,114 @@
+"""
+Tests for MessageQueue.get_queue_stats() in app/queue/client.py.
+
+A small in-memory Redis stands in for the server. The pipelined stats must
+match what the per-call version (len(queue) plus
+failed_job_registry.count, which runs cleanup first) reports.
+"""
+import time
+from unittest.mock import patch
+
+from rq import Queue
+
+from app.queue.client import MessageQueue
+
+
+class FakeRedis:
+    """Lists and sorted sets, enough for queue lengths and failed registries."""
+
+    def __init__(self):
+        self.lists = {}
+        self.zsets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zcount(self, key, low, high):
+        high = float(high) if high != '+inf' else float('inf')
+        return sum(1 for score in self.zsets.get(key, {}).values() if low <= score <= high)
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        expired = [member for member, score in zset.items() if low <= score <= high]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+
+class FakePipeline:
+    """Buffers calls and returns their results from execute(), like redis-py."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue_call(*args):
+            self.calls.append((name, args))
+            return self
+        return queue_call
+
+    def execute(self):
+        results = [getattr(self.redis, name)(*args) for name, args in self.calls]
+        self.calls = []
+        return results
+
+
+def _message_queue(redis):
+    with patch("app.queue.client.Redis", return_value=redis):
+        return MessageQueue()
+
+
+def test_pipelined_stats_match_per_call_stats():
+    redis = FakeRedis()
+    mq = _message_queue(redis)
+    now = time.time()
+    redis.lists[mq.extraction_queue.key] = [b"job-1", b"job-2", b"job-3"]
+    redis.lists[mq.email_queue.key] = [b"job-4"]
+    redis.zsets[mq.extraction_queue.failed_job_registry.key] = {
+        b"expired": now - 60,
+        b"live": now + 3600,
+        b"kept-forever": -1,  # failed with a negative TTL
+    }
+    redis.zsets[mq.summarization_queue.failed_job_registry.key] = {b"live": now + 60}
+
+    stats = mq.get_queue_stats()
+
+    queues = {
+        "extraction": mq.extraction_queue,
+        "summarization": mq.summarization_queue,
+        "embedding": mq.embedding_queue,
+        "email": mq.email_queue,
+    }
+    per_call = {
+        name: {"count": len(queue), "failed": queue.failed_job_registry.count}
+        for name, queue in queues.items()
+    }
+    assert stats == per_call
+    assert stats["extraction"] == {"count": 3, "failed": 2}
+    assert all(isinstance(v, int) for q in stats.values() for v in q.values())
+
+
+def test_stats_read_in_one_round_trip():
+    redis = FakeRedis()
+    mq = _message_queue(redis)
+    executed = []
+    real_pipeline = redis.pipeline
+
+    def pipeline(transaction=True):
+        pipe = real_pipeline(transaction)
+        real_execute = pipe.execute
+        pipe.execute = lambda: executed.append(len(pipe.calls)) or real_execute()
+        return pipe
+
+    with patch.object(redis, "pipeline", pipeline), \
+         patch.object(Queue, "__len__", side_effect=AssertionError("per-call LLEN")):
+        mq.get_queue_stats()
+
+    assert executed == [12]
@@ -0,0 +1,76 @@
+"""
+Tests for RedisClient.set_async() and its background writer.
+
+The Redis connection is a MagicMock, so the tests check which commands the
+writer pipelines and when flush() reports the queue as drained.
+"""
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.cache.redis_client import RedisClient
+
+
+def _client():
+    with patch("app.cache.redis_client.redis.Redis") as redis_cls:
+        client = RedisClient()
+    return client, redis_cls.return_value.pipeline.return_value
+
+
+def test_queued_writes_are_pipelined_on_flush():
+    client, pipe = _client()
+
+    client.set_async("a", {"x": 1}, 60)
+    client.set_async("b", "plain")
+    assert client.flush(5.0)
+
+    pipe.setex.assert_called_once_with("a", 60, client._serialize({"x": 1}))
+    pipe.set.assert_called_once_with("b", "plain")
+    pipe.execute.assert_called()
+    assert client._pending_writes == 0
+
+
+def test_flush_times_out_while_a_batch_is_in_flight():
+    client, pipe = _client()
+    release = threading.Event()
+    pipe.execute.side_effect = lambda: release.wait(5.0)
+
+    client.set_async("a", 1)
+    assert not client.flush(0.1)
+
+    release.set()
+    assert client.flush(5.0)
+
+
+def test_failed_batch_still_drains_the_queue():
+    client, pipe = _client()
+    pipe.execute.side_effect = ConnectionError("Redis down")
+
+    client.set_async("a", 1)
+    assert client.flush(5.0)
+
+    pipe.execute.side_effect = None
+    client.set_async("b", 2)
+    assert client.flush(5.0)
+    pipe.set.assert_called_with("b", 2)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_starts_without_the_parents_writes():
+    """An RQ job process must not wait on writes its parent still has queued."""
+    client, pipe = _client()
+    release = threading.Event()
+    pipe.execute.side_effect = lambda: release.wait(5.0)
+    client.set_async("a", 1)
+
+    pid = os.fork()
+    if pid == 0:
+        clean = client._writer_thread is None and client.flush(0.1)
+        os._exit(0 if clean else 1)
+    _, status = os.waitpid(pid, 0)
+    release.set()
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert client.flush(5.0)
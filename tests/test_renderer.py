@@ -0,0 +1,57 @@
+"""
+Regression tests for the digest renderer in app/email/renderer.py.
+
+tests/fixtures/digest_golden.* hold the output of the original
+single-template renderer for the digest below. The shell/row splicing must
+reproduce it byte for byte, for every subscriber and from the row cache.
+"""
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.email import renderer
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+ARTICLES = [
+    {
+        "article_id": 1, "summary_id": 11,
+        "title": "Claude & <tools>", "url": "https://example.com/a?x=1&y=2",
+        "source": "Anthropic", "summary": 'A summary with "quotes".',
+        "key_points": ["One", "Two <b>"], "published_at": "2026-10-14", "category": "research",
+    },
+    {
+        "article_id": 2, "summary_id": 12,
+        "title": "Second", "url": "https://example.com/b",
+        "source": "OpenAI", "summary": "Short.", "key_points": [], "published_at": None,
+    },
+]
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 10, 15, 8, 0)
+
+
+@pytest.fixture
+def email_renderer():
+    with patch.object(renderer, "datetime", _FixedDatetime):
+        yield renderer.EmailRenderer()
+
+
+def test_digest_matches_original_output(email_renderer):
+    html, text = email_renderer.render_digest(ARTICLES, "Ana <x>", "ana@example.com")
+
+    assert html == (FIXTURES / "digest_golden.html").read_text()
+    assert text == (FIXTURES / "digest_golden.txt").read_text()
+
+
+def test_cached_shell_and_rows_personalize_each_subscriber(email_renderer):
+    email_renderer.render_digest(ARTICLES, "Someone Else", "other@example.com")
+    html, text = email_renderer.render_digest(ARTICLES, "Ana <x>", "ana@example.com")
+
+    assert html == (FIXTURES / "digest_golden.html").read_text()
+    assert text == (FIXTURES / "digest_golden.txt").read_text()
@@ -0,0 +1,39 @@
+"""
+Tests for the failed-article retry scanner in app/orchestrator/pipeline.py.
+
+The message queue is mocked; processing_queue entries live in the in-memory
+SQLite database from conftest (which ignores FOR UPDATE SKIP LOCKED).
+"""
+from unittest.mock import MagicMock, patch
+
+from app.database import Article, ProcessingQueue, ProcessingStatus, Source, SourceType
+from app.orchestrator.pipeline import ArticlePipeline
+
+
+def test_retry_picks_failed_entries_and_marks_them_pending(db_session):
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db_session.add(source)
+    db_session.flush()
+    articles = [Article(source_id=source.id, title=f"A{n}", url=f"https://example.com/{n}") for n in range(3)]
+    db_session.add_all(articles)
+    db_session.flush()
+    retryable, exhausted, done = (article.id for article in articles)
+    db_session.add_all([
+        ProcessingQueue(article_id=retryable, status=ProcessingStatus.FAILED, retry_count=1),
+        ProcessingQueue(article_id=exhausted, status=ProcessingStatus.FAILED, retry_count=3),
+        ProcessingQueue(article_id=done, status=ProcessingStatus.COMPLETED),
+    ])
+    db_session.commit()
+
+    queue = MagicMock()
+    queue.enqueue_extraction_many.side_effect = lambda ids: ["job"] * len(ids)
+    with patch("app.orchestrator.pipeline.get_message_queue", return_value=queue), \
+         patch("app.orchestrator.pipeline.get_redis_client"), \
+         patch("app.orchestrator.pipeline.SessionLocal", return_value=db_session):
+        results = ArticlePipeline().retry_failed_articles(max_retries=3)
+
+    assert results == {"enqueued": 1, "failed": 0, "found": 1}
+    queue.enqueue_extraction_many.assert_called_once_with([retryable])
+    statuses = dict(db_session.query(ProcessingQueue.article_id, ProcessingQueue.status))
+    assert statuses[retryable] == ProcessingStatus.PENDING
+    assert statuses[exhausted] == ProcessingStatus.FAILED
@@ -0,0 +1,82 @@
+"""
+Tests for the active-source reads in app/database/repository.py.
+
+get_active_source_rows() serves a process-wide list for ACTIVE_SOURCES_TTL
+seconds. create_source() and update_source_status() must clear it, or
+scrapers keep polling disabled feeds and miss new ones. Each test warms the
+cache first, so a stale list would be served if invalidation were missing.
+The source listings return plain rows rather than ORM entities.
+"""
+import pytest
+
+from app.database.models import Source, SourceType
+from app.database.repository import SourceRepository
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    SourceRepository.clear_active_sources_cache()
+    yield
+    SourceRepository.clear_active_sources_cache()
+
+
+def _add(db, name, source_type=SourceType.BLOG, active=True):
+    source = Source(name=name, source_type=source_type, url=f"https://example.com/{name}", active=active)
+    db.add(source)
+    db.commit()
+    return source.id
+
+
+def _names(rows):
+    return {row.name for row in rows}
+
+
+def test_rows_are_cached_between_reads(patch_db_session):
+    db = patch_db_session
+    _add(db, "blog")
+    assert _names(SourceRepository.get_active_source_rows()) == {"blog"}
+
+    # Written behind the repository's back: served from cache until the TTL
+    _add(db, "sneaky")
+
+    assert _names(SourceRepository.get_active_source_rows()) == {"blog"}
+
+
+def test_create_source_refreshes_cache(patch_db_session):
+    db = patch_db_session
+    _add(db, "blog")
+    assert _names(SourceRepository.get_active_source_rows()) == {"blog"}
+
+    SourceRepository.create_source("new", SourceType.BLOG, "https://example.com/new")
+
+    assert _names(SourceRepository.get_active_source_rows()) == {"blog", "new"}
+
+
+def test_update_source_status_refreshes_cache(patch_db_session):
+    db = patch_db_session
+    blog = _add(db, "blog")
+    paused = _add(db, "paused", active=False)
+    assert _names(SourceRepository.get_active_source_rows()) == {"blog"}
+
+    assert SourceRepository.update_source_status(blog, False)
+    assert SourceRepository.update_source_status(paused, True)
+
+    assert _names(SourceRepository.get_active_source_rows()) == {"paused"}
+
+
+def test_row_reads_return_only_active_sources_of_the_type(patch_db_session):
+    db = patch_db_session
+    _add(db, "blog")
+    _add(db, "channel", source_type=SourceType.YOUTUBE)
+    _add(db, "old-channel", source_type=SourceType.YOUTUBE, active=False)
+
+    youtube = SourceRepository.get_sources_by_type(SourceType.YOUTUBE)
+
+    assert _names(youtube) == {"channel"}
+    assert all(not isinstance(row, Source) for row in youtube)
+    assert youtube[0].source_type == SourceType.YOUTUBE.value
+    assert _names(SourceRepository.get_sources_by_type(SourceType.YOUTUBE, active_only=False)) == {
+        "channel", "old-channel",
+    }
+    assert _names(SourceRepository.get_all_sources()) == {"blog", "channel"}
+    assert len(SourceRepository.get_all_sources(active_only=False)) == 3
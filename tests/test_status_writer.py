@@ -0,0 +1,62 @@
+"""
+Tests for the batched ProcessingQueue status writer in app/orchestrator/workers.py.
+
+Updates are queued with update_processing_status() and written once
+STATUS_WRITER.flush() is called. The coalescing test uses a real background
+writer; the test session is idle while flush() waits for it.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from app.database import Article, DeadLetter, ProcessingQueue, ProcessingStatus, Source, SourceType
+from app.orchestrator import workers
+
+
+def _add_article(db):
+    source = Source(name="Test Source", source_type=SourceType.BLOG, url="https://example.com/feed")
+    db.add(source)
+    db.flush()
+    article = Article(source_id=source.id, title="Article", url="https://example.com/1")
+    db.add(article)
+    db.commit()
+    return article.id
+
+
+def test_updates_are_coalesced_per_article(patch_worker_session):
+    db = patch_worker_session
+    article_id = _add_article(db)
+
+    with patch.object(workers, "STATUS_WRITER", workers.StatusWriter()):
+        workers.update_processing_status(article_id, ProcessingStatus.EXTRACTING.value, "extraction")
+        workers.update_processing_status(article_id, ProcessingStatus.FAILED.value, error="Timed out")
+        assert workers.STATUS_WRITER.flush(5.0)
+        workers.update_processing_status(article_id, ProcessingStatus.PENDING.value, "summarization")
+        workers.update_processing_status(article_id, ProcessingStatus.SUMMARIZING.value)
+        assert workers.STATUS_WRITER.flush(5.0)
+
+    entry = db.query(ProcessingQueue).filter_by(article_id=article_id).one()
+    assert entry.status is ProcessingStatus.SUMMARIZING
+    assert entry.current_stage == "summarization"
+    assert entry.error_message == "Timed out"
+    assert entry.retry_count == 1
+
+
+@pytest.mark.parametrize("upsert", [True, False], ids=["on-conflict", "select-then-write"])
+def test_exhausted_retries_are_dead_lettered(patch_worker_session, upsert):
+    db = patch_worker_session
+    article_id = _add_article(db)
+    upsert_inserts = workers._UPSERT_INSERTS if upsert else {}
+
+    with patch.object(workers.settings, "MAX_RETRIES", 2), \
+         patch.object(workers, "_UPSERT_INSERTS", upsert_inserts):
+        workers.update_processing_status(article_id, ProcessingStatus.FAILED.value, error="First")
+        workers.update_processing_status(
+            article_id, ProcessingStatus.FAILED.value, error="Second", queue_name="extraction",
+        )
+        assert workers.STATUS_WRITER.flush(5.0)
+
+    assert db.query(ProcessingQueue).filter_by(article_id=article_id).one().retry_count == 2
+    dead = db.query(DeadLetter).filter_by(article_id=article_id).one()
+    assert (dead.queue_name, dead.error_message, dead.retry_count) == ("extraction", "Second", 2)
+    assert dead.payload == {"article_id": article_id}
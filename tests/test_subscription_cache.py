@@ -0,0 +1,108 @@
+"""
+Tests for the active-subscriber cache in app/email/subscription_service.py.
+
+get_active_subscribers() serves a process-wide list for
+ACTIVE_SUBSCRIBERS_TTL seconds. Every mutator must clear it, or digests keep
+going to people who just unsubscribed. Each test warms the cache first, so
+a stale list would be served if invalidation were missing.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, EmailFrequency, EmailSubscription
+from app.email import subscription_service
+from app.email.subscription_service import AsyncSubscriptionService, SubscriptionService
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    subscription_service.clear_active_subscribers_cache()
+    yield
+    subscription_service.clear_active_subscribers_cache()
+
+
+def _add(db, email, active=True):
+    subscriber = EmailSubscription(email=email, is_active=active)
+    db.add(subscriber)
+    db.commit()
+    return subscriber.id
+
+
+def _active(service):
+    return {(s.email, s.frequency) for s in service.get_active_subscribers()}
+
+
+def test_subscribe_refreshes_cache(db_session):
+    service = SubscriptionService(db_session)
+    _add(db_session, "old@example.com")
+    assert _active(service) == {("old@example.com", EmailFrequency.DAILY)}
+
+    service.create_subscription("new@example.com")
+
+    assert {email for email, _ in _active(service)} == {"old@example.com", "new@example.com"}
+
+
+def test_unsubscribe_refreshes_cache(db_session):
+    service = SubscriptionService(db_session)
+    subscriber_id = _add(db_session, "leaving@example.com")
+    assert _active(service)
+
+    assert service.unsubscribe(subscriber_id)
+
+    assert _active(service) == set()
+
+
+def test_reactivate_refreshes_cache(db_session):
+    service = SubscriptionService(db_session)
+    subscriber_id = _add(db_session, "back@example.com", active=False)
+    assert _active(service) == set()
+
+    assert service.reactivate(subscriber_id)
+
+    assert _active(service) == {("back@example.com", EmailFrequency.DAILY)}
+
+
+def test_frequency_update_refreshes_cache(db_session):
+    service = SubscriptionService(db_session)
+    subscriber_id = _add(db_session, "weekly@example.com")
+    assert _active(service) == {("weekly@example.com", EmailFrequency.DAILY)}
+
+    assert service.update_frequency(subscriber_id, EmailFrequency.WEEKLY)
+    db_session.expire_all()
+
+    assert _active(service) == {("weekly@example.com", EmailFrequency.WEEKLY)}
+
+
+def test_failed_update_keeps_cache(db_session):
+    service = SubscriptionService(db_session)
+    _add(db_session, "stays@example.com")
+    cached = service.get_active_subscribers()
+
+    assert not service.unsubscribe(999)
+
+    assert service.get_active_subscribers() == cached
+
+
+def test_async_unsubscribe_refreshes_cache(db_session):
+    """The async service shares the cache with the sync one."""
+    service = SubscriptionService(db_session)
+    subscriber_id = _add(db_session, "async@example.com")
+    assert _active(service)
+
+    async def unsubscribe():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add(EmailSubscription(id=subscriber_id, email="async@example.com"))
+            await session.commit()
+            assert await AsyncSubscriptionService(session).unsubscribe(subscriber_id)
+        await engine.dispose()
+
+    asyncio.run(unsubscribe())
+
+    # The async service wrote to its own database; the cache must be cleared all the same
+    assert subscription_service._active_subscribers_cache[1] is None